@@ -1,13 +1,15 @@
 # backend/app/api/deps.py
 
-from typing import Optional, Annotated, List
+import time
+from typing import AsyncIterator, Optional, Annotated, List
 from fastapi import Depends, HTTPException, status, Request, Header
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from asyncpg import Pool
 from loguru import logger
 
-from ..core.database import db
-from ..core.security import decode_token, verify_csrf_token
+from ..core.database import db, RequestConnection
+from ..core.cache import user_cache, token_cache
+from ..core.security import decode_token, verify_csrf_token, hash_token
 from ..core.exceptions import AuthenticationError, AuthorizationError, CSRFError
 from ..models.auth import TokenData
 from ..models.user import User
@@ -21,6 +23,8 @@ from ..repositories.student_repository import StudentRepository
 from ..repositories.hostel_repository import HostelRepository
 from ..repositories.contribution_repository import ContributionRepository
 from ..repositories.audit_log_repository import AuditLogRepository
+from ..repositories.stats_repository import StatsRepository
+from ..repositories.stored_procedures import StudentRepositoryWithProcedures
 
 # Security схема для JWT
 security = HTTPBearer()
@@ -33,58 +37,72 @@ async def get_db_pool() -> Pool:
     return db.pool
 
 
+async def get_db_connection(pool: Pool = Depends(get_db_pool)) -> AsyncIterator[RequestConnection]:
+    """
+    Соединение запроса, общее для всех репозиториев.
+    
+    Берется из пула при первом запросе к БД и возвращается после
+    завершения обработчика.
+    """
+    connection = RequestConnection(pool)
+    try:
+        yield connection
+    finally:
+        await connection.close()
+
+
 # Репозитории
 async def get_subdivision_repository(
-    pool: Pool = Depends(get_db_pool)
+    pool: RequestConnection = Depends(get_db_connection)
 ) -> SubdivisionRepository:
     """Получить репозиторий подразделений"""
     return SubdivisionRepository(pool)
 
 
 async def get_role_repository(
-    pool: Pool = Depends(get_db_pool)
+    pool: RequestConnection = Depends(get_db_connection)
 ) -> RoleRepository:
     """Получить репозиторий ролей"""
     return RoleRepository(pool)
 
 
 async def get_additional_status_repository(
-    pool: Pool = Depends(get_db_pool)
+    pool: RequestConnection = Depends(get_db_connection)
 ) -> AdditionalStatusRepository:
     """Получить репозиторий дополнительных статусов"""
     return AdditionalStatusRepository(pool)
 
 
 async def get_group_repository(
-    pool: Pool = Depends(get_db_pool)
+    pool: RequestConnection = Depends(get_db_connection)
 ) -> GroupRepository:
     """Получить репозиторий групп"""
     return GroupRepository(pool)
 
 
 async def get_user_repository(
-    pool: Pool = Depends(get_db_pool)
+    pool: RequestConnection = Depends(get_db_connection)
 ) -> UserRepository:
     """Получить репозиторий пользователей"""
     return UserRepository(pool)
 
 
 async def get_student_repository(
-    pool: Pool = Depends(get_db_pool)
+    pool: RequestConnection = Depends(get_db_connection)
 ) -> StudentRepository:
     """Получить репозиторий студентов"""
     return StudentRepository(pool)
 
 
 async def get_hostel_repository(
-    pool: Pool = Depends(get_db_pool)
+    pool: RequestConnection = Depends(get_db_connection)
 ) -> HostelRepository:
     """Получить репозиторий общежитий"""
     return HostelRepository(pool)
 
 
 async def get_contribution_repository(
-    pool: Pool = Depends(get_db_pool)
+    pool: RequestConnection = Depends(get_db_connection)
 ) -> ContributionRepository:
     """Получить репозиторий взносов"""
     return ContributionRepository(pool)
@@ -96,17 +114,29 @@ async def get_current_token(
 ) -> TokenData:
     """Получить данные из токена"""
     token = credentials.credentials
+    
+    # Подпись проверяется один раз на токен, дальше берем из кеша до exp
+    cache_key = hash_token(token)
+    token_data = token_cache.get(cache_key)
+    if token_data:
+        return token_data
+    
     payload = decode_token(token)
     
     if not payload or payload.get("type") != "access":
         raise AuthenticationError("Недействительный токен")
     
-    return TokenData(
+    token_data = TokenData(
         user_id=payload.get("user_id"),
         login=payload.get("login"),
         roles=payload.get("roles", []),
         subdivision_id=payload.get("subdivision_id")
     )
+    
+    if payload.get("exp"):
+        token_cache.set(cache_key, token_data, ttl=payload["exp"] - time.time())
+    
+    return token_data
 
 
 async def get_current_user(
@@ -117,10 +147,15 @@ async def get_current_user(
     if not token_data.user_id:
         raise AuthenticationError("Недействительный токен")
     
+    user = user_cache.get(token_data.user_id)
+    if user:
+        return user
+    
     user = await user_repo.get_with_roles(token_data.user_id)
     if not user:
         raise AuthenticationError("Пользователь не найден")
     
+    user_cache.set(user.id, user)
     return user
 
 
@@ -217,12 +252,26 @@ async def get_pagination_params(
     )
 
 async def get_audit_log_repository(
-    pool: Pool = Depends(get_db_pool)
+    pool: RequestConnection = Depends(get_db_connection)
 ) -> AuditLogRepository:
     """Получить репозиторий логов аудита"""
     return AuditLogRepository(pool)
 
 
+async def get_stats_repository(
+    pool: RequestConnection = Depends(get_db_connection)
+) -> StatsRepository:
+    """Получить репозиторий статистики"""
+    return StatsRepository(pool)
+
+
+async def get_student_procedures_repository(
+    pool: RequestConnection = Depends(get_db_connection)
+) -> StudentRepositoryWithProcedures:
+    """Получить репозиторий студентов с хранимыми процедурами"""
+    return StudentRepositoryWithProcedures(pool)
+
+
 # Типы для аннотаций
 CurrentUser = Annotated[User, Depends(get_current_active_user)]
 CurrentUserToken = Annotated[TokenData, Depends(get_current_token)]
@@ -238,4 +287,6 @@ UserRepo = Annotated[UserRepository, Depends(get_user_repository)]
 StudentRepo = Annotated[StudentRepository, Depends(get_student_repository)]
 HostelRepo = Annotated[HostelRepository, Depends(get_hostel_repository)]
 ContributionRepo = Annotated[ContributionRepository, Depends(get_contribution_repository)]
-AuditLogRepo = Annotated[AuditLogRepository, Depends(get_audit_log_repository)]
\ No newline at end of file
+AuditLogRepo = Annotated[AuditLogRepository, Depends(get_audit_log_repository)]
+StatsRepo = Annotated[StatsRepository, Depends(get_stats_repository)]
+StudentProceduresRepo = Annotated[StudentRepositoryWithProcedures, Depends(get_student_procedures_repository)]
\ No newline at end of file
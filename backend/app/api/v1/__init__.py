@@ -11,6 +11,8 @@ from .contributions import router as contributions_router
 from .hostels import router as hostels_router
 from .users import router as users_router
 from .audit_logs import router as audit_logs_router
+from .stats import router as stats_router
+from .search import router as search_router
 
 # Создаем главный роутер для версии API v1
 api_router = APIRouter(prefix="/api/v1")
@@ -25,6 +27,8 @@ api_router.include_router(students_router)
 api_router.include_router(contributions_router)
 api_router.include_router(hostels_router)
 api_router.include_router(users_router)
+api_router.include_router(stats_router)
+api_router.include_router(search_router)
 try:
     from .audit_logs import router as audit_logs_router
     api_router.include_router(audit_logs_router)
@@ -1,5 +1,5 @@
 from typing import List
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, Response, status
 from loguru import logger
 
 from ...models.additional_status import (
@@ -7,6 +7,7 @@ from ...models.additional_status import (
 )
 from ...models.common import SuccessResponse
 from ...core.exceptions import NotFoundError, AlreadyExistsError
+from ...utils.http_cache import check_not_modified
 from ..deps import (
     AdditionalStatusRepo, CurrentUser, CSRFProtection, require_roles
 )
@@ -16,10 +17,15 @@ router = APIRouter(prefix="/additional-statuses", tags=["additional-statuses"])
 
 @router.get("", response_model=List[AdditionalStatus])
 async def get_additional_statuses(
+    request: Request,
+    response: Response,
     current_user: CurrentUser,
     repo: AdditionalStatusRepo
 ):
-    """Получить список всех дополнительных статусов."""
+    """Получить список всех дополнительных статусов (поддерживает If-None-Match)."""
+    not_modified = await check_not_modified(request, response, ["additionalstatuses"])
+    if not_modified:
+        return not_modified
     return await repo.get_all(order_by="name")
 
 
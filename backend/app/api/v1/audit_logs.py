@@ -4,11 +4,10 @@ from fastapi import APIRouter, Query, HTTPException, status
 from loguru import logger
 
 from ...models.audit_log import AuditLog, AuditLogFilter
-from ...models.common import PaginatedResponse
+from ...models.common import PaginatedResponse, CursorPaginatedResponse, CountStrategy
 from ...utils.permissions import PermissionChecker
-from ..deps import CurrentUser, PaginationParams
-from ...repositories.audit_log_repository import AuditLogRepository
-from ...core.database import db
+from ...utils.pagination import decode_datetime_cursor, build_cursor_page
+from ..deps import CurrentUser, PaginationParams, AuditLogRepo
 
 router = APIRouter(prefix="/audit-logs", tags=["audit-logs"])
 
@@ -17,16 +16,20 @@ router = APIRouter(prefix="/audit-logs", tags=["audit-logs"])
 async def get_audit_logs(
     pagination: PaginationParams,
     current_user: CurrentUser,
+    repo: AuditLogRepo,
     user_id: Optional[int] = Query(None, description="Фильтр по пользователю"),
     action: Optional[str] = Query(None, description="Фильтр по действию"),
     table_name: Optional[str] = Query(None, description="Фильтр по таблице"),
     record_id: Optional[int] = Query(None, description="Фильтр по ID записи"),
     date_from: Optional[datetime] = Query(None, description="Дата начала"),
-    date_to: Optional[datetime] = Query(None, description="Дата окончания")
+    date_to: Optional[datetime] = Query(None, description="Дата окончания"),
+    count: CountStrategy = Query(CountStrategy.EXACT, description="Способ подсчета total: exact, estimated, cached")
 ):
     """
     Получить логи аудита.
     
+    Параметр **count** позволяет не выполнять полный COUNT(*) на больших журналах.
+    
     Требуется роль: CHAIRMAN
     """
     # Проверяем права доступа - только председатель может смотреть логи
@@ -37,9 +40,6 @@ async def get_audit_logs(
         )
     
     try:
-        pool = await db.get_pool()
-        repo = AuditLogRepository(pool)
-        
         # Формируем фильтры
         filters = AuditLogFilter(
             user_id=user_id,
@@ -53,15 +53,63 @@ async def get_audit_logs(
         # Получаем данные
         offset = (pagination.page - 1) * pagination.size
         logs = await repo.search_logs(filters, limit=pagination.size, offset=offset)
-        total = await repo.count_logs(filters)
+        total, count_strategy = await repo.count_logs_with_strategy(filters, count)
         
         return PaginatedResponse(
             items=logs,
             total=total,
             page=pagination.page,
             size=pagination.size,
-            pages=(total + pagination.size - 1) // pagination.size
+            pages=(total + pagination.size - 1) // pagination.size,
+            count_strategy=count_strategy
+        )
+        
+    except Exception as e:
+        logger.error(f"Error getting audit logs: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Ошибка при получении логов аудита"
         )
+
+
+@router.get("/cursor", response_model=CursorPaginatedResponse[AuditLog])
+async def get_audit_logs_cursor(
+    current_user: CurrentUser,
+    repo: AuditLogRepo,
+    user_id: Optional[int] = Query(None, description="Фильтр по пользователю"),
+    action: Optional[str] = Query(None, description="Фильтр по действию"),
+    table_name: Optional[str] = Query(None, description="Фильтр по таблице"),
+    record_id: Optional[int] = Query(None, description="Фильтр по ID записи"),
+    date_from: Optional[datetime] = Query(None, description="Дата начала"),
+    date_to: Optional[datetime] = Query(None, description="Дата окончания"),
+    after: Optional[str] = Query(None, description="Курсор, полученный в next_cursor"),
+    size: int = Query(50, ge=1, le=100, description="Размер страницы")
+):
+    """
+    Получить логи аудита с курсорной пагинацией (от новых к старым).
+    
+    Требуется роль: CHAIRMAN
+    """
+    if not PermissionChecker.has_permission(current_user, "view_all"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Недостаточно прав для просмотра логов аудита"
+        )
+    
+    cursor = decode_datetime_cursor(after) if after else None
+    
+    try:
+        filters = AuditLogFilter(
+            user_id=user_id,
+            action=action,
+            table_name=table_name,
+            record_id=record_id,
+            date_from=date_from,
+            date_to=date_to
+        )
+        
+        logs = await repo.search_logs(filters, limit=size + 1, after=cursor)
+        return build_cursor_page(logs, size, key=lambda log: (log.created_at, log.id))
         
     except Exception as e:
         logger.error(f"Error getting audit logs: {e}")
@@ -6,7 +6,7 @@ from loguru import logger
 
 from ...core.config import settings
 from ...core.security import (
-    verify_password, 
+    verify_password_async, 
     create_access_token, 
     generate_csrf_token
 )
@@ -35,7 +35,7 @@ async def login_for_access_token(
             raise AuthenticationError("Неверный логин или пароль")
         
         # Проверяем пароль
-        if not verify_password(login_data.password, user.passwordhash):
+        if not await verify_password_async(login_data.password, user.passwordhash):
             raise AuthenticationError("Неверный логин или пароль")
         
         # Создаем токен
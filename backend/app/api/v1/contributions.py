@@ -3,15 +3,16 @@
 from typing import List, Optional
 from decimal import Decimal
 from datetime import date
-from fastapi import APIRouter, HTTPException, status, Query
+from fastapi import APIRouter, HTTPException, status, Query, Body
 from loguru import logger
 
 from ...models.contribution import (
     Contribution, ContributionCreate, ContributionUpdate, ContributionSummary
 )
-from ...models.common import PaginatedResponse, SuccessResponse
+from ...models.common import PaginatedResponse, CursorPaginatedResponse, SuccessResponse
 from ...core.exceptions import NotFoundError, ValidationError, AuthorizationError
 from ...utils.permissions import PermissionChecker
+from ...utils.pagination import decode_cursor, build_cursor_page
 from ..deps import (
     ContributionRepo, StudentRepo, GroupRepo,
     CurrentUser, CSRFProtection, PaginationParams
@@ -27,9 +28,10 @@ async def get_contributions(
     repo: ContributionRepo,
     student_id: Optional[int] = Query(None, description="Фильтр по студенту"),
     group_id: Optional[int] = Query(None, description="Фильтр по группе"),
+    subdivision_id: Optional[int] = Query(None, description="Фильтр по подразделению"),
     year: Optional[int] = Query(None, description="Фильтр по году"),
     semester: Optional[int] = Query(None, ge=1, le=2, description="Фильтр по семестру"),
-    paid_only: Optional[bool] = Query(None, description="Только оплаченные")
+    paid_only: Optional[bool] = Query(None, description="Только оплаченные (false - только неоплаченные)")
 ):
     """
     Получить список взносов с фильтрацией.
@@ -37,40 +39,34 @@ async def get_contributions(
     Фильтры:
     - **student_id**: ID студента
     - **group_id**: ID группы  
+    - **subdivision_id**: ID подразделения
     - **year**: год взноса
     - **semester**: семестр (1 или 2)
-    - **paid_only**: только оплаченные взносы
+    - **paid_only**: только оплаченные (true) или только неоплаченные (false) взносы
     """
+    # Применяем ограничения по подразделению
+    filter_subdivision_id = PermissionChecker.filter_by_subdivision(
+        current_user, subdivision_id
+    )
+    
     # Формируем фильтры
     filters = {}
     if student_id:
         filters['student_id'] = student_id
+    if group_id:
+        filters['group_id'] = group_id
+    if filter_subdivision_id:
+        filters['subdivision_id'] = filter_subdivision_id
     if year:
         filters['year'] = year
     if semester:
         filters['semester'] = semester
     if paid_only is not None:
-        if paid_only:
-            filters['payment_date_not_null'] = True
-        else:
-            filters['payment_date_null'] = True
+        filters['paid' if paid_only else 'unpaid'] = True
     
-    # Получаем данные с пагинацией
+    # Страница и общее количество - одним запросом
     offset = (pagination.page - 1) * pagination.size
-    
-    if group_id:
-        items = await repo.get_by_group(
-            group_id=group_id,
-            year=year or date.today().year,
-            semester=semester
-        )
-        # Применяем пагинацию вручную
-        total = len(items)
-        items = items[offset:offset + pagination.size]
-    else:
-        # TODO: Реализовать общий поиск с фильтрами
-        items = []
-        total = 0
+    items, total = await repo.search(filters, limit=pagination.size, offset=offset)
     
     return PaginatedResponse(
         items=items,
@@ -81,6 +77,38 @@ async def get_contributions(
     )
 
 
+@router.get("/cursor", response_model=CursorPaginatedResponse[Contribution])
+async def get_contributions_cursor(
+    current_user: CurrentUser,
+    repo: ContributionRepo,
+    group_repo: GroupRepo,
+    group_id: int = Query(..., description="Фильтр по группе"),
+    year: Optional[int] = Query(None, description="Фильтр по году"),
+    semester: Optional[int] = Query(None, ge=1, le=2, description="Фильтр по семестру"),
+    after: Optional[str] = Query(None, description="Курсор, полученный в next_cursor"),
+    size: int = Query(50, ge=1, le=100, description="Размер страницы")
+):
+    """
+    Получить взносы группы с курсорной пагинацией (по ФИО студента).
+    """
+    group = await group_repo.get_by_id(group_id)
+    if not group:
+        raise NotFoundError(f"Группа с ID {group_id} не найдена")
+    
+    if not PermissionChecker.can_access_subdivision(current_user, group.subdivisionid):
+        raise AuthorizationError("Нет доступа к данной группе")
+    
+    items = await repo.get_by_group(
+        group_id=group_id,
+        year=year or date.today().year,
+        semester=semester,
+        limit=size + 1,
+        after=decode_cursor(after) if after else None
+    )
+    
+    return build_cursor_page(items, size, key=lambda c: (c.student_name, c.id))
+
+
 @router.get("/summary", response_model=ContributionSummary)
 async def get_contributions_summary(
     current_user: CurrentUser,
@@ -227,6 +255,47 @@ async def delete_contribution(
         )
 
 
+@router.post("/mark-paid", response_model=List[Contribution])
+async def mark_contributions_as_paid(
+    _: CSRFProtection,
+    repo: ContributionRepo,
+    student_repo: StudentRepo,
+    current_user: CurrentUser,
+    payments: List[ContributionCreate] = Body(..., description="Платежи: студент, год, семестр, сумма, дата")
+):
+    """
+    Отметить взносы как оплаченные для нескольких студентов.
+    
+    Все платежи сохраняются одним запросом. Если дата платежа
+    не указана, используется текущая. Возвращает сохраненные взносы.
+    """
+    if not payments:
+        return []
+    
+    # Проверяем существование студентов и права на их подразделения
+    student_ids = list({payment.studentid for payment in payments})
+    subdivisions = await student_repo.get_subdivision_ids(student_ids)
+    
+    missing = sorted(set(student_ids) - set(subdivisions))
+    if missing:
+        raise NotFoundError(f"Студенты с ID {', '.join(map(str, missing))} не найдены")
+    
+    for subdivision_id in set(subdivisions.values()):
+        if not PermissionChecker.can_manage_contributions(current_user, subdivision_id):
+            raise AuthorizationError("Недостаточно прав для отметки взносов")
+    
+    try:
+        contributions = await repo.mark_many_as_paid(payments)
+        logger.info(f"User {current_user.id} marked {len(contributions)} contributions as paid")
+        return contributions
+    except Exception as e:
+        logger.error(f"Error marking contributions as paid: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Ошибка при отметке взносов как оплаченных"
+        )
+
+
 @router.post("/mark-paid/{student_id}", response_model=Contribution)
 async def mark_contribution_as_paid(
     student_id: int,
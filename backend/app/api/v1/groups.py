@@ -1,7 +1,7 @@
 # backend/app/api/v1/groups.py
 
 from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, HTTPException, status, Query, Depends, Request
+from fastapi import APIRouter, HTTPException, status, Query, Depends, Request, Response
 from loguru import logger
 
 from ...models.group import Group, GroupCreate, GroupUpdate, GroupWithStats
@@ -10,6 +10,7 @@ from ...models.common import PaginatedResponse, SuccessResponse
 from ...core.exceptions import NotFoundError, AlreadyExistsError, AuthorizationError
 from ...utils.permissions import PermissionChecker
 from ...services.audit_service import AuditService
+from ...utils.http_cache import check_not_modified, discard_etag
 from ..deps import (
     GroupRepo, SubdivisionRepo, StudentRepo, CurrentUser, CSRFProtection, 
     PaginationParams, require_roles
@@ -19,6 +20,8 @@ router = APIRouter(prefix="/groups", tags=["groups"])
 
 @router.get("/list", response_model=List[Group])
 async def get_groups_list(
+    request: Request,
+    response: Response,
     current_user: CurrentUser,
     repo: GroupRepo,
     subdivision_id: Optional[int] = Query(None, description="Фильтр по подразделению"),
@@ -28,13 +31,23 @@ async def get_groups_list(
     """
     Получить простой список групп (без пагинации).
     Используется фронтендом для выпадающих списков и простого отображения.
+    Поддерживает If-None-Match: пока группы, подразделения и студенты не менялись, отвечает 304.
     """
+    # Применяем ограничения по подразделению
+    filter_subdivision_id = PermissionChecker.filter_by_subdivision(
+        current_user, subdivision_id
+    )
+    
+    # Список зависит от названий подразделений, счетчиков студентов и от того,
+    # чем ограничен пользователь
+    not_modified = await check_not_modified(
+        request, response, ["groups", "subdivisions", "students"],
+        scope=(filter_subdivision_id, year, search)
+    )
+    if not_modified:
+        return not_modified
+    
     try:
-        # Применяем ограничения по подразделению
-        filter_subdivision_id = PermissionChecker.filter_by_subdivision(
-            current_user, subdivision_id
-        )
-        
         # Формируем фильтры
         filters = {}
         if filter_subdivision_id:
@@ -54,6 +67,7 @@ async def get_groups_list(
         
     except Exception as e:
         logger.error(f"Error getting groups list: {e}")
+        discard_etag(response)
         return []
 
 
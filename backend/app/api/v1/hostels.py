@@ -48,9 +48,8 @@ async def get_hostel_students(
     offset = (pagination.page - 1) * pagination.size
     
     if filters:
-        items = await repo.search(filters)
-        # Применяем пагинацию вручную
-        items = items[offset:offset + pagination.size]
+        # Страница и общее количество - одним запросом
+        items, total = await repo.search(filters, limit=pagination.size, offset=offset)
     else:
         items = await repo.get_all(
             limit=pagination.size,
@@ -58,9 +57,7 @@ async def get_hostel_students(
             order_by=pagination.sort_by or "hostel",
             order_desc=(pagination.sort_order == "desc")
         )
-    
-    # Подсчитываем общее количество
-    total = await repo.count(filters if filters else None)
+        total = await repo.count()
     
     return PaginatedResponse(
         items=items,
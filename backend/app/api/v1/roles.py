@@ -1,10 +1,11 @@
 from typing import List, Optional
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, Response, status
 from loguru import logger
 
 from ...models.role import Role, RoleCreate, RoleUpdate
 from ...models.common import SuccessResponse
 from ...core.exceptions import NotFoundError, AlreadyExistsError
+from ...utils.http_cache import check_not_modified
 from ..deps import RoleRepo, CurrentUser, CSRFProtection, require_roles
 
 router = APIRouter(prefix="/roles", tags=["roles"])
@@ -12,10 +13,15 @@ router = APIRouter(prefix="/roles", tags=["roles"])
 
 @router.get("", response_model=List[Role])
 async def get_roles(
+    request: Request,
+    response: Response,
     current_user: CurrentUser,
     repo: RoleRepo
 ):
-    """Получить список всех ролей."""
+    """Получить список всех ролей (поддерживает If-None-Match)."""
+    not_modified = await check_not_modified(request, response, ["roles"])
+    if not_modified:
+        return not_modified
     return await repo.get_all()
 
 
@@ -0,0 +1,42 @@
+from typing import Literal, Optional
+from fastapi import APIRouter, Query
+
+from ...models.search import Suggestion, SuggestResponse
+from ...utils.permissions import PermissionChecker
+from ...services.suggest_index import suggest_index
+from ..deps import CurrentUser
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+@router.get("/suggest", response_model=SuggestResponse)
+async def suggest(
+    current_user: CurrentUser,
+    q: str = Query(..., min_length=1, max_length=100, description="Начало ФИО или названия группы"),
+    type: Literal["all", "students", "groups"] = Query("all", description="Что подсказывать"),
+    subdivision_id: Optional[int] = Query(None, description="Фильтр по подразделению"),
+    limit: int = Query(10, ge=1, le=50, description="Максимум подсказок каждого типа")
+):
+    """
+    Подсказки для поля поиска по началу любого слова ФИО или названия группы.
+    
+    Отвечает из индекса в памяти процесса, без запросов к БД. Возвращает
+    только ID и названия: полные данные запрашиваются отдельно.
+    """
+    # Применяем ограничения по подразделению
+    filter_subdivision_id = PermissionChecker.filter_by_subdivision(
+        current_user, subdivision_id
+    )
+    
+    result = await suggest_index.suggest(
+        q,
+        subdivision_id=filter_subdivision_id,
+        limit=limit,
+        students=type in ("all", "students"),
+        groups=type in ("all", "groups")
+    )
+    
+    return SuggestResponse(
+        students=[Suggestion(id=id, name=name) for id, name in result["students"]],
+        groups=[Suggestion(id=id, name=name) for id, name in result["groups"]]
+    )
@@ -0,0 +1,36 @@
+from datetime import datetime
+from fastapi import APIRouter, HTTPException, status
+from loguru import logger
+
+from ...models.stats import StatsRefreshResult
+from ..deps import StatsRepo, CurrentUser, CSRFProtection, require_roles
+
+router = APIRouter(prefix="/stats", tags=["stats"])
+
+
+@router.post("/refresh", response_model=StatsRefreshResult)
+async def refresh_stats(
+    _: CSRFProtection,
+    repo: StatsRepo,
+    current_user: CurrentUser = require_roles(["CHAIRMAN"])
+):
+    """
+    Полностью пересчитать предрассчитанную статистику групп.
+    
+    Нужен после изменений данных в обход API (импорт, ручные правки в БД).
+    
+    Требуется роль: CHAIRMAN
+    """
+    try:
+        groups_refreshed = await repo.refresh_all()
+        logger.info(f"User {current_user.id} refreshed stats for {groups_refreshed} groups")
+        return StatsRefreshResult(
+            groups_refreshed=groups_refreshed,
+            refreshed_at=datetime.now()
+        )
+    except Exception as e:
+        logger.error(f"Error refreshing stats: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Ошибка при пересчете статистики"
+        )
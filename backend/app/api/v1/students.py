@@ -1,22 +1,44 @@
 # backend/app/api/v1/students.py
 
-from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, HTTPException, status, Query, Body
+from datetime import date
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, status, Query, Body, UploadFile, File
+from fastapi.responses import StreamingResponse
 from loguru import logger
 
-from ...models.student import Student, StudentCreate, StudentUpdate, StudentWithDetails, BulkOperationResult
-from ...models.common import PaginatedResponse, SuccessResponse
+from ...models.student import (
+    Student, StudentCreate, StudentUpdate, StudentWithDetails, BulkOperationResult, StudentImportResult
+)
+from ...models.contribution import StudentDebt, SubdivisionDebtSummary
+from ...models.common import PaginatedResponse, CursorPaginatedResponse, SuccessResponse, CountStrategy
 from ...core.exceptions import NotFoundError, ValidationError, AuthorizationError
-from ...core.database import db
 from ...utils.permissions import PermissionChecker
-from ...repositories.stored_procedures import StudentRepositoryWithProcedures
+from ...utils.pagination import decode_cursor, build_cursor_page
+from ...utils.export import stream_csv
+from ...services.student_import import StudentImportService, IMPORT_FORMATS, detect_format
+from ...services.debt_engine import debt_engine
 from ..deps import (
-    StudentRepo, GroupRepo, AdditionalStatusRepo,
+    StudentRepo, GroupRepo, AdditionalStatusRepo, ContributionRepo, StudentProceduresRepo,
     CurrentUser, CSRFProtection, PaginationParams
 )
 
 router = APIRouter(prefix="/students", tags=["students"])
 
+# Столбцы выгрузки студентов: (поле строки, заголовок)
+EXPORT_COLUMNS = [
+    ("id", "ID"),
+    ("fullname", "ФИО"),
+    ("group_name", "Группа"),
+    ("subdivision_name", "Подразделение"),
+    ("year", "Год поступления"),
+    ("isactive", "Член профсоюза"),
+    ("isbudget", "Бюджет"),
+    ("phone", "Телефон"),
+    ("email", "Email"),
+    ("birthday", "Дата рождения"),
+    ("additional_statuses", "Дополнительные статусы"),
+]
+
 
 # Добавляем новый упрощенный эндпоинт для фронтенда
 @router.get("/list", response_model=List[Student])
@@ -81,7 +103,8 @@ async def get_students(
     year: Optional[int] = Query(None, description="Фильтр по году"),
     search: Optional[str] = Query(None, description="Поиск по ФИО"),
     has_hostel: Optional[bool] = Query(None, description="Фильтр по проживанию в общежитии"),
-    has_debt: Optional[bool] = Query(None, description="Фильтр по наличию задолженности")
+    has_debt: Optional[bool] = Query(None, description="Фильтр по наличию задолженности"),
+    count: CountStrategy = Query(CountStrategy.EXACT, description="Способ подсчета total: exact, estimated, cached")
 ):
     """
     Получить список студентов с фильтрацией и пагинацией.
@@ -94,7 +117,10 @@ async def get_students(
     - **year**: год поступления
     - **search**: поиск по ФИО
     - **has_hostel**: проживают в общежитии
-    - **has_debt**: имеют задолженность по взносам
+    - **has_debt**: имеют задолженность по взносам за текущий год (как в /students/debt/list)
+    
+    Параметр **count** выбирает способ подсчета общего количества:
+    точный, оценка по статистике планировщика или кешированный на короткое время.
     """
     try:
         # Применяем ограничения по подразделению
@@ -116,25 +142,25 @@ async def get_students(
             filters['year'] = year
         if search:
             filters['search'] = search
+        if has_hostel is not None:
+            filters['has_hostel' if has_hostel else 'no_hostel'] = True
+        if has_debt is not None:
+            filters['has_debt' if has_debt else 'no_debt'] = date.today().year
         
         # Получаем данные
         offset = (pagination.page - 1) * pagination.size
         students = await repo.search(filters, limit=pagination.size, offset=offset)
         
-        # Дополнительная фильтрация по общежитию и долгам (если нужно)
-        if has_hostel is not None or has_debt is not None:
-            # Здесь можно добавить дополнительную логику фильтрации
-            pass
-        
         # Подсчитываем общее количество
-        total = await repo.count(filters)
+        total, count_strategy = await repo.count_with_strategy(filters, count)
         
         return PaginatedResponse(
             items=students,
             total=total,
             page=pagination.page,
             size=pagination.size,
-            pages=(total + pagination.size - 1) // pagination.size
+            pages=(total + pagination.size - 1) // pagination.size,
+            count_strategy=count_strategy
         )
         
     except Exception as e:
@@ -149,6 +175,103 @@ async def get_students(
         )
 
 
+@router.get("/cursor", response_model=CursorPaginatedResponse[Student])
+async def get_students_cursor(
+    current_user: CurrentUser,
+    repo: StudentRepo,
+    group_id: Optional[int] = Query(None, description="Фильтр по группе"),
+    subdivision_id: Optional[int] = Query(None, description="Фильтр по подразделению"),
+    is_active: Optional[bool] = Query(None, description="Фильтр по активности"),
+    is_budget: Optional[bool] = Query(None, description="Фильтр по бюджету"),
+    year: Optional[int] = Query(None, description="Фильтр по году"),
+    search: Optional[str] = Query(None, description="Поиск по ФИО"),
+    after: Optional[str] = Query(None, description="Курсор, полученный в next_cursor"),
+    size: int = Query(50, ge=1, le=100, description="Размер страницы")
+):
+    """
+    Получить список студентов с курсорной пагинацией.
+    
+    В отличие от постраничного режима, время ответа не растет с номером
+    страницы: для следующей страницы передайте **after** = next_cursor.
+    """
+    # Применяем ограничения по подразделению
+    filter_subdivision_id = PermissionChecker.filter_by_subdivision(
+        current_user, subdivision_id
+    )
+    
+    # Формируем фильтры
+    filters = {}
+    if group_id:
+        filters['group_id'] = group_id
+    if filter_subdivision_id:
+        filters['subdivision_id'] = filter_subdivision_id
+    if is_active is not None:
+        filters['is_active'] = is_active
+    if is_budget is not None:
+        filters['is_budget'] = is_budget
+    if year:
+        filters['year'] = year
+    if search:
+        filters['search'] = search
+    
+    # Все страницы, включая первую, упорядочены по (ФИО, id), как и курсор
+    students = await repo.search(
+        filters,
+        limit=size + 1,
+        after=decode_cursor(after) if after else None,
+        order_by_name=True
+    )
+    
+    return build_cursor_page(students, size, key=lambda s: (s.fullname, s.id))
+
+
+@router.get("/export")
+async def export_students(
+    current_user: CurrentUser,
+    repo: StudentRepo,
+    group_id: Optional[int] = Query(None, description="Фильтр по группе"),
+    subdivision_id: Optional[int] = Query(None, description="Фильтр по подразделению"),
+    is_active: Optional[bool] = Query(None, description="Фильтр по активности"),
+    is_budget: Optional[bool] = Query(None, description="Фильтр по бюджету"),
+    year: Optional[int] = Query(None, description="Фильтр по году"),
+    search: Optional[str] = Query(None, description="Поиск по ФИО")
+):
+    """
+    Выгрузить студентов в CSV.
+    
+    Фильтры те же, что и у списка студентов. Файл формируется потоково
+    через серверный курсор, поэтому размер выгрузки не ограничен.
+    """
+    # Применяем ограничения по подразделению
+    filter_subdivision_id = PermissionChecker.filter_by_subdivision(
+        current_user, subdivision_id
+    )
+    
+    # Формируем фильтры
+    filters = {}
+    if group_id:
+        filters['group_id'] = group_id
+    if filter_subdivision_id:
+        filters['subdivision_id'] = filter_subdivision_id
+    if is_active is not None:
+        filters['is_active'] = is_active
+    if is_budget is not None:
+        filters['is_budget'] = is_budget
+    if year:
+        filters['year'] = year
+    if search:
+        filters['search'] = search
+    
+    logger.info(f"User {current_user.id} exported students with filters {filters}")
+    
+    filename = f"students_{date.today().isoformat()}.csv"
+    return StreamingResponse(
+        stream_csv(repo.iter_export_rows(filters), EXPORT_COLUMNS),
+        media_type="text/csv; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
 @router.get("/{student_id}", response_model=Student)
 async def get_student(
     student_id: int,
@@ -183,8 +306,7 @@ async def get_student(
 async def get_student_full_details(
     student_id: int,
     current_user: CurrentUser,
-    repo: StudentRepo,
-    group_repo: GroupRepo
+    repo: StudentRepo
 ):
     """Получить полную информацию о студенте включая общежитие и взносы."""
     try:
@@ -192,9 +314,8 @@ async def get_student_full_details(
         if not student:
             raise NotFoundError(f"Студент с ID {student_id} не найден")
         
-        # Проверяем доступ
-        group = await group_repo.get_by_id(student.groupid)
-        if group and not PermissionChecker.can_access_subdivision(current_user, group.subdivisionid):
+        # Проверяем доступ (подразделение группы загружено вместе со студентом)
+        if not PermissionChecker.can_access_subdivision(current_user, student.subdivision_id):
             raise AuthorizationError("Нет доступа к данному студенту")
         
         return student
@@ -253,6 +374,58 @@ async def create_student(
         )
 
 
+@router.post("/import", response_model=StudentImportResult)
+async def import_students(
+    _: CSRFProtection,
+    repo: StudentRepo,
+    current_user: CurrentUser,
+    file: UploadFile = File(..., description="CSV или JSON Lines со студентами"),
+    format: Optional[str] = Query(None, description="Формат файла: csv или jsonl (по умолчанию - по расширению)")
+):
+    """
+    Массовый импорт студентов.
+    
+    CSV содержит заголовок с полями group_id, full_name, is_active, is_budget, year,
+    phone, email, birthday, additional_status_ids (ID через пробел или '|'),
+    разделитель ',' или ';'. В JSON Lines каждая строка - объект как в POST /students.
+    
+    Корректные строки добавляются одной транзакцией, для остальных
+    возвращается отчет с ошибками по номерам строк.
+    
+    Требуется роль: CHAIRMAN, DEPUTY_CHAIRMAN или DORMITORY_HEAD (для своего подразделения)
+    """
+    # Определяем подразделение, в которое разрешено добавлять студентов
+    if PermissionChecker.has_permission(current_user, "edit_all"):
+        subdivision_id = None
+    elif PermissionChecker.has_permission(current_user, "edit_students_subdivision"):
+        subdivision_id = current_user.subdivisionid
+    else:
+        raise AuthorizationError("Недостаточно прав для импорта студентов")
+    
+    fmt = format or detect_format(file.filename)
+    if fmt not in IMPORT_FORMATS:
+        raise ValidationError(f"Неподдерживаемый формат импорта: {fmt}")
+    
+    try:
+        result = await StudentImportService(repo).import_file(file.file, fmt, subdivision_id)
+        logger.info(
+            f"User {current_user.id} imported {result.imported_count} students "
+            f"({result.error_count} rows rejected)"
+        )
+        return result
+        
+    except (ValidationError, AuthorizationError):
+        raise
+    except Exception as e:
+        logger.error(f"Error importing students: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Ошибка при импорте студентов"
+        )
+    finally:
+        await file.close()
+
+
 @router.put("/{student_id}", response_model=Student)
 async def update_student(
     student_id: int,
@@ -356,6 +529,7 @@ async def transfer_student(
     student_id: int,
     _: CSRFProtection,
     current_user: CurrentUser,
+    repo: StudentProceduresRepo,
     new_group_id: int = Body(..., description="ID новой группы")
 ):
     """
@@ -364,9 +538,6 @@ async def transfer_student(
     Требуется роль: CHAIRMAN или DEPUTY_CHAIRMAN
     """
     try:
-        pool = await db.get_pool()
-        repo = StudentRepositoryWithProcedures(pool)
-        
         success = await repo.transfer_student_to_group(
             student_id, new_group_id, current_user.id
         )
@@ -394,6 +565,7 @@ async def transfer_student(
 async def bulk_activate_students(
     _: CSRFProtection,
     current_user: CurrentUser,
+    repo: StudentProceduresRepo,
     student_ids: List[int] = Body(..., description="Список ID студентов для активации")
 ):
     """
@@ -402,9 +574,6 @@ async def bulk_activate_students(
     Требуется роль: CHAIRMAN, DEPUTY_CHAIRMAN или DIVISION_HEAD
     """
     try:
-        pool = await db.get_pool()
-        repo = StudentRepositoryWithProcedures(pool)
-        
         result = await repo.bulk_activate_students(student_ids, current_user.id)
         return BulkOperationResult(
             success_count=result['success_count'],
@@ -419,29 +588,57 @@ async def bulk_activate_students(
         )
 
 
-@router.get("/debt/list", response_model=List[Dict[str, Any]])
+@router.get("/debt/list", response_model=List[StudentDebt])
 async def get_students_with_debt(
     current_user: CurrentUser,
+    repo: ContributionRepo,
     subdivision_id: Optional[int] = Query(None, description="Фильтр по подразделению"),
-    year: Optional[int] = Query(None, description="Год для проверки задолженности")
+    year: Optional[int] = Query(None, description="Год для проверки задолженности"),
+    semester: Optional[int] = Query(None, ge=1, le=2, description="Проверять только этот семестр")
 ):
     """
-    Получить список студентов с задолженностью (через хранимую функцию).
+    Получить список студентов с задолженностью.
     
-    Возвращает список студентов с информацией о задолженности.
+    Должник - активный студент, у которого нет оплаченного взноса за год
+    (по умолчанию текущий) или, если указан semester, за этот семестр.
     """
-    try:
-        # Применяем ограничения по подразделению
-        filter_subdivision_id = PermissionChecker.filter_by_subdivision(
-            current_user, subdivision_id
-        )
-        
-        pool = await db.get_pool()
-        repo = StudentRepositoryWithProcedures(pool)
-        
-        students = await repo.get_students_with_debt(filter_subdivision_id, year)
-        return students
-        
-    except Exception as e:
-        logger.error(f"Error getting students with debt: {e}")
-        return []  # Возвращаем пустой список вместо ошибки
\ No newline at end of file
+    # Применяем ограничения по подразделению
+    filter_subdivision_id = PermissionChecker.filter_by_subdivision(
+        current_user, subdivision_id
+    )
+    
+    report = await debt_engine.get_report(
+        repo,
+        year=year or date.today().year,
+        semester=semester,
+        subdivision_id=filter_subdivision_id
+    )
+    return report.students
+
+
+@router.get("/debt/summary", response_model=List[SubdivisionDebtSummary])
+async def get_debt_summary(
+    current_user: CurrentUser,
+    repo: ContributionRepo,
+    subdivision_id: Optional[int] = Query(None, description="Фильтр по подразделению"),
+    year: Optional[int] = Query(None, description="Год для проверки задолженности"),
+    semester: Optional[int] = Query(None, ge=1, le=2, description="Проверять только этот семестр")
+):
+    """
+    Получить сводку по задолженностям подразделений.
+    
+    Считается тем же расчетом, что и список должников, и берется из
+    того же кеша.
+    """
+    # Применяем ограничения по подразделению
+    filter_subdivision_id = PermissionChecker.filter_by_subdivision(
+        current_user, subdivision_id
+    )
+    
+    report = await debt_engine.get_report(
+        repo,
+        year=year or date.today().year,
+        semester=semester,
+        subdivision_id=filter_subdivision_id
+    )
+    return report.subdivisions
@@ -1,5 +1,5 @@
 from typing import List, Optional
-from fastapi import APIRouter, HTTPException, status, Query
+from fastapi import APIRouter, HTTPException, status, Query, Request, Response
 from loguru import logger
 
 from ...models.subdivision import (
@@ -7,6 +7,7 @@ from ...models.subdivision import (
 )
 from ...models.common import PaginatedResponse, SuccessResponse
 from ...core.exceptions import NotFoundError, AlreadyExistsError
+from ...utils.http_cache import check_not_modified, discard_etag
 from ..deps import (
     SubdivisionRepo, CurrentUser, CSRFProtection, PaginationParams,
     require_roles
@@ -16,19 +17,28 @@ router = APIRouter(prefix="/subdivisions", tags=["subdivisions"])
 
 @router.get("/list", response_model=List[Subdivision])
 async def get_subdivisions_list(
+    request: Request,
+    response: Response,
     current_user: CurrentUser,
     repo: SubdivisionRepo
 ):
     """
     Получить простой список всех подразделений (без пагинации).
     Используется фронтендом для простого отображения.
+    Поддерживает If-None-Match: пока подразделения, группы и студенты не менялись, отвечает 304.
     """
+    # В ответе есть количество групп и студентов
+    not_modified = await check_not_modified(request, response, ["subdivisions", "groups", "students"])
+    if not_modified:
+        return not_modified
+    
     try:
         # Получаем все подразделения
         items = await repo.get_all(limit=1000, offset=0, order_by="name")
         return items
     except Exception as e:
         logger.error(f"Error getting subdivisions list: {e}")
+        discard_etag(response)
         return []
 
 
@@ -46,26 +56,20 @@ async def get_subdivisions(
     - **size**: размер страницы (по умолчанию 50, максимум 100)
     - **search**: поиск по названию
     """
-    # Получаем общее количество
-    filters = {}
-    if search:
-        # Для поиска используем ILIKE в репозитории
-        filters['name_search'] = search
-    
-    total = await repo.count(filters)
-    
-    # Получаем данные с пагинацией
     offset = (pagination.page - 1) * pagination.size
-    items = await repo.get_all(
-        limit=pagination.size,
-        offset=offset,
-        order_by=pagination.sort_by or "name",
-        order_desc=(pagination.sort_order == "desc")
-    )
     
-    # Фильтруем по поиску если нужно (так как базовый get_all не поддерживает поиск)
     if search:
-        items = [item for item in items if search.lower() in item.name.lower()]
+        # Нечеткий поиск по названию, результаты по релевантности
+        total = await repo.count({'search': search})
+        items = await repo.search(search, limit=pagination.size, offset=offset)
+    else:
+        total = await repo.count()
+        items = await repo.get_all(
+            limit=pagination.size,
+            offset=offset,
+            order_by=pagination.sort_by or "name",
+            order_desc=(pagination.sort_order == "desc")
+        )
     
     return PaginatedResponse(
         items=items,
@@ -8,7 +8,7 @@ from ...models.user import User, UserCreate, UserUpdate
 from ...models.auth import ChangePasswordRequest
 from ...models.common import PaginatedResponse, SuccessResponse
 from ...core.exceptions import NotFoundError, AlreadyExistsError, AuthorizationError
-from ...core.security import verify_password, get_password_hash
+from ...core.security import verify_password_async
 from ...utils.permissions import PermissionChecker
 from ..deps import (
     UserRepo, RoleRepo, SubdivisionRepo,
@@ -38,23 +38,18 @@ async def get_users(
         current_user, subdivision_id
     )
     
-    # Получаем пользователей
-    users = await repo.get_all_with_roles(filter_subdivision_id)
+    filters = {'subdivision_id': filter_subdivision_id, 'search': search or None}
     
-    # Фильтруем по поиску если нужно
-    if search:
-        users = [u for u in users if search.lower() in u.login.lower()]
-    
-    # Применяем пагинацию вручную
     offset = (pagination.page - 1) * pagination.size
-    paginated_users = users[offset:offset + pagination.size]
+    users = await repo.search(filters, limit=pagination.size, offset=offset)
+    total = await repo.count(filters)
     
     return PaginatedResponse(
-        items=paginated_users,
-        total=len(users),
+        items=users,
+        total=total,
         page=pagination.page,
         size=pagination.size,
-        pages=(len(users) + pagination.size - 1) // pagination.size
+        pages=(total + pagination.size - 1) // pagination.size
     )
 
 
@@ -200,7 +195,7 @@ async def change_password(
     user_in_db = await repo.get_by_login(current_user.login)
     
     # Проверяем старый пароль
-    if not verify_password(data.old_password, user_in_db.passwordhash):
+    if not await verify_password_async(data.old_password, user_in_db.passwordhash):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Неверный старый пароль"
@@ -0,0 +1,160 @@
+# backend/app/core/cache.py
+
+import hashlib
+import secrets
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Generic, Hashable, Iterable, List, Optional, Tuple, TypeVar
+
+from .config import settings
+
+V = TypeVar('V')
+
+
+class TTLCache(Generic[V]):
+    """
+    Ограниченный по размеру LRU-кеш с временем жизни записей.
+
+    Кеш живет в памяти процесса: при нескольких воркерах у каждого
+    свой экземпляр, поэтому TTL ограничивает время устаревания данных.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, V]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """Получить значение по ключу или None"""
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: V, ttl: Optional[float] = None):
+        """Сохранить значение (ttl переопределяет время жизни по умолчанию)"""
+        if self.max_size <= 0:
+            return
+
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        """Удалить значение по ключу"""
+        self._data.pop(key, None)
+
+    def clear(self):
+        """Очистить кеш"""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        """Статистика использования кеша"""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0
+        }
+
+
+class TableVersions:
+    """
+    Счетчики версий таблиц для ETag ответов.
+
+    Версия таблицы растет при каждом ее изменении: локально - в момент
+    записи, в остальных процессах - по уведомлению data_changes после
+    COMMIT. Эпоха - случайная строка, которая меняется при сбросе
+    (например, при потере уведомлений), поэтому ETag, выданные раньше
+    или другим процессом, никогда не совпадут с текущими по ошибке.
+    """
+
+    def __init__(self):
+        self._versions: Dict[str, int] = {}
+        self.epoch = ""
+        self.resets = 0
+        self.reset()
+
+    def reset(self):
+        """Сделать недействительными все выданные ETag"""
+        self._versions.clear()
+        self.epoch = secrets.token_hex(8)
+        self.resets += 1
+
+    def bump(self, table: str):
+        """Отметить изменение таблицы"""
+        self._versions[table] = self._versions.get(table, 0) + 1
+
+    def on_data_change(self, entity: Optional[str], ids: Optional[List[int]] = None):
+        """Обработчик уведомления об изменении данных"""
+        if entity:
+            self.bump(entity)
+
+    def get(self, table: str) -> int:
+        """Текущая версия таблицы"""
+        return self._versions.get(table, 0)
+
+    def etag(self, tables: Iterable[str], scope: Hashable = None) -> str:
+        """
+        ETag ответа, построенного из данных указанных таблиц.
+
+        scope - то, от чего еще зависит ответ (например, подразделение,
+        которым ограничен пользователь).
+        """
+        key = "|".join([self.epoch, *(f"{table}:{self.get(table)}" for table in tables), repr(scope)])
+        return f'W/"{hashlib.sha1(key.encode()).hexdigest()[:20]}"'
+
+    def stats(self) -> Dict[str, Any]:
+        """Текущие версии таблиц"""
+        return {
+            "versions": dict(self._versions),
+            "resets": self.resets
+        }
+
+
+# Кеш аутентифицированных пользователей (ключ - ID пользователя); другие процессы
+# сбрасывают записи по уведомлениям data_changes (см. core.notifications)
+user_cache: TTLCache = TTLCache(
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    ttl=settings.USER_CACHE_TTL
+)
+
+# Кеш общего количества записей для пагинации (ключ - таблица и набор фильтров)
+count_cache: TTLCache = TTLCache(
+    max_size=settings.COUNT_CACHE_MAX_SIZE,
+    ttl=settings.COUNT_CACHE_TTL
+)
+
+# Кеш раскодированных JWT (ключ - SHA-256 токена, время жизни - до exp токена)
+token_cache: TTLCache = TTLCache(
+    max_size=settings.TOKEN_CACHE_MAX_SIZE,
+    ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+)
+
+
+# Версии таблиц для ETag (см. utils.http_cache)
+table_versions = TableVersions()
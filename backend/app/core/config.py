@@ -25,12 +25,48 @@ class Settings(BaseSettings):
     DB_POOL_MAX_QUERIES: int = 50000
     DB_POOL_TIMEOUT: int = 30
     DB_POOL_COMMAND_TIMEOUT: int = 60
+    # Через сколько секунд простоя соединение закрывается (0 - никогда)
+    DB_POOL_MAX_INACTIVE_LIFETIME: float = 300.0
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    
+    # Реплики для чтения (host или host:port) и допустимое отставание в секундах
+    DB_REPLICA_HOSTS: List[str] = []
+    DB_REPLICA_MAX_LAG: float = 5.0
+    DB_REPLICA_CHECK_INTERVAL: float = 5.0
     
     # Безопасность
     SECRET_KEY: str = "your-secret-key-here-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    PASSWORD_HASH_WORKERS: int = 4
+    
+    # Кеш аутентифицированных пользователей
+    USER_CACHE_MAX_SIZE: int = 1024
+    USER_CACHE_TTL: int = 60
+    
+    # Кеш раскодированных access токенов
+    TOKEN_CACHE_MAX_SIZE: int = 4096
+    
+    # Подсчет количества записей для пагинации
+    COUNT_CACHE_MAX_SIZE: int = 512
+    COUNT_CACHE_TTL: int = 30
+    COUNT_ESTIMATE_THRESHOLD: int = 10000
+    
+    # Кеш отчетов о задолженностях
+    DEBT_CACHE_MAX_SIZE: int = 256
+    DEBT_CACHE_TTL: int = 600
+    
+    # Фоновая запись журнала аудита
+    AUDIT_QUEUE_MAX_SIZE: int = 10000
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_INTERVAL: float = 1.0
+    
+    # Выгрузка данных (строк за одно обращение к серверному курсору)
+    EXPORT_FETCH_SIZE: int = 1000
+    
+    # Массовый импорт (строк в одной пачке COPY)
+    IMPORT_BATCH_SIZE: int = 1000
     
     # CSRF
     CSRF_SECRET_KEY: str = "your-csrf-secret-key-here-change-in-production"
@@ -1,46 +1,408 @@
+import asyncio
+import time
 import asyncpg
-from asyncpg import Pool
-from typing import Optional
-from contextlib import asynccontextmanager
+from asyncpg import Connection, Pool
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
 from loguru import logger
 from .config import settings
+from .exceptions import ServiceUnavailableError
+
+
+# Разрешено ли текущему запросу читать с реплик (см. replica_reads)
+_replica_reads: ContextVar[bool] = ContextVar("replica_reads", default=False)
+
+
+@contextmanager
+def replica_reads(enabled: bool = True) -> Iterator[None]:
+    """
+    Разрешить (или запретить) чтение с реплик в пределах блока.
+    
+    Разрешается только для запросов, которые ничего не меняют: тогда
+    все записи запроса идут на основной сервер и чтение своих же изменений
+    не зависит от отставания реплики.
+    """
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def read_from_primary():
+    """
+    Запретить чтение с реплик до конца текущего запроса.
+    
+    Нужно, когда прочитанные данные помечаются текущими версиями таблиц
+    (ETag, кеш): данные с отстающей реплики получили бы более новую
+    версию, чем та, по которой они построены.
+    """
+    _replica_reads.set(False)
+
+
+def _parse_host(address: str) -> Tuple[str, int]:
+    """Разобрать адрес вида host или host:port"""
+    host, _, port = address.strip().rpartition(":")
+    if not host:
+        return port, settings.POSTGRES_PORT
+    return host, int(port)
+
+
+class PoolMetrics:
+    """
+    Статистика выдачи соединений из пула.
+    
+    Время ожидания соединения собирается в гистограмму с верхними
+    границами ACQUIRE_BUCKETS_MS (последняя корзина - все, что дольше).
+    saturated - сколько раз соединение запрашивалось, когда все
+    max_size соединений уже были заняты, то есть лимит пула заставил ждать.
+    """
+    
+    ACQUIRE_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+    
+    def __init__(self):
+        self.reset()
+    
+    def reset(self):
+        """Сбросить накопленную статистику"""
+        self.acquired = 0
+        self.saturated = 0
+        self.timeouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self.buckets: List[int] = [0] * (len(self.ACQUIRE_BUCKETS_MS) + 1)
+    
+    def observe(self, wait_time: float, saturated: bool):
+        """Учесть выданное соединение"""
+        self.acquired += 1
+        if saturated:
+            self.saturated += 1
+        self.wait_time_total += wait_time
+        self.wait_time_max = max(self.wait_time_max, wait_time)
+        
+        wait_ms = wait_time * 1000
+        for i, bound in enumerate(self.ACQUIRE_BUCKETS_MS):
+            if wait_ms <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+    
+    def observe_timeout(self):
+        """Учесть превышение времени ожидания соединения"""
+        self.timeouts += 1
+    
+    def stats(self) -> Dict[str, Any]:
+        """Статистика ожидания соединений"""
+        histogram = {f"le_{bound}ms": count for bound, count in zip(self.ACQUIRE_BUCKETS_MS, self.buckets)}
+        histogram[f"gt_{self.ACQUIRE_BUCKETS_MS[-1]}ms"] = self.buckets[-1]
+        return {
+            "acquired": self.acquired,
+            "saturated": self.saturated,
+            "timeouts": self.timeouts,
+            "wait_time_avg_ms": round(self.wait_time_total / self.acquired * 1000, 2) if self.acquired else 0.0,
+            "wait_time_max_ms": round(self.wait_time_max * 1000, 2),
+            "wait_time_histogram": histogram
+        }
+
+
+class _PoolAcquireContext:
+    """Получение соединения с учетом статистики (await или async with)"""
+    
+    def __init__(self, pool: "InstrumentedPool", timeout: Optional[float]):
+        self._pool = pool
+        self._timeout = timeout
+        self._connection: Optional[Connection] = None
+    
+    async def _acquire(self) -> Connection:
+        pool = self._pool.pool
+        # Свободных соединений нет и новое открыть нельзя - придется ждать
+        saturated = pool.get_idle_size() == 0 and pool.get_size() >= pool.get_max_size()
+        
+        started = time.perf_counter()
+        try:
+            connection = await pool.acquire(timeout=self._timeout)
+        except asyncio.TimeoutError:
+            self._pool.metrics.observe_timeout()
+            logger.warning(f"Timed out waiting {self._timeout}s for a database connection")
+            raise ServiceUnavailableError("Сервер перегружен, повторите запрос позже", "DB_POOL_TIMEOUT")
+        
+        self._pool.metrics.observe(time.perf_counter() - started, saturated)
+        return connection
+    
+    def __await__(self):
+        return self._acquire().__await__()
+    
+    async def __aenter__(self) -> Connection:
+        self._connection = await self._acquire()
+        return self._connection
+    
+    async def __aexit__(self, *exc):
+        connection, self._connection = self._connection, None
+        await self._pool.pool.release(connection)
+
+
+class InstrumentedPool:
+    """
+    Пул соединений asyncpg со статистикой ожидания.
+    
+    acquire() по умолчанию ждет не дольше DB_POOL_TIMEOUT секунд,
+    остальные методы передаются пулу asyncpg как есть.
+    """
+    
+    def __init__(self, pool: Pool, timeout: Optional[float] = None):
+        self.pool = pool
+        self.timeout = timeout
+        self.metrics = PoolMetrics()
+    
+    def acquire(self, *, timeout: Optional[float] = None) -> _PoolAcquireContext:
+        """Получить соединение из пула"""
+        return _PoolAcquireContext(self, timeout if timeout is not None else self.timeout)
+    
+    def __getattr__(self, name: str):
+        return getattr(self.pool, name)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Состояние пула и статистика ожидания соединений"""
+        size = self.pool.get_size()
+        idle = self.pool.get_idle_size()
+        return {
+            "min_size": self.pool.get_min_size(),
+            "max_size": self.pool.get_max_size(),
+            "size": size,
+            "in_use": size - idle,
+            "idle": idle,
+            "acquire_timeout": self.timeout,
+            **self.metrics.stats()
+        }
+
+
+class RequestConnection:
+    """
+    Соединение, общее для всех репозиториев одного HTTP-запроса.
+    
+    Передается репозиториям вместо пула: acquire() при первом обращении
+    берет соединение из пула, дальше отдает его же, поэтому запрос
+    держит не больше одного соединения основного сервера. close()
+    возвращает соединение в пул; после этого acquire() работает с пулом
+    напрямую (так читает, например, потоковая выгрузка, которая
+    продолжается после завершения обработчика).
+    """
+    
+    def __init__(self, pool: InstrumentedPool):
+        self.pool = pool
+        self._connection: Optional[Connection] = None
+        self._closed = False
+    
+    @asynccontextmanager
+    async def acquire(self):
+        """Получить соединение запроса"""
+        if self._closed:
+            async with self.pool.acquire() as connection:
+                yield connection
+            return
+        
+        if self._connection is None:
+            self._connection = await self.pool.acquire()
+        yield self._connection
+    
+    async def close(self):
+        """Вернуть соединение в пул"""
+        self._closed = True
+        if self._connection is not None:
+            connection, self._connection = self._connection, None
+            await self.pool.release(connection)
+
+
+class Replica:
+    """Реплика для чтения и ее последнее измеренное отставание"""
+    
+    def __init__(self, name: str, pool: InstrumentedPool):
+        self.name = name
+        self.pool = pool
+        # None - реплика недоступна или отставание неизвестно
+        self.lag: Optional[float] = None
+    
+    @property
+    def is_available(self) -> bool:
+        """Можно ли сейчас читать с реплики"""
+        return self.lag is not None and self.lag <= settings.DB_REPLICA_MAX_LAG
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "available": self.is_available,
+            "lag": round(self.lag, 3) if self.lag is not None else None,
+            **self.pool.stats()
+        }
 
 
 class Database:
-    """Класс для работы с БД"""
+    """
+    Класс для работы с БД.
+    
+    Помимо основного сервера может держать пулы реплик для чтения
+    (DB_REPLICA_HOSTS). Отставание реплик периодически измеряется,
+    реплика, отставшая больше DB_REPLICA_MAX_LAG секунд или недоступная,
+    не используется, пока не догонит. Если подходящих реплик нет,
+    чтение идет с основного сервера.
+    """
+    
+    # Отставание реплики в секундах; 0, если все полученное уже применено
+    _REPLICA_LAG_QUERY = """
+        SELECT CASE
+            WHEN NOT pg_is_in_recovery() THEN 0
+            WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+            ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+        END
+    """
     
     def __init__(self):
-        self.pool: Optional[Pool] = None
+        self.pool: Optional[InstrumentedPool] = None
+        self.replicas: List[Replica] = []
+        self._next_replica = 0
+        self._monitor: Optional[asyncio.Task] = None
+        self.replica_reads = 0
+        self.primary_reads = 0
+    
+    @staticmethod
+    async def _create_pool(host: str, port: int) -> InstrumentedPool:
+        """Создать пул соединений с сервером БД"""
+        pool = await asyncpg.create_pool(
+            host=host,
+            port=port,
+            user=settings.POSTGRES_USER,
+            password=settings.POSTGRES_PASSWORD,
+            database=settings.POSTGRES_DB,
+            min_size=settings.DB_POOL_MIN_SIZE,
+            max_size=settings.DB_POOL_MAX_SIZE,
+            max_queries=settings.DB_POOL_MAX_QUERIES,
+            max_inactive_connection_lifetime=settings.DB_POOL_MAX_INACTIVE_LIFETIME,
+            command_timeout=settings.DB_POOL_COMMAND_TIMEOUT,
+            statement_cache_size=settings.DB_STATEMENT_CACHE_SIZE
+        )
+        return InstrumentedPool(pool, timeout=settings.DB_POOL_TIMEOUT)
     
     async def connect(self):
         """Создать пул соединений с БД"""
         try:
-            self.pool = await asyncpg.create_pool(
-                host=settings.POSTGRES_SERVER,
-                port=settings.POSTGRES_PORT,
-                user=settings.POSTGRES_USER,
-                password=settings.POSTGRES_PASSWORD,
-                database=settings.POSTGRES_DB,
-                min_size=settings.DB_POOL_MIN_SIZE,
-                max_size=settings.DB_POOL_MAX_SIZE,
-                command_timeout=settings.DB_POOL_COMMAND_TIMEOUT
-            )
+            self.pool = await self._create_pool(settings.POSTGRES_SERVER, settings.POSTGRES_PORT)
             logger.info("Database pool created successfully")
         except Exception as e:
             logger.error(f"Failed to create database pool: {e}")
             raise
+        
+        await self._connect_replicas()
+    
+    async def _connect_replicas(self):
+        """Создать пулы реплик (недоступная реплика не мешает запуску)"""
+        for address in settings.DB_REPLICA_HOSTS:
+            try:
+                host, port = _parse_host(address)
+                pool = await self._create_pool(host, port)
+            except Exception as e:
+                logger.warning(f"Read replica {address} is unavailable, skipping: {e}")
+                continue
+            self.replicas.append(Replica(address, pool))
+            logger.info(f"Read replica {address} pool created")
+        
+        if self.replicas:
+            await self._check_replicas()
+            self._monitor = asyncio.get_running_loop().create_task(self._monitor_replicas())
     
     async def disconnect(self):
         """Закрыть пул соединений"""
+        if self._monitor is not None:
+            self._monitor.cancel()
+            self._monitor = None
+        for replica in self.replicas:
+            await replica.pool.close()
+        self.replicas = []
         if self.pool:
             await self.pool.close()
+            self.pool = None
             logger.info("Database pool closed")
     
+    async def _monitor_replicas(self):
+        """Периодически измерять отставание реплик"""
+        while True:
+            await asyncio.sleep(settings.DB_REPLICA_CHECK_INTERVAL)
+            await self._check_replicas()
+    
+    async def _check_replicas(self):
+        """Измерить отставание каждой реплики"""
+        for replica in self.replicas:
+            was_available = replica.is_available
+            try:
+                async with replica.pool.acquire(timeout=settings.DB_REPLICA_CHECK_INTERVAL) as connection:
+                    lag = await connection.fetchval(self._REPLICA_LAG_QUERY)
+                replica.lag = float(lag) if lag is not None else None
+            except Exception as e:
+                replica.lag = None
+                logger.debug(f"Read replica {replica.name} check failed: {e}")
+            
+            if was_available != replica.is_available:
+                state = "available" if replica.is_available else f"unavailable (lag: {replica.lag})"
+                logger.warning(f"Read replica {replica.name} is {state}")
+    
+    def _choose_replica(self) -> Optional[Replica]:
+        """Выбрать реплику для чтения (по кругу среди доступных)"""
+        if not self.replicas or not _replica_reads.get():
+            return None
+        available = [replica for replica in self.replicas if replica.is_available]
+        if not available:
+            return None
+        self._next_replica = (self._next_replica + 1) % len(available)
+        return available[self._next_replica]
+    
     @asynccontextmanager
-    async def acquire(self):
-        """Получить соединение из пула"""
+    async def replica_connection(self):
+        """
+        Соединение с репликой для чтения.
+        
+        Дает None, если реплику использовать нельзя (чтение с реплик не
+        разрешено для текущего запроса, подходящих реплик нет или реплика
+        не отвечает): тогда читать нужно с основного сервера тем
+        соединением, которое уже есть у вызывающего.
+        """
+        replica = self._choose_replica()
+        connection = None
+        if replica is not None:
+            try:
+                connection = await replica.pool.acquire()
+            except Exception as e:
+                # Реплика не отвечает - читаем с основного сервера до следующей проверки
+                replica.lag = None
+                logger.warning(f"Read replica {replica.name} failed, falling back to primary: {e}")
+        
+        if connection is None:
+            self.primary_reads += 1
+            yield None
+            return
+        
+        self.replica_reads += 1
+        try:
+            yield connection
+        finally:
+            await replica.pool.release(connection)
+    
+    @asynccontextmanager
+    async def acquire(self, readonly: bool = False):
+        """
+        Получить соединение из пула.
+        
+        readonly=True - запрос только читает данные и может уйти на реплику,
+        если это разрешено для текущего запроса (replica_reads).
+        """
         if not self.pool:
             await self.connect()
+        
+        if readonly:
+            async with self.replica_connection() as connection:
+                if connection is not None:
+                    yield connection
+                    return
+        
         async with self.pool.acquire() as connection:
             yield connection
     
@@ -71,11 +433,22 @@ class Database:
         async with self.acquire() as connection:
             return await connection.fetchval(query, *args)
     
-    async def get_pool(self) -> Pool:
+    async def get_pool(self) -> InstrumentedPool:
         """Получить пул соединений"""
         if not self.pool:
             await self.connect()
         return self.pool
+    
+    def stats(self) -> Dict[str, Any]:
+        """Статистика пула соединений"""
+        if not self.pool:
+            return {"connected": False}
+        return {
+            "connected": True,
+            **self.pool.stats(),
+            "reads": {"replica": self.replica_reads, "primary": self.primary_reads},
+            "replicas": [replica.stats() for replica in self.replicas]
+        }
 
 
 # Создаем глобальный экземпляр базы данных
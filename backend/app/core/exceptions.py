@@ -53,6 +53,12 @@ class DatabaseError(AppException):
         super().__init__(message, code, 500)
 
 
+class ServiceUnavailableError(AppException):
+    """Исключение для временной недоступности сервиса (перегрузка)"""
+    def __init__(self, message: str = "Сервис временно недоступен", code: str = "SERVICE_UNAVAILABLE"):
+        super().__init__(message, code, 503)
+
+
 class BusinessLogicError(AppException):
     """Исключение для ошибок бизнес-логики"""
     def __init__(self, message: str, code: str = "BUSINESS_ERROR"):
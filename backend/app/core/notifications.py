@@ -0,0 +1,169 @@
+# backend/app/core/notifications.py
+
+import asyncio
+import json
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from asyncpg import Connection
+from loguru import logger
+
+from .cache import table_versions, user_cache
+from .database import db
+
+# Канал PostgreSQL NOTIFY, в который репозитории сообщают об изменениях данных
+DATA_CHANGES_CHANNEL = "data_changes"
+
+# Больше ID в одном уведомлении не передаем (лимит payload NOTIFY - 8000 байт):
+# получатели перечитывают данные целиком
+NOTIFY_MAX_IDS = 500
+
+# Обработчик изменения: (сущность, ID записей или None - неизвестно какие)
+ChangeHandler = Callable[[Optional[str], Optional[List[int]]], None]
+
+
+async def notify_changes(conn: Connection, entity: str, ids: Optional[Iterable[int]] = None):
+    """
+    Сообщить всем процессам приложения об изменении записей.
+    
+    Внутри транзакции PostgreSQL доставляет уведомление только после
+    COMMIT, поэтому при откате получатели ничего не узнают. ids=None
+    означает, что изменилось неизвестное множество записей.
+    
+    Версия таблицы в текущем процессе увеличивается сразу: ETag,
+    выданный до COMMIT, все равно устареет, когда придет уведомление.
+    """
+    id_list = sorted({id for id in ids if id is not None}) if ids is not None else None
+    if id_list is not None and not id_list:
+        return
+    if id_list is not None and len(id_list) > NOTIFY_MAX_IDS:
+        id_list = None
+    
+    table_versions.bump(entity)
+    payload = json.dumps({"entity": entity, "ids": id_list}, separators=(",", ":"))
+    await conn.execute("SELECT pg_notify($1, $2)", DATA_CHANGES_CHANNEL, payload)
+
+
+class DataChangeListener:
+    """
+    Подписка процесса на канал data_changes.
+    
+    Слушает канал на отдельном соединении из пула и передает уведомления
+    подписчикам. Если соединение потеряно, подписчики получают on_reset:
+    пропущенные изменения неизвестны, и все, что построено по уведомлениям,
+    нужно сбросить.
+    """
+    
+    # Не чаще одной попытки переподключения за столько секунд
+    RETRY_INTERVAL = 5.0
+    
+    def __init__(self):
+        self._connection: Optional[Connection] = None
+        self._pool = None
+        self._handlers: List[Tuple[ChangeHandler, Optional[Callable[[], None]]]] = []
+        self._lock = asyncio.Lock()
+        self._retry_at = 0.0
+        self.notifications = 0
+        self.disconnects = 0
+    
+    @property
+    def is_listening(self) -> bool:
+        """Активна ли подписка на уведомления"""
+        return self._connection is not None and not self._connection.is_closed()
+    
+    def subscribe(self, handler: ChangeHandler, on_reset: Optional[Callable[[], None]] = None):
+        """Добавить подписчика"""
+        if all(item[0] != handler for item in self._handlers):
+            self._handlers.append((handler, on_reset))
+    
+    def unsubscribe(self, handler: ChangeHandler):
+        """Удалить подписчика"""
+        self._handlers = [item for item in self._handlers if item[0] != handler]
+    
+    async def start(self):
+        """Подписаться на уведомления об изменениях"""
+        async with self._lock:
+            if self.is_listening:
+                return
+            pool = await db.get_pool()
+            connection = await pool.acquire()
+            try:
+                await connection.add_listener(DATA_CHANGES_CHANNEL, self._on_notification)
+                connection.add_termination_listener(self._on_terminated)
+            except Exception:
+                await pool.release(connection)
+                raise
+            self._pool, self._connection = pool, connection
+            logger.info("Listening for data change notifications")
+    
+    async def ensure_started(self) -> bool:
+        """Подписаться, если подписки нет; False, если это сейчас невозможно"""
+        if self.is_listening:
+            return True
+        if time.monotonic() < self._retry_at:
+            return False
+        try:
+            await self.start()
+        except Exception as e:
+            self._retry_at = time.monotonic() + self.RETRY_INTERVAL
+            logger.warning(f"Failed to listen for data change notifications: {e}")
+            return False
+        return True
+    
+    async def stop(self):
+        """Отписаться от уведомлений и вернуть соединение в пул"""
+        if self._connection is None:
+            return
+        connection, self._connection = self._connection, None
+        if not connection.is_closed():
+            connection.remove_termination_listener(self._on_terminated)
+            await connection.remove_listener(DATA_CHANGES_CHANNEL, self._on_notification)
+            await self._pool.release(connection)
+    
+    def _on_notification(self, connection, pid, channel, payload: str):
+        """Обработчик уведомления PostgreSQL"""
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            logger.warning(f"Invalid data change notification: {payload}")
+            return
+        
+        self.notifications += 1
+        for handler, _ in list(self._handlers):
+            try:
+                handler(message.get("entity"), message.get("ids"))
+            except Exception as e:
+                logger.error(f"Data change handler failed: {e}")
+    
+    def _on_terminated(self, connection):
+        """Соединение закрыто: изменения могли быть пропущены"""
+        logger.warning("Data change listener connection lost")
+        self._connection = None
+        self.disconnects += 1
+        for _, on_reset in list(self._handlers):
+            if on_reset is not None:
+                on_reset()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Статистика подписки"""
+        return {
+            "listening": self.is_listening,
+            "subscribers": len(self._handlers),
+            "notifications": self.notifications,
+            "disconnects": self.disconnects
+        }
+
+
+def _invalidate_users(entity: Optional[str], ids: Optional[List[int]] = None):
+    """Сбросить кешированных пользователей, измененных в любом процессе"""
+    if entity == "users" and ids is not None:
+        for id in ids:
+            user_cache.invalidate(id)
+    elif entity in ("users", "roles", "subdivisions"):
+        # Названия ролей и подразделений входят в кешированных пользователей
+        user_cache.clear()
+
+
+# Глобальная подписка на изменения данных
+data_change_listener = DataChangeListener()
+data_change_listener.subscribe(table_versions.on_data_change, table_versions.reset)
+data_change_listener.subscribe(_invalidate_users, user_cache.clear)
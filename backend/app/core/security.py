@@ -1,10 +1,13 @@
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from loguru import logger
+import asyncio
 import secrets
 import hashlib
+import time
 from .config import settings
 
 # Контекст для хеширования паролей
@@ -60,6 +63,82 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+class PasswordHashPool:
+    """
+    Пул потоков для bcrypt.
+    
+    Хеширование занимает сотни миллисекунд и блокировало бы цикл событий,
+    поэтому выполняется в ограниченном пуле потоков (bcrypt отпускает GIL).
+    Собирает время ожидания задач в очереди пула.
+    """
+    
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.pending = 0
+        self.completed = 0
+        self.queue_time_total = 0.0
+        self.queue_time_max = 0.0
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="password-hash"
+            )
+        return self._executor
+    
+    async def run(self, func: Callable, *args) -> Any:
+        """Выполнить функцию в пуле и дождаться результата"""
+        submitted = time.perf_counter()
+        
+        def task() -> Tuple[Any, float]:
+            queue_time = time.perf_counter() - submitted
+            return func(*args), queue_time
+        
+        loop = asyncio.get_running_loop()
+        self.pending += 1
+        try:
+            result, queue_time = await loop.run_in_executor(self._get_executor(), task)
+        finally:
+            self.pending -= 1
+        
+        self.completed += 1
+        self.queue_time_total += queue_time
+        self.queue_time_max = max(self.queue_time_max, queue_time)
+        return result
+    
+    def shutdown(self):
+        """Остановить пул потоков"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+    
+    def stats(self) -> Dict[str, Any]:
+        """Статистика пула хеширования"""
+        return {
+            "max_workers": self.max_workers,
+            "pending": self.pending,
+            "completed": self.completed,
+            "queue_time_avg_ms": round(self.queue_time_total / self.completed * 1000, 2) if self.completed else 0.0,
+            "queue_time_max_ms": round(self.queue_time_max * 1000, 2)
+        }
+
+
+# Пул для хеширования и проверки паролей
+password_hash_pool = PasswordHashPool(max_workers=settings.PASSWORD_HASH_WORKERS)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Проверить пароль, не блокируя цикл событий"""
+    return await password_hash_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Получить хеш пароля, не блокируя цикл событий"""
+    return await password_hash_pool.run(get_password_hash, password)
+
+
 def generate_csrf_token() -> str:
     """Генерировать CSRF токен"""
     return secrets.token_urlsafe(32)
@@ -70,6 +149,11 @@ def verify_csrf_token(token: str, expected: str) -> bool:
     return secrets.compare_digest(token, expected)
 
 
+def hash_token(token: str) -> str:
+    """Хешировать токен (SHA-256)"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
 def hash_refresh_token(token: str) -> str:
     """Хешировать refresh токен для хранения в БД"""
-    return hashlib.sha256(token.encode()).hexdigest()
\ No newline at end of file
+    return hash_token(token)
\ No newline at end of file
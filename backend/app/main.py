@@ -7,10 +7,18 @@ import os
 
 from .core.config import settings
 from .core.database import db
+from .core.cache import user_cache, count_cache, token_cache, table_versions
+from .core.notifications import data_change_listener
+from .core.security import password_hash_pool
 from .core.exceptions import AppException
 from .core.migrations import migration_manager
 from .api.v1 import api_router
 from .middleware.security import SecurityHeadersMiddleware
+from .middleware.read_routing import ReadRoutingMiddleware
+from .services.audit_writer import audit_writer
+from .services.suggest_index import suggest_index
+from .services.debt_engine import debt_engine
+from .repositories.query_registry import query_registry
 
 
 # Настройка логирования
@@ -52,6 +60,9 @@ app.add_middleware(
 # Добавляем middleware для безопасности
 app.add_middleware(SecurityHeadersMiddleware)
 
+# Чтение с реплик для запросов, не изменяющих данные
+app.add_middleware(ReadRoutingMiddleware)
+
 
 # Обработчики исключений
 @app.exception_handler(AppException)
@@ -103,6 +114,10 @@ async def startup_event():
             await migration_manager.run_migrations()
             logger.info("Database migrations completed")
         
+        await audit_writer.start()
+        await data_change_listener.start()
+        await suggest_index.start()
+        
     except Exception as e:
         logger.error(f"Failed to initialize application: {e}")
         raise
@@ -113,6 +128,21 @@ async def shutdown_event():
     """Очистка при остановке"""
     logger.info("Shutting down Student Union Management System...")
     
+    try:
+        # Сбрасываем накопленные логи аудита до закрытия пула
+        await audit_writer.stop()
+    except Exception as e:
+        logger.error(f"Error stopping audit log writer: {e}")
+    
+    password_hash_pool.shutdown()
+    
+    try:
+        # Возвращаем соединение слушателя уведомлений в пул
+        await suggest_index.stop()
+        await data_change_listener.stop()
+    except Exception as e:
+        logger.error(f"Error stopping data change listener: {e}")
+    
     try:
         await db.disconnect()
         logger.info("Database connection closed")
@@ -180,4 +210,24 @@ async def migrations_status():
         return JSONResponse(
             status_code=500,
             content={"error": "Failed to get migration status"}
-        )
\ No newline at end of file
+        )
+
+
+@app.get("/metrics")
+async def metrics():
+    """Внутренние метрики приложения"""
+    return {
+        "database": db.stats(),
+        "caches": {
+            "users": user_cache.stats(),
+            "tokens": token_cache.stats(),
+            "counts": count_cache.stats(),
+            "debts": debt_engine.stats()
+        },
+        "table_versions": table_versions.stats(),
+        "data_changes": data_change_listener.stats(),
+        "audit_writer": audit_writer.stats(),
+        "password_hashing": password_hash_pool.stats(),
+        "suggest_index": suggest_index.stats(),
+        "queries": query_registry.stats()
+    }
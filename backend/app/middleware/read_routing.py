@@ -0,0 +1,25 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from ..core.database import replica_reads
+
+
+class ReadRoutingMiddleware:
+    """
+    Разрешает запросам GET и HEAD читать с реплик БД.
+    
+    Запросы, изменяющие данные, целиком работают с основным сервером,
+    поэтому в пределах запроса всегда видны собственные изменения.
+    """
+    
+    SAFE_METHODS = frozenset({"GET", "HEAD"})
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] not in self.SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+        
+        with replica_reads():
+            await self.app(scope, receive, send)
@@ -6,15 +6,23 @@ from .role import Role, RoleCreate, RoleUpdate
 from .subdivision import Subdivision, SubdivisionCreate, SubdivisionUpdate, SubdivisionWithStats
 from .group import Group, GroupCreate, GroupUpdate, GroupWithStats
 from .student_data import StudentData, StudentDataCreate, StudentDataUpdate
-from .student import Student, StudentCreate, StudentUpdate, StudentWithDetails, BulkOperationResult
+from .student import (
+    Student, StudentCreate, StudentUpdate, StudentWithDetails, BulkOperationResult,
+    ImportRowError, StudentImportResult
+)
 from .additional_status import AdditionalStatus, AdditionalStatusCreate, AdditionalStatusUpdate
 from .hostel_student import HostelStudent, HostelStudentCreate, HostelStudentUpdate
-from .contribution import Contribution, ContributionCreate, ContributionUpdate, ContributionSummary
+from .contribution import (
+    Contribution, ContributionCreate, ContributionUpdate, ContributionSummary,
+    StudentDebt, SubdivisionDebtSummary, DebtReport
+)
 from .user_role import UserRole, UserRoleCreate, UserRoleUpdate
 from .student_additional_status import StudentAdditionalStatus, StudentAdditionalStatusCreate, StudentAdditionalStatusUpdate
+from .stats import GroupStats, StatsRefreshResult
+from .search import Suggestion, SuggestResponse
 from .common import (
     QueryParams, PaginationParams, SortParams, FilterParams,
-    PaginatedResponse, ErrorResponse, SuccessResponse, BulkOperationResult as CommonBulkOperationResult
+    CountStrategy, PaginatedResponse, CursorPaginatedResponse, ErrorResponse, SuccessResponse, BulkOperationResult as CommonBulkOperationResult
 )
 
 __all__ = [
@@ -38,6 +46,7 @@ __all__ = [
     
     # Student
     "Student", "StudentCreate", "StudentUpdate", "StudentWithDetails", "BulkOperationResult",
+    "ImportRowError", "StudentImportResult",
     
     # Additional Status
     "AdditionalStatus", "AdditionalStatusCreate", "AdditionalStatusUpdate",
@@ -47,12 +56,19 @@ __all__ = [
     
     # Contribution
     "Contribution", "ContributionCreate", "ContributionUpdate", "ContributionSummary",
+    "StudentDebt", "SubdivisionDebtSummary", "DebtReport",
     
     # Relations
     "UserRole", "UserRoleCreate", "UserRoleUpdate",
     "StudentAdditionalStatus", "StudentAdditionalStatusCreate", "StudentAdditionalStatusUpdate",
     
+    # Stats
+    "GroupStats", "StatsRefreshResult",
+    
+    # Search
+    "Suggestion", "SuggestResponse",
+    
     # Common
     "QueryParams", "PaginationParams", "SortParams", "FilterParams",
-    "PaginatedResponse", "ErrorResponse", "SuccessResponse", "CommonBulkOperationResult"
+    "CountStrategy", "PaginatedResponse", "CursorPaginatedResponse", "ErrorResponse", "SuccessResponse", "CommonBulkOperationResult"
 ]
\ No newline at end of file
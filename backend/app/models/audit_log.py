@@ -33,6 +33,8 @@ class AuditLogCreate(BaseModel):
     new_data: Optional[str] = None
     ip_address: Optional[str] = None
     user_agent: Optional[str] = None
+    # Время действия (с часовым поясом); None - время записи в БД
+    created_at: Optional[datetime] = None
 
 
 class AuditLogFilter(BaseModel):
@@ -1,3 +1,4 @@
+from enum import Enum
 from typing import Optional, List, Dict, Any, Generic, TypeVar
 from pydantic import BaseModel, Field
 
@@ -31,6 +32,13 @@ class FilterParams(BaseModel):
     value: Any
 
 
+class CountStrategy(str, Enum):
+    """Способ подсчета общего количества записей"""
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    CACHED = "cached"
+
+
 class PaginatedResponse(BaseModel, Generic[T]):
     """Пагинированный ответ"""
     items: List[T]
@@ -38,6 +46,18 @@ class PaginatedResponse(BaseModel, Generic[T]):
     page: int = Field(..., description="Текущая страница")
     size: int = Field(..., description="Размер страницы")
     pages: int = Field(..., description="Общее количество страниц")
+    count_strategy: CountStrategy = Field(
+        default=CountStrategy.EXACT,
+        description="Способ, которым был получен total"
+    )
+
+
+class CursorPaginatedResponse(BaseModel, Generic[T]):
+    """Ответ с курсорной (keyset) пагинацией"""
+    items: List[T]
+    size: int = Field(..., description="Размер страницы")
+    next_cursor: Optional[str] = Field(None, description="Курсор следующей страницы")
+    has_more: bool = Field(default=False, description="Есть ли следующая страница")
 
 
 class ErrorResponse(BaseModel):
@@ -1,6 +1,6 @@
 # backend/app/models/contribution.py
 
-from typing import Optional
+from typing import List, Optional
 from datetime import date
 from decimal import Decimal
 from pydantic import BaseModel, Field, field_validator
@@ -59,4 +59,28 @@ class ContributionSummary(BaseModel):
     total_amount: Decimal = Field(..., description="Общая сумма")
     paid_count: int = Field(..., description="Количество оплаченных")
     unpaid_count: int = Field(..., description="Количество неоплаченных")
-    total_students: int = Field(..., description="Общее количество студентов")
\ No newline at end of file
+    total_students: int = Field(..., description="Общее количество студентов")
+
+class StudentDebt(BaseModel):
+    """Студент с задолженностью"""
+    student_id: int = Field(..., description="ID студента")
+    fullname: str = Field(..., description="ФИО студента")
+    group_id: int = Field(..., description="ID группы")
+    group_name: str = Field(..., description="Название группы")
+    subdivision_id: int = Field(..., description="ID подразделения")
+
+
+class SubdivisionDebtSummary(BaseModel):
+    """Сводка по задолженностям подразделения"""
+    subdivision_id: int = Field(..., description="ID подразделения")
+    subdivision_name: str = Field(..., description="Название подразделения")
+    total_students: int = Field(..., description="Активных студентов")
+    debtors_count: int = Field(..., description="Студентов с задолженностью")
+
+
+class DebtReport(BaseModel):
+    """Задолженности за год: по студентам и по подразделениям"""
+    year: int = Field(..., description="Год")
+    semester: Optional[int] = Field(None, description="Проверяемый семестр (None - весь год)")
+    students: List[StudentDebt] = Field(default_factory=list, description="Студенты с задолженностью")
+    subdivisions: List[SubdivisionDebtSummary] = Field(default_factory=list, description="Сводка по подразделениям")
@@ -0,0 +1,16 @@
+# backend/app/models/search.py
+
+from typing import List
+from pydantic import BaseModel, Field
+
+
+class Suggestion(BaseModel):
+    """Подсказка для поля поиска"""
+    id: int = Field(..., description="ID записи")
+    name: str = Field(..., description="ФИО студента или название группы")
+
+
+class SuggestResponse(BaseModel):
+    """Подсказки по студентам и группам"""
+    students: List[Suggestion] = Field(default_factory=list, description="Студенты")
+    groups: List[Suggestion] = Field(default_factory=list, description="Группы")
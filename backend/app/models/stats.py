@@ -0,0 +1,24 @@
+# backend/app/models/stats.py
+
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class GroupStats(BaseModel):
+    """Предрассчитанная статистика группы"""
+    groupid: int = Field(..., description="ID группы")
+    students_count: int = Field(default=0, description="Количество студентов")
+    active_students_count: int = Field(default=0, description="Количество активных студентов")
+    budget_students_count: int = Field(default=0, description="Количество бюджетников")
+    refreshed_at: Optional[datetime] = Field(None, description="Время последнего пересчета")
+
+    model_config = {
+        "from_attributes": True
+    }
+
+
+class StatsRefreshResult(BaseModel):
+    """Результат пересчета статистики"""
+    groups_refreshed: int = Field(..., description="Количество пересчитанных групп")
+    refreshed_at: datetime = Field(..., description="Время пересчета")
@@ -5,12 +5,14 @@ from pydantic import Field, field_validator, BaseModel
 from .base import BaseDBModel, BaseCreateModel, BaseUpdateModel
 from .student_data import StudentData, StudentDataCreate, StudentDataUpdate
 from .additional_status import AdditionalStatus
+from .hostel_student import HostelStudent
+from .contribution import Contribution
 
 
 class StudentBase(BaseModel):
     """Базовая модель студента"""
     groupid: int = Field(..., description="ID группы", alias="group_id")
-    fullname: str = Field(..., description="ФИО студента", alias="full_name")
+    fullname: str = Field(..., max_length=255, description="ФИО студента", alias="full_name")
     isactive: bool = Field(default=False, description="Активный член профсоюза", alias="is_active")
     isbudget: bool = Field(..., description="Бюджетник", alias="is_budget")
     year: int = Field(..., ge=2000, le=2100, description="Год поступления")
@@ -53,7 +55,7 @@ class StudentCreate(BaseCreateModel, StudentBase):
 class StudentUpdate(BaseUpdateModel):
     """Модель для обновления студента"""
     groupid: Optional[int] = Field(None, description="ID группы", alias="group_id")
-    fullname: Optional[str] = Field(None, description="ФИО студента", alias="full_name")
+    fullname: Optional[str] = Field(None, max_length=255, description="ФИО студента", alias="full_name")
     isactive: Optional[bool] = Field(None, description="Активный член профсоюза", alias="is_active")
     isbudget: Optional[bool] = Field(None, description="Бюджетник", alias="is_budget")
     year: Optional[int] = Field(None, ge=2000, le=2100, description="Год поступления")
@@ -75,7 +77,9 @@ class StudentUpdate(BaseUpdateModel):
 
 class StudentWithDetails(Student):
     """Модель студента с полными деталями"""
-    pass
+    subdivision_id: Optional[int] = Field(None, description="ID подразделения группы")
+    hostel_info: Optional[HostelStudent] = Field(None, description="Проживание в общежитии")
+    contributions: List[Contribution] = Field(default_factory=list, description="Взносы (от новых к старым)")
 
 
 class BulkOperationResult(BaseModel):
@@ -85,6 +89,20 @@ class BulkOperationResult(BaseModel):
     errors: List[str] = Field(default_factory=list, description="Список ошибок")
 
 
+class ImportRowError(BaseModel):
+    """Ошибки одной строки импорта"""
+    row: int = Field(..., description="Номер строки в файле (с 1, без заголовка)")
+    errors: List[str] = Field(..., description="Описание ошибок")
+
+
+class StudentImportResult(BaseModel):
+    """Результат массового импорта студентов"""
+    total_rows: int = Field(..., description="Количество строк в файле")
+    imported_count: int = Field(..., description="Количество добавленных студентов")
+    error_count: int = Field(..., description="Количество отклоненных строк")
+    errors: List[ImportRowError] = Field(default_factory=list, description="Ошибки по строкам")
+
+
 class StudentInDB(Student):
     """Модель студента в БД (legacy)"""
     pass
\ No newline at end of file
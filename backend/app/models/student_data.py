@@ -5,8 +5,8 @@ from .base import BaseDBModel, BaseCreateModel, BaseUpdateModel
 
 
 class StudentDataBase(BaseModel):
-    phone: Optional[str] = Field(None, description="Номер телефона")
-    email: Optional[str] = Field(None, description="Email адрес")
+    phone: Optional[str] = Field(None, max_length=20, description="Номер телефона")
+    email: Optional[str] = Field(None, max_length=255, description="Email адрес")
     birthday: Optional[date] = Field(None, description="Дата рождения")
 
 
@@ -22,6 +22,6 @@ class StudentDataCreate(BaseCreateModel, StudentDataBase):
 
 class StudentDataUpdate(BaseUpdateModel):
     """Модель для обновления данных студента"""
-    phone: Optional[str] = None
-    email: Optional[str] = None
+    phone: Optional[str] = Field(None, max_length=20)
+    email: Optional[str] = Field(None, max_length=255)
     birthday: Optional[date] = None
\ No newline at end of file
@@ -7,6 +7,7 @@ from .user_repository import UserRepository
 from .student_repository import StudentRepository
 from .hostel_repository import HostelRepository
 from .contribution_repository import ContributionRepository
+from .stats_repository import StatsRepository
 
 __all__ = [
     'BaseRepository',
@@ -17,5 +18,6 @@ __all__ = [
     'UserRepository',
     'StudentRepository',
     'HostelRepository',
-    'ContributionRepository'
+    'ContributionRepository',
+    'StatsRepository'
 ]
\ No newline at end of file
@@ -1,6 +1,7 @@
 from typing import Optional, List
 from asyncpg import Connection
 from .base import BaseRepository
+from ..core.notifications import notify_changes
 from ..models.additional_status import AdditionalStatus, AdditionalStatusCreate, AdditionalStatusUpdate
 
 
@@ -25,6 +26,7 @@ class AdditionalStatusRepository(BaseRepository[AdditionalStatus]):
         
         async with self._get_connection(conn) as connection:
             row = await connection.fetchrow(query, data.name)
+            await notify_changes(connection, "additionalstatuses", [row['id']])
             return AdditionalStatus(**dict(row))
     
     async def update(self, id: int, data: AdditionalStatusUpdate, conn: Optional[Connection] = None) -> Optional[AdditionalStatus]:
@@ -42,7 +44,18 @@ class AdditionalStatusRepository(BaseRepository[AdditionalStatus]):
         
         async with self._get_connection(conn) as connection:
             row = await connection.fetchrow(query, id, data.name)
-            return AdditionalStatus(**dict(row)) if row else None
+            if not row:
+                return None
+            await notify_changes(connection, "additionalstatuses", [id])
+            return AdditionalStatus(**dict(row))
+    
+    async def delete(self, id: int, conn: Optional[Connection] = None) -> bool:
+        """Удалить дополнительный статус"""
+        async with self._get_connection(conn) as connection:
+            result = await super().delete(id, connection)
+            if result:
+                await notify_changes(connection, "additionalstatuses", [id])
+            return result
     
     async def get_by_name(self, name: str, conn: Optional[Connection] = None) -> Optional[AdditionalStatus]:
         """Получить статус по имени"""
@@ -1,10 +1,77 @@
 # backend/app/repositories/audit_log_repository.py
 
-from typing import Optional, List, Dict, Any
-from datetime import datetime
+from typing import Optional, List, Dict, Any, Tuple
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from asyncpg import Connection
 from .base import BaseRepository
+from .query_registry import query_registry, Slot
 from ..models.audit_log import AuditLog, AuditLogCreate, AuditLogFilter
+from ..models.common import CountStrategy
+
+
+# Фильтры поиска логов (алиас al - audit_logs)
+AUDIT_LOG_FILTERS = (
+    Slot('user_id', "al.user_id = {0}"),
+    Slot('action', "al.action = {0}"),
+    Slot('table_name', "al.table_name = {0}"),
+    Slot('record_id', "al.record_id = {0}"),
+    Slot('date_from', "al.created_at >= {0}"),
+    Slot('date_to', "al.created_at <= {0}"),
+)
+
+_AUDIT_LOG_SEARCH_SOURCE = """
+    SELECT 
+        al.*,
+        u.login as user_login
+    FROM audit_logs al
+    LEFT JOIN users u ON u.id = al.user_id
+    WHERE 1=1{where}
+"""
+
+AUDIT_LOGS_SEARCH = query_registry.template(
+    "audit_logs.search",
+    _AUDIT_LOG_SEARCH_SOURCE + " ORDER BY al.created_at DESC, al.id DESC LIMIT {limit} OFFSET {offset}",
+    AUDIT_LOG_FILTERS
+)
+
+AUDIT_LOGS_SEARCH_AFTER = query_registry.template(
+    "audit_logs.search_after",
+    _AUDIT_LOG_SEARCH_SOURCE
+    + " AND (al.created_at, al.id) < ({after_created_at}, {after_id})"
+    + " ORDER BY al.created_at DESC, al.id DESC LIMIT {limit}",
+    AUDIT_LOG_FILTERS
+)
+
+AUDIT_LOGS_COUNT = query_registry.template(
+    "audit_logs.count",
+    "FROM audit_logs al WHERE 1=1{where}",
+    AUDIT_LOG_FILTERS
+)
+
+
+def _filter_values(filters: AuditLogFilter) -> Dict[str, Any]:
+    """Заданные фильтры логов (пустые значения не учитываются)"""
+    return {key: value for key, value in filters.model_dump().items() if value}
+
+
+def _session_time(connection: Connection, value: Optional[datetime]) -> Optional[datetime]:
+    """
+    Перевести время в часовой пояс сессии БД.
+    
+    Столбец created_at - TIMESTAMP без часового пояса, который по умолчанию
+    заполняется CURRENT_TIMESTAMP в поясе сессии; переданное время должно
+    быть в том же поясе.
+    """
+    if value is None:
+        return None
+    try:
+        zone = ZoneInfo(connection.get_settings().TimeZone)
+    except (AttributeError, ValueError, ZoneInfoNotFoundError):
+        zone = timezone.utc
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(zone).replace(tzinfo=None)
 
 
 class AuditLogRepository(BaseRepository[AuditLog]):
@@ -43,6 +110,44 @@ class AuditLogRepository(BaseRepository[AuditLog]):
             )
             return await self.get_with_user_info(row['id'], connection)
     
+    async def create_many(self, items: List[AuditLogCreate], conn: Optional[Connection] = None) -> int:
+        """
+        Записать пачку логов через COPY (без возврата созданных строк).
+        
+        Записи из очереди несут время действия (created_at), а не время
+        сброса пачки; без него используется текущее время.
+        """
+        if not items:
+            return 0
+        
+        columns = [
+            'user_id', 'action', 'table_name', 'record_id',
+            'old_data', 'new_data', 'ip_address', 'user_agent', 'created_at'
+        ]
+        now = datetime.now(timezone.utc)
+        
+        async with self._get_connection(conn) as connection:
+            records = [
+                (
+                    item.user_id,
+                    item.action,
+                    item.table_name,
+                    item.record_id,
+                    item.old_data,
+                    item.new_data,
+                    item.ip_address,
+                    item.user_agent,
+                    _session_time(connection, item.created_at or now)
+                )
+                for item in items
+            ]
+            await connection.copy_records_to_table(
+                self.table_name,
+                records=records,
+                columns=columns
+            )
+            return len(records)
+    
     async def get_with_user_info(self, id: int, conn: Optional[Connection] = None) -> Optional[AuditLog]:
         """Получить лог с информацией о пользователе"""
         query = """
@@ -63,94 +168,44 @@ class AuditLogRepository(BaseRepository[AuditLog]):
         filters: AuditLogFilter,
         limit: int = 100,
         offset: int = 0,
+        after: Optional[Tuple[datetime, int]] = None,
         conn: Optional[Connection] = None
     ) -> List[AuditLog]:
-        """Поиск логов по фильтрам"""
-        query = """
-            SELECT 
-                al.*,
-                u.login as user_login
-            FROM audit_logs al
-            LEFT JOIN users u ON u.id = al.user_id
-            WHERE 1=1
         """
+        Поиск логов по фильтрам.
         
-        params = []
-        param_count = 1
-        
-        if filters.user_id:
-            query += f" AND al.user_id = ${param_count}"
-            params.append(filters.user_id)
-            param_count += 1
-        
-        if filters.action:
-            query += f" AND al.action = ${param_count}"
-            params.append(filters.action)
-            param_count += 1
-        
-        if filters.table_name:
-            query += f" AND al.table_name = ${param_count}"
-            params.append(filters.table_name)
-            param_count += 1
-        
-        if filters.record_id:
-            query += f" AND al.record_id = ${param_count}"
-            params.append(filters.record_id)
-            param_count += 1
-        
-        if filters.date_from:
-            query += f" AND al.created_at >= ${param_count}"
-            params.append(filters.date_from)
-            param_count += 1
-        
-        if filters.date_to:
-            query += f" AND al.created_at <= ${param_count}"
-            params.append(filters.date_to)
-            param_count += 1
-        
-        query += f" ORDER BY al.created_at DESC LIMIT ${param_count} OFFSET ${param_count + 1}"
-        params.extend([limit, offset])
-        
-        async with self._get_connection(conn) as connection:
+        Если передан after (created_at, id), используется keyset-пагинация
+        от более новых записей к более старым, offset игнорируется.
+        """
+        values = _filter_values(filters)
+        
+        async with self._get_connection(conn, readonly=True) as connection:
+            if after is not None:
+                query, params = AUDIT_LOGS_SEARCH_AFTER.prepare(
+                    connection, values, after_created_at=after[0], after_id=after[1], limit=limit
+                )
+            else:
+                query, params = AUDIT_LOGS_SEARCH.prepare(connection, values, limit=limit, offset=offset)
+            
             rows = await connection.fetch(query, *params)
             return [AuditLog(**dict(row)) for row in rows]
     
     async def count_logs(self, filters: AuditLogFilter, conn: Optional[Connection] = None) -> int:
         """Подсчитать количество логов по фильтрам"""
-        query = "SELECT COUNT(*) FROM audit_logs WHERE 1=1"
-        
-        params = []
-        param_count = 1
-        
-        if filters.user_id:
-            query += f" AND user_id = ${param_count}"
-            params.append(filters.user_id)
-            param_count += 1
-        
-        if filters.action:
-            query += f" AND action = ${param_count}"
-            params.append(filters.action)
-            param_count += 1
-        
-        if filters.table_name:
-            query += f" AND table_name = ${param_count}"
-            params.append(filters.table_name)
-            param_count += 1
-        
-        if filters.record_id:
-            query += f" AND record_id = ${param_count}"
-            params.append(filters.record_id)
-            param_count += 1
-        
-        if filters.date_from:
-            query += f" AND created_at >= ${param_count}"
-            params.append(filters.date_from)
-            param_count += 1
-        
-        if filters.date_to:
-            query += f" AND created_at <= ${param_count}"
-            params.append(filters.date_to)
-            param_count += 1
-        
-        async with self._get_connection(conn) as connection:
-            return await connection.fetchval(query, *params)
\ No newline at end of file
+        total, _ = await self.count_logs_with_strategy(filters, CountStrategy.EXACT, conn)
+        return total
+    
+    async def count_logs_with_strategy(
+        self,
+        filters: AuditLogFilter,
+        strategy: CountStrategy = CountStrategy.EXACT,
+        conn: Optional[Connection] = None
+    ) -> Tuple[int, CountStrategy]:
+        """Подсчитать количество логов выбранным способом"""
+        values = _filter_values(filters)
+        source, params = AUDIT_LOGS_COUNT.build(values)
+        
+        return await self._count_by_strategy(
+            source, params, strategy, conn, AUDIT_LOGS_COUNT.name,
+            filtered=AUDIT_LOGS_COUNT.is_filtered(values)
+        )
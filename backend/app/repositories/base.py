@@ -1,8 +1,14 @@
-from typing import Optional, List, Dict, Any, TypeVar, Generic, Type
+import json
+from typing import Optional, List, Dict, Any, TypeVar, Generic, Type, Tuple
 from asyncpg import Connection, Pool
 from contextlib import asynccontextmanager
 from abc import ABC, abstractmethod
 from pydantic import BaseModel
+from ..core.cache import count_cache
+from ..core.config import settings
+from ..core.database import db
+from ..models.common import CountStrategy
+from .query_registry import query_registry
 
 T = TypeVar('T', bound=BaseModel)
 
@@ -26,13 +32,27 @@ class BaseRepository(Generic[T], ABC):
         pass
     
     @asynccontextmanager
-    async def _get_connection(self, conn: Optional[Connection] = None):
-        """Получить соединение с БД"""
+    async def _get_connection(self, conn: Optional[Connection] = None, readonly: bool = False):
+        """
+        Получить соединение с БД.
+        
+        readonly=True - метод только читает данные, и запрос может быть
+        выполнен на реплике (если она есть и не отстает). Иначе запрос
+        идет через self.pool, то есть через соединение HTTP-запроса.
+        """
         if conn:
             yield conn
-        else:
-            async with self.pool.acquire() as connection:
-                yield connection
+            return
+        
+        if readonly and db.replicas:
+            async with db.replica_connection() as connection:
+                if connection is not None:
+                    yield connection
+                    return
+        
+        # Без реплики - соединение запроса (self.pool - RequestConnection)
+        async with self.pool.acquire() as connection:
+            yield connection
     
     async def get_by_id(self, id: int, conn: Optional[Connection] = None) -> Optional[T]:
         """Получить запись по ID"""
@@ -65,7 +85,7 @@ class BaseRepository(Generic[T], ABC):
             LIMIT $1 OFFSET $2
         """
         
-        async with self._get_connection(conn) as connection:
+        async with self._get_connection(conn, readonly=True) as connection:
             rows = await connection.fetch(query, limit, offset)
             return [self.model_class(**dict(row)) for row in rows]
     
@@ -78,10 +98,85 @@ class BaseRepository(Generic[T], ABC):
             where_clause, params = self._build_where_clause(filters)
             query += f" WHERE {where_clause}"
         
-        async with self._get_connection(conn) as connection:
+        async with self._get_connection(conn, readonly=True) as connection:
             result = await connection.fetchval(query, *params)
             return result
     
+    async def _count_by_strategy(
+        self,
+        source: str,
+        params: list,
+        strategy: CountStrategy = CountStrategy.EXACT,
+        conn: Optional[Connection] = None,
+        query_name: Optional[str] = None,
+        filtered: bool = True
+    ) -> Tuple[int, CountStrategy]:
+        """
+        Подсчитать количество записей выбранным способом.
+        
+        source - часть запроса начиная с FROM (вместе с WHERE).
+        query_name - имя шаблона в реестре запросов для учета статистики.
+        filtered - есть ли в source условия; без них оценка берется из
+        статистики таблицы (см. QueryTemplate.is_filtered).
+        Возвращает количество и фактически использованный способ:
+        небольшие оценки перепроверяются точным подсчетом.
+        """
+        async with self._get_connection(conn, readonly=True) as connection:
+            if strategy == CountStrategy.CACHED:
+                key = (self.table_name, source, tuple(
+                    tuple(p) if isinstance(p, list) else p for p in params
+                ))
+                total = count_cache.get(key)
+                if total is None:
+                    total = await self._fetch_count(connection, source, params, query_name)
+                    count_cache.set(key, total)
+                return total, CountStrategy.CACHED
+            
+            if strategy == CountStrategy.ESTIMATED:
+                estimate = await self._estimate_count(source, params, connection, filtered)
+                if estimate is not None and estimate >= settings.COUNT_ESTIMATE_THRESHOLD:
+                    return estimate, CountStrategy.ESTIMATED
+            
+            total = await self._fetch_count(connection, source, params, query_name)
+            return total, CountStrategy.EXACT
+    
+    @staticmethod
+    async def _fetch_count(
+        connection: Connection,
+        source: str,
+        params: list,
+        query_name: Optional[str] = None
+    ) -> int:
+        """Выполнить точный подсчет"""
+        query = f"SELECT COUNT(*) {source}"
+        if query_name:
+            query_registry.record(connection, query_name, query)
+        return await connection.fetchval(query, *params)
+    
+    async def _estimate_count(
+        self,
+        source: str,
+        params: list,
+        conn: Connection,
+        filtered: bool = True
+    ) -> Optional[int]:
+        """Оценить количество записей по статистике планировщика"""
+        # Условия без параметров (например, EXISTS) тоже фильтруют,
+        # поэтому решает наличие условий, а не параметров
+        if not filtered:
+            # Без фильтров достаточно статистики таблицы
+            estimate = await conn.fetchval(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = $1::regclass",
+                self.table_name
+            )
+            # reltuples = -1, если таблица еще не анализировалась
+            return estimate if estimate is not None and estimate >= 0 else None
+        
+        plan = await conn.fetchval(f"EXPLAIN (FORMAT JSON) SELECT 1 {source}", *params)
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    
     async def delete(self, id: int, conn: Optional[Connection] = None) -> bool:
         """Удалить запись"""
         query = f"DELETE FROM {self.table_name} WHERE id = $1"
@@ -1,9 +1,126 @@
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import date
 from decimal import Decimal
 from asyncpg import Connection
 from .base import BaseRepository
-from ..models.contribution import Contribution, ContributionCreate, ContributionUpdate, ContributionSummary
+from .query_registry import query_registry, Slot
+from ..core.notifications import notify_changes
+from ..models.contribution import (
+    Contribution, ContributionCreate, ContributionUpdate, ContributionSummary,
+    StudentDebt, SubdivisionDebtSummary, DebtReport
+)
+
+
+# Фильтры поиска взносов (алиасы: c - contributions, s - students, g - groups)
+CONTRIBUTION_FILTERS = (
+    Slot('student_id', "c.studentid = {0}"),
+    Slot('group_id', "s.groupid = {0}"),
+    Slot('subdivision_id', "g.subdivisionid = {0}"),
+    Slot('year', "c.year = {0}"),
+    Slot('semester', "c.semester = {0}"),
+    Slot('paid', "c.paymentdate IS NOT NULL", lambda value: ()),
+    Slot('unpaid', "c.paymentdate IS NULL", lambda value: ()),
+)
+
+# Общее количество считается оконной функцией в том же запросе
+CONTRIBUTIONS_SEARCH = query_registry.template(
+    "contributions.search",
+    """
+    SELECT 
+        c.*,
+        s.fullname as student_name,
+        g.name as group_name,
+        COUNT(*) OVER () as total_count
+    FROM contributions c
+    JOIN students s ON s.id = c.studentid
+    JOIN groups g ON g.id = s.groupid
+    WHERE 1=1{where}
+    ORDER BY c.year DESC, c.semester DESC, s.fullname, c.id
+    LIMIT {limit} OFFSET {offset}
+    """,
+    CONTRIBUTION_FILTERS
+)
+
+CONTRIBUTIONS_COUNT = query_registry.template(
+    "contributions.count",
+    """
+    FROM contributions c
+    JOIN students s ON s.id = c.studentid
+    JOIN groups g ON g.id = s.groupid
+    WHERE 1=1{where}
+    """,
+    CONTRIBUTION_FILTERS
+)
+
+def debtor_sql(year_ref: str, semester_ref: Optional[str] = None) -> str:
+    """
+    Условие "студент s - должник за год".
+    
+    Должник - активный студент, поступивший не позже года, у которого нет
+    оплаченного взноса за этот год (или за семестр, если передан
+    semester_ref). Взнос у студента один на год (UNIQUE (studentid, year)),
+    поэтому без семестра учитывается любой оплаченный взнос за год.
+    """
+    paid = (
+        "SELECT 1 FROM contributions c WHERE c.studentid = s.id"
+        f" AND c.year = {year_ref} AND c.paymentdate IS NOT NULL"
+    )
+    if semester_ref is not None:
+        paid += f" AND c.semester = {semester_ref}"
+    return f"(s.isactive = true AND s.year <= {year_ref} AND NOT EXISTS ({paid}))"
+
+
+def _debts_report_sql(debtor: str) -> str:
+    # Один проход по активным студентам: GROUPING SETS дает строки
+    # должников и итоги по подразделениям в одном результате
+    return """
+    WITH checked AS (
+        SELECT 
+            s.id,
+            s.fullname,
+            s.groupid,
+            g.name as group_name,
+            g.subdivisionid,
+            sub.name as subdivision_name,
+            """ + debtor + """ as is_debtor
+        FROM students s
+        JOIN groups g ON g.id = s.groupid
+        JOIN subdivisions sub ON sub.id = g.subdivisionid
+        WHERE s.isactive = true AND s.year <= {year}{where}
+    )
+    SELECT 
+        subdivisionid,
+        subdivision_name,
+        id,
+        fullname,
+        groupid,
+        group_name,
+        GROUPING(id) as is_summary,
+        COUNT(*) as total_students,
+        COUNT(*) FILTER (WHERE is_debtor) as debtors_count
+    FROM checked
+    GROUP BY GROUPING SETS (
+        (subdivisionid, subdivision_name, id, fullname, groupid, group_name, is_debtor),
+        (subdivisionid, subdivision_name)
+    )
+    HAVING GROUPING(id) = 1 OR is_debtor
+    ORDER BY subdivision_name, subdivisionid, is_summary DESC, fullname, id
+    """
+
+
+_DEBT_FILTERS = (Slot('subdivision_id', "g.subdivisionid = {0}"),)
+
+DEBTS_REPORT = query_registry.template(
+    "contributions.debts",
+    _debts_report_sql(debtor_sql("{year}")),
+    _DEBT_FILTERS
+)
+
+DEBTS_REPORT_SEMESTER = query_registry.template(
+    "contributions.debts_semester",
+    _debts_report_sql(debtor_sql("{year}", "{semester}")),
+    _DEBT_FILTERS
+)
 
 
 class ContributionRepository(BaseRepository[Contribution]):
@@ -38,6 +155,7 @@ class ContributionRepository(BaseRepository[Contribution]):
                 data.paymentdate,
                 data.year
             )
+            await notify_changes(connection, "contributions", [row['id']])
             return await self.get_with_details(row['id'], connection)
     
     async def update(self, id: int, data: ContributionUpdate, conn: Optional[Connection] = None) -> Optional[Contribution]:
@@ -67,7 +185,26 @@ class ContributionRepository(BaseRepository[Contribution]):
         
         async with self._get_connection(conn) as connection:
             row = await connection.fetchrow(query, *values)
-            return await self.get_with_details(row['id'], connection) if row else None
+            if not row:
+                return None
+            await notify_changes(connection, "contributions", [id])
+            return await self.get_with_details(row['id'], connection)
+    
+    async def delete(self, id: int, conn: Optional[Connection] = None) -> bool:
+        """Удалить взнос"""
+        async with self._get_connection(conn) as connection:
+            result = await super().delete(id, connection)
+            if result:
+                await notify_changes(connection, "contributions", [id])
+            return result
+    
+    async def delete_many(self, ids: List[int], conn: Optional[Connection] = None) -> int:
+        """Удалить несколько взносов"""
+        async with self._get_connection(conn) as connection:
+            deleted = await super().delete_many(ids, connection)
+            if deleted:
+                await notify_changes(connection, "contributions", ids)
+            return deleted
     
     async def get_with_details(self, id: int, conn: Optional[Connection] = None) -> Optional[Contribution]:
         """Получить взнос с деталями"""
@@ -107,15 +244,58 @@ class ContributionRepository(BaseRepository[Contribution]):
             rows = await connection.fetch(query, *params)
             return [Contribution(**dict(row)) for row in rows]
     
+    async def search(
+        self,
+        filters: Dict[str, Any],
+        limit: int = 100,
+        offset: int = 0,
+        conn: Optional[Connection] = None
+    ) -> Tuple[List[Contribution], int]:
+        """
+        Страница взносов по фильтрам и их общее количество.
+        
+        Фильтры: student_id, group_id, subdivision_id, year, semester,
+        paid (только оплаченные) или unpaid (только неоплаченные).
+        Сортировка: от новых периодов к старым, внутри - по ФИО.
+        """
+        async with self._get_connection(conn, readonly=True) as connection:
+            query, params = CONTRIBUTIONS_SEARCH.prepare(connection, filters, limit=limit, offset=offset)
+            rows = await connection.fetch(query, *params)
+            
+            if rows:
+                total = rows[0]['total_count']
+            elif offset > 0:
+                # Страница за концом списка: строк для оконного подсчета нет
+                source, count_params = CONTRIBUTIONS_COUNT.build(filters)
+                total, _ = await self._count_by_strategy(
+                    source, count_params, conn=connection, query_name=CONTRIBUTIONS_COUNT.name,
+                    filtered=CONTRIBUTIONS_COUNT.is_filtered(filters)
+                )
+            else:
+                total = 0
+        
+        items = []
+        for row in rows:
+            item = dict(row)
+            item.pop('total_count')
+            items.append(Contribution(**item))
+        return items, total
+    
     async def get_by_group(
         self, 
         group_id: int, 
         year: int, 
         semester: Optional[int] = None,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[str, int]] = None,
         conn: Optional[Connection] = None
     ) -> List[Contribution]:
-        """Получить взносы группы"""
-        base_query = """
+        """
+        Получить взносы группы.
+        
+        Если передан after (student_name, id), используется keyset-пагинация.
+        """
+        query = """
             SELECT 
                 c.*,
                 s.fullname as student_name
@@ -123,13 +303,24 @@ class ContributionRepository(BaseRepository[Contribution]):
             JOIN students s ON s.id = c.studentid
             WHERE s.groupid = $1 AND c.year = $2
         """
+        params = [group_id, year]
+        param_count = 3
         
         if semester:
-            query = base_query + " AND c.semester = $3 ORDER BY s.fullname"
-            params = [group_id, year, semester]
-        else:
-            query = base_query + " ORDER BY s.fullname"
-            params = [group_id, year]
+            query += f" AND c.semester = ${param_count}"
+            params.append(semester)
+            param_count += 1
+        
+        if after is not None:
+            query += f" AND (s.fullname, c.id) > (${param_count}, ${param_count + 1})"
+            params.extend(after)
+            param_count += 2
+        
+        query += " ORDER BY s.fullname, c.id"
+        
+        if limit is not None:
+            query += f" LIMIT ${param_count}"
+            params.append(limit)
         
         async with self._get_connection(conn) as connection:
             rows = await connection.fetch(query, *params)
@@ -193,7 +384,7 @@ class ContributionRepository(BaseRepository[Contribution]):
             query = base_query
             params = [year, semester]
         
-        async with self._get_connection(conn) as connection:
+        async with self._get_connection(conn, readonly=True) as connection:
             row = await connection.fetchrow(query, *params)
             return ContributionSummary(
                 year=year,
@@ -236,4 +427,103 @@ class ContributionRepository(BaseRepository[Contribution]):
                 payment_date,
                 year
             )
-            return await self.get_with_details(row['id'], connection)
\ No newline at end of file
+            await notify_changes(connection, "contributions", [row['id']])
+            return await self.get_with_details(row['id'], connection)
+    
+    async def mark_many_as_paid(
+        self,
+        payments: List[ContributionCreate],
+        conn: Optional[Connection] = None
+    ) -> List[Contribution]:
+        """
+        Отметить оплату сразу для нескольких студентов.
+        
+        Все записи передаются массивами и вставляются одним запросом
+        INSERT ... SELECT FROM unnest(...) ON CONFLICT (studentid, year).
+        Если для пары (студент, год) передано несколько платежей,
+        используется последний. Дата оплаты по умолчанию - сегодня.
+        """
+        if not payments:
+            return []
+        
+        # ON CONFLICT не может обновить одну строку дважды за запрос
+        unique: Dict[Tuple[int, int], ContributionCreate] = {}
+        for payment in payments:
+            unique[(payment.studentid, payment.year)] = payment
+        
+        today = date.today()
+        items = list(unique.values())
+        
+        query = """
+            WITH upserted AS (
+                INSERT INTO contributions (studentid, semester, amount, paymentdate, year)
+                SELECT * FROM unnest($1::int[], $2::int[], $3::numeric[], $4::date[], $5::int[])
+                ON CONFLICT (studentid, year) DO UPDATE
+                SET semester = EXCLUDED.semester,
+                    amount = EXCLUDED.amount,
+                    paymentdate = EXCLUDED.paymentdate
+                RETURNING *
+            )
+            SELECT 
+                u.*,
+                s.fullname as student_name,
+                g.name as group_name
+            FROM upserted u
+            JOIN students s ON s.id = u.studentid
+            JOIN groups g ON g.id = s.groupid
+            ORDER BY s.fullname, u.id
+        """
+        
+        async with self._get_connection(conn) as connection:
+            rows = await connection.fetch(
+                query,
+                [item.studentid for item in items],
+                [item.semester for item in items],
+                [item.amount for item in items],
+                [item.paymentdate or today for item in items],
+                [item.year for item in items]
+            )
+            await notify_changes(connection, "contributions", [row['id'] for row in rows])
+            return [Contribution(**dict(row)) for row in rows]
+    
+    async def get_debts(
+        self,
+        year: int,
+        semester: Optional[int] = None,
+        subdivision_id: Optional[int] = None,
+        conn: Optional[Connection] = None
+    ) -> DebtReport:
+        """
+        Рассчитать задолженности за год (или за семестр года).
+        
+        Должники определяются условием debtor_sql. В том же запросе
+        считаются итоги по подразделениям (в них попадают только
+        подразделения с активными студентами).
+        """
+        filters = {'subdivision_id': subdivision_id}
+        
+        async with self._get_connection(conn, readonly=True) as connection:
+            if semester is None:
+                query, params = DEBTS_REPORT.prepare(connection, filters, year=year)
+            else:
+                query, params = DEBTS_REPORT_SEMESTER.prepare(connection, filters, year=year, semester=semester)
+            rows = await connection.fetch(query, *params)
+        
+        report = DebtReport(year=year, semester=semester)
+        for row in rows:
+            if row['is_summary']:
+                report.subdivisions.append(SubdivisionDebtSummary(
+                    subdivision_id=row['subdivisionid'],
+                    subdivision_name=row['subdivision_name'],
+                    total_students=row['total_students'],
+                    debtors_count=row['debtors_count']
+                ))
+            else:
+                report.students.append(StudentDebt(
+                    student_id=row['id'],
+                    fullname=row['fullname'],
+                    group_id=row['groupid'],
+                    group_name=row['group_name'],
+                    subdivision_id=row['subdivisionid']
+                ))
+        return report
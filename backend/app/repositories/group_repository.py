@@ -3,7 +3,10 @@
 from typing import Optional, List, Dict, Any
 from asyncpg import Connection
 from .base import BaseRepository
+from .stats_repository import StatsRepository
+from ..core.notifications import notify_changes
 from ..models.group import Group, GroupCreate, GroupUpdate, GroupWithStats
+from ..utils.search import text_search_condition, text_search_order
 
 
 class GroupRepository(BaseRepository[Group]):
@@ -33,6 +36,10 @@ class GroupRepository(BaseRepository[Group]):
                 data.year
             )
             
+            # Заводим строку статистики для новой группы
+            await StatsRepository(self.pool).refresh_groups([row['id']], connection)
+            await notify_changes(connection, "groups", [row['id']])
+            
             # Получаем группу с дополнительной информацией
             return await self._get_group_with_subdivision(row['id'], connection)
     
@@ -65,8 +72,25 @@ class GroupRepository(BaseRepository[Group]):
             row = await connection.fetchrow(query, *values)
             if not row:
                 return None
+            await notify_changes(connection, "groups", [id])
             return await self._get_group_with_subdivision(row['id'], connection)
     
+    async def delete(self, id: int, conn: Optional[Connection] = None) -> bool:
+        """Удалить группу (вместе со студентами)"""
+        async with self._get_connection(conn) as connection:
+            result = await super().delete(id, connection)
+            if result:
+                await notify_changes(connection, "groups", [id])
+            return result
+    
+    async def delete_many(self, ids: List[int], conn: Optional[Connection] = None) -> int:
+        """Удалить несколько групп (вместе со студентами)"""
+        async with self._get_connection(conn) as connection:
+            deleted = await super().delete_many(ids, connection)
+            if deleted:
+                await notify_changes(connection, "groups", ids)
+            return deleted
+    
     async def get_by_id(self, id: int, conn: Optional[Connection] = None) -> Optional[Group]:
         """Получить группу по ID с дополнительной информацией"""
         async with self._get_connection(conn) as connection:
@@ -167,32 +191,32 @@ class GroupRepository(BaseRepository[Group]):
             return GroupWithStats(**dict(row)) if row else None
     
     async def get_all_with_stats(self, year: Optional[int] = None, conn: Optional[Connection] = None) -> List[GroupWithStats]:
-        """Получить все группы со статистикой"""
+        """Получить все группы со статистикой (из предрассчитанной таблицы group_stats)"""
         base_query = """
             SELECT 
                 g.*,
                 s.name as subdivision_name,
-                COUNT(DISTINCT st.id) as students_count,
-                COUNT(DISTINCT st.id) FILTER (WHERE st.isactive = true) as active_students_count,
-                COUNT(DISTINCT st.id) FILTER (WHERE st.isbudget = true) as budget_students_count,
+                COALESCE(gs.students_count, 0) as students_count,
+                COALESCE(gs.active_students_count, 0) as active_students_count,
+                COALESCE(gs.budget_students_count, 0) as budget_students_count,
                 CASE 
-                    WHEN COUNT(DISTINCT st.id) > 0 
-                    THEN ROUND((COUNT(DISTINCT st.id) FILTER (WHERE st.isactive = true) * 100.0) / COUNT(DISTINCT st.id), 1)
+                    WHEN COALESCE(gs.students_count, 0) > 0 
+                    THEN ROUND((gs.active_students_count * 100.0) / gs.students_count, 1)
                     ELSE 0 
                 END as union_percentage
             FROM groups g
             LEFT JOIN subdivisions s ON s.id = g.subdivisionid
-            LEFT JOIN students st ON st.groupid = g.id
+            LEFT JOIN group_stats gs ON gs.groupid = g.id
         """
         
         if year:
-            query = base_query + " WHERE g.year = $1 GROUP BY g.id, s.id, s.name ORDER BY g.name"
+            query = base_query + " WHERE g.year = $1 ORDER BY g.name"
             params = [year]
         else:
-            query = base_query + " GROUP BY g.id, s.id, s.name ORDER BY g.name"
+            query = base_query + " ORDER BY g.name"
             params = []
         
-        async with self._get_connection(conn) as connection:
+        async with self._get_connection(conn, readonly=True) as connection:
             rows = await connection.fetch(query, *params)
             return [GroupWithStats(**dict(row)) for row in rows]
     
@@ -225,7 +249,7 @@ class GroupRepository(BaseRepository[Group]):
             LIMIT $1 OFFSET $2
         """
         
-        async with self._get_connection(conn) as connection:
+        async with self._get_connection(conn, readonly=True) as connection:
             rows = await connection.fetch(query, limit, offset)
             return [Group(**dict(row)) for row in rows]
     
@@ -269,8 +293,12 @@ class GroupRepository(BaseRepository[Group]):
                 query += f" AND year = ${param_count}"
                 params.append(filters['year'])
                 param_count += 1
+            
+            if 'search' in filters:
+                query += " AND " + text_search_condition("name", filters['search'], params)
+                param_count = len(params) + 1
         
-        async with self._get_connection(conn) as connection:
+        async with self._get_connection(conn, readonly=True) as connection:
             return await connection.fetchval(query, *params)
 
     async def search(
@@ -312,19 +340,20 @@ class GroupRepository(BaseRepository[Group]):
             params.append(filters['year'])
             param_count += 1
         
+        order_by = "g.name"
         if 'search' in filters:
-            query += f" AND g.name ILIKE ${param_count}"
-            params.append(f"%{filters['search']}%")
-            param_count += 1
+            query += " AND " + text_search_condition("g.name", filters['search'], params)
+            order_by = text_search_order("g.name", filters['search'], params) + ", " + order_by
+            param_count = len(params) + 1
         
         # Добавляем группировку, сортировку и пагинацию
         query += f"""
             GROUP BY g.id, s.id, s.name
-            ORDER BY g.name 
+            ORDER BY {order_by} 
             LIMIT ${param_count} OFFSET ${param_count + 1}
         """
         params.extend([limit, offset])
         
-        async with self._get_connection(conn) as connection:
+        async with self._get_connection(conn, readonly=True) as connection:
             rows = await connection.fetch(query, *params)
             return [Group(**dict(row)) for row in rows]
\ No newline at end of file
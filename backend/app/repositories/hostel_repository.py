@@ -1,7 +1,41 @@
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from asyncpg import Connection
 from .base import BaseRepository
+from .query_registry import query_registry, Slot
 from ..models.hostel_student import HostelStudent, HostelStudentCreate, HostelStudentUpdate
+from ..utils.search import text_search_sql, text_search_params
+
+
+# Фильтры поиска проживающих (алиасы: h - hostelstudents, s - students)
+HOSTEL_FILTERS = (
+    Slot('hostel', "h.hostel = {0}"),
+    Slot('room', "h.room = {0}"),
+    Slot('student_name', text_search_sql("s.fullname", "{0}", "{1}"), text_search_params),
+)
+
+# Общее количество считается оконной функцией в том же запросе
+HOSTELS_SEARCH = query_registry.template(
+    "hostels.search",
+    """
+    SELECT h.*, s.fullname as student_name, COUNT(*) OVER () as total_count
+    FROM hostelstudents h
+    JOIN students s ON s.id = h.studentid
+    WHERE 1=1{where}
+    ORDER BY h.hostel, h.room, s.fullname, h.id
+    LIMIT {limit} OFFSET {offset}
+    """,
+    HOSTEL_FILTERS
+)
+
+HOSTELS_COUNT = query_registry.template(
+    "hostels.count",
+    """
+    FROM hostelstudents h
+    JOIN students s ON s.id = h.studentid
+    WHERE 1=1{where}
+    """,
+    HOSTEL_FILTERS
+)
 
 
 class HostelRepository(BaseRepository[HostelStudent]):
@@ -110,35 +144,42 @@ class HostelRepository(BaseRepository[HostelStudent]):
             rows = await connection.fetch(query, hostel, room)
             return [HostelStudent(**dict(row)) for row in rows]
     
-    async def search(self, filters: Dict[str, Any], conn: Optional[Connection] = None) -> List[HostelStudent]:
-        """Поиск проживающих по фильтрам"""
-        query = """
-            SELECT h.*, s.fullname as student_name
-            FROM hostelstudents h
-            JOIN students s ON s.id = h.studentid
-            WHERE 1=1
+    async def search(
+        self,
+        filters: Dict[str, Any],
+        limit: int = 100,
+        offset: int = 0,
+        conn: Optional[Connection] = None
+    ) -> Tuple[List[HostelStudent], int]:
         """
+        Страница проживающих по фильтрам и их общее количество.
         
-        params = []
-        param_count = 1
-        
-        if 'hostel' in filters:
-            query += f" AND h.hostel = ${param_count}"
-            params.append(filters['hostel'])
-            param_count += 1
-        
-        if 'room' in filters:
-            query += f" AND h.room = ${param_count}"
-            params.append(filters['room'])
-            param_count += 1
-        
-        if 'student_name' in filters:
-            query += f" AND s.fullname ILIKE ${param_count}"
-            params.append(f"%{filters['student_name']}%")
-            param_count += 1
+        Фильтры: hostel, room, student_name (нечеткий поиск по ФИО).
+        """
+        async with self._get_connection(conn, readonly=True) as connection:
+            query, params = HOSTELS_SEARCH.prepare(connection, filters, limit=limit, offset=offset)
+            rows = await connection.fetch(query, *params)
+            
+            if rows:
+                total = rows[0]['total_count']
+            elif offset > 0:
+                # Страница за концом списка: строк для оконного подсчета нет
+                total = await self.count(filters, connection)
+            else:
+                total = 0
         
-        query += " ORDER BY h.hostel, h.room, s.fullname"
+        items = []
+        for row in rows:
+            item = dict(row)
+            item.pop('total_count')
+            items.append(HostelStudent(**item))
+        return items, total
+    
+    async def count(self, filters: Optional[Dict[str, Any]] = None, conn: Optional[Connection] = None) -> int:
+        """Подсчитать количество проживающих с учетом фильтров поиска"""
+        if not filters:
+            return await super().count(None, conn)
         
-        async with self._get_connection(conn) as connection:
-            rows = await connection.fetch(query, *params)
-            return [HostelStudent(**dict(row)) for row in rows]
\ No newline at end of file
+        source, params = HOSTELS_COUNT.build(filters or {})
+        total, _ = await self._count_by_strategy(source, params, conn=conn, query_name=HOSTELS_COUNT.name)
+        return total
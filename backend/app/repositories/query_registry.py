@@ -0,0 +1,163 @@
+# backend/app/repositories/query_registry.py
+
+from collections import OrderedDict
+from string import Formatter
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Sequence, Tuple
+from asyncpg import Connection
+
+from ..core.config import settings
+
+
+class Slot(NamedTuple):
+    """
+    Необязательное условие шаблона запроса.
+
+    sql содержит ссылки на параметры {0}, {1}, ..., params строит значения
+    этих параметров из значения фильтра.
+    """
+    key: str
+    sql: str
+    params: Callable[[Any], Tuple[Any, ...]] = lambda value: (value,)
+
+    @property
+    def arity(self) -> int:
+        """Количество параметров условия"""
+        fields = [field for _, field, _, _ in Formatter().parse(self.sql) if field]
+        return max(int(field) for field in fields) + 1 if fields else 0
+
+
+class QueryTemplate:
+    """
+    Шаблон запроса с фиксированным порядком условий.
+
+    Условия подставляются вместо {where} всегда в порядке объявления слотов,
+    поэтому один и тот же набор фильтров дает один и тот же текст SQL, и
+    кеш подготовленных выражений asyncpg переиспользует его план. Остальные
+    именованные поля шаблона ({limit}, {offset}, ...) заменяются ссылками на
+    параметры, идущие после параметров условий. Текст для каждого набора
+    фильтров строится один раз.
+    """
+
+    def __init__(self, registry: "QueryRegistry", name: str, sql: str, slots: Sequence[Slot] = ()):
+        self.registry = registry
+        self.name = name
+        self.sql = sql
+        self.slots = tuple(slots)
+        self._shapes: Dict[Tuple[Tuple[str, ...], Tuple[str, ...]], str] = {}
+
+    def build(self, filters: Mapping[str, Any], **tail: Any) -> Tuple[str, List[Any]]:
+        """Получить текст запроса и параметры для набора фильтров"""
+        active = [slot for slot in self.slots if filters.get(slot.key) is not None]
+        shape = (tuple(slot.key for slot in active), tuple(tail))
+
+        params: List[Any] = []
+        for slot in active:
+            params.extend(slot.params(filters[slot.key]))
+        params.extend(tail.values())
+
+        sql = self._shapes.get(shape)
+        if sql is None:
+            sql = self._render(active, tuple(tail))
+            self._shapes[shape] = sql
+
+        return sql, params
+
+    def is_filtered(self, filters: Mapping[str, Any]) -> bool:
+        """Есть ли для этих фильтров хотя бы одно условие (в том числе без параметров)"""
+        return any(filters.get(slot.key) is not None for slot in self.slots)
+
+    def prepare(self, connection: Connection, filters: Mapping[str, Any], **tail: Any) -> Tuple[str, List[Any]]:
+        """Построить запрос и учесть его выполнение на соединении в статистике"""
+        sql, params = self.build(filters, **tail)
+        self.registry.record(connection, self.name, sql)
+        return sql, params
+
+    def _render(self, active: Sequence[Slot], tail: Sequence[str]) -> str:
+        number = 1
+        conditions = ""
+        for slot in active:
+            refs = [f"${number + i}" for i in range(slot.arity)]
+            conditions += " AND " + slot.sql.format(*refs)
+            number += slot.arity
+
+        refs = {name: f"${number + i}" for i, name in enumerate(tail)}
+        return self.sql.format(where=conditions, **refs)
+
+    @property
+    def shapes(self) -> int:
+        """Количество различных текстов запроса"""
+        return len(self._shapes)
+
+
+class QueryRegistry:
+    """
+    Реестр шаблонов запросов репозиториев.
+
+    Помимо построения SQL ведет статистику: сколько раз выполнялся каждый
+    шаблон и как часто его текст уже был подготовлен на соединении.
+    Кеш asyncpg закрыт, поэтому попадания оцениваются моделью: для каждого
+    соединения (по PID серверного процесса) повторяется LRU-кеш размера
+    statement_cache_size, как в самом asyncpg. Запросы вне реестра тоже
+    занимают кеш, поэтому оценка - сверху.
+    """
+
+    # Сколько соединений помнить (пул пересоздает их после max_queries запросов)
+    MAX_TRACKED_CONNECTIONS = 256
+
+    def __init__(self, statement_cache_size: int):
+        self.statement_cache_size = statement_cache_size
+        self._templates: Dict[str, QueryTemplate] = {}
+        self._connections: "OrderedDict[int, OrderedDict[str, None]]" = OrderedDict()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def template(self, name: str, sql: str, slots: Sequence[Slot] = ()) -> QueryTemplate:
+        """Зарегистрировать шаблон запроса"""
+        template = QueryTemplate(self, name, sql, slots)
+        self._templates[name] = template
+        return template
+
+    def record(self, connection: Connection, name: str, sql: str):
+        """Учесть выполнение запроса на соединении"""
+        stats = self._stats.setdefault(name, {"calls": 0, "hits": 0, "misses": 0})
+        stats["calls"] += 1
+
+        if self.statement_cache_size <= 0:
+            stats["misses"] += 1
+            return
+
+        pid = connection.get_server_pid()
+        cache = self._connections.get(pid)
+        if cache is None:
+            cache = self._connections[pid] = OrderedDict()
+            while len(self._connections) > self.MAX_TRACKED_CONNECTIONS:
+                self._connections.popitem(last=False)
+
+        if sql in cache:
+            cache.move_to_end(sql)
+            stats["hits"] += 1
+            return
+
+        stats["misses"] += 1
+        cache[sql] = None
+        while len(cache) > self.statement_cache_size:
+            cache.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """Статистика шаблонов и (оценочно) кеша подготовленных выражений"""
+        result: Dict[str, Any] = {}
+        for name in sorted(set(self._templates) | set(self._stats)):
+            stats = self._stats.get(name, {"calls": 0, "hits": 0, "misses": 0})
+            template = self._templates.get(name)
+            result[name] = {
+                **stats,
+                "shapes": template.shapes if template else None,
+                "hit_rate": round(stats["hits"] / stats["calls"], 4) if stats["calls"] else 0.0
+            }
+        return {
+            "statement_cache_size": self.statement_cache_size,
+            "queries": result
+        }
+
+
+# Глобальный реестр запросов
+query_registry = QueryRegistry(settings.DB_STATEMENT_CACHE_SIZE)
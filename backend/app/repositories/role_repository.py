@@ -1,6 +1,8 @@
 from typing import Optional, List
 from asyncpg import Connection
 from .base import BaseRepository
+from ..core.notifications import notify_changes
+from ..core.cache import user_cache
 from ..models.role import Role, RoleCreate, RoleUpdate
 
 
@@ -25,6 +27,7 @@ class RoleRepository(BaseRepository[Role]):
         
         async with self._get_connection(conn) as connection:
             row = await connection.fetchrow(query, data.name)
+            await notify_changes(connection, "roles", [row['id']])
             return Role(**dict(row))
     
     async def update(self, id: int, data: RoleUpdate, conn: Optional[Connection] = None) -> Optional[Role]:
@@ -42,7 +45,21 @@ class RoleRepository(BaseRepository[Role]):
         
         async with self._get_connection(conn) as connection:
             row = await connection.fetchrow(query, id, data.name)
-            return Role(**dict(row)) if row else None
+            # Роли входят в кешированных пользователей
+            user_cache.clear()
+            if not row:
+                return None
+            await notify_changes(connection, "roles", [id])
+            return Role(**dict(row))
+    
+    async def delete(self, id: int, conn: Optional[Connection] = None) -> bool:
+        """Удалить роль"""
+        async with self._get_connection(conn) as connection:
+            result = await super().delete(id, connection)
+            user_cache.clear()
+            if result:
+                await notify_changes(connection, "roles", [id])
+            return result
     
     async def get_by_name(self, name: str, conn: Optional[Connection] = None) -> Optional[Role]:
         """Получить роль по имени"""
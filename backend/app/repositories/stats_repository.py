@@ -0,0 +1,88 @@
+# backend/app/repositories/stats_repository.py
+
+from typing import Optional, List, Iterable
+from asyncpg import Connection
+from .base import BaseRepository
+from ..models.stats import GroupStats
+
+
+class StatsRepository(BaseRepository[GroupStats]):
+    """
+    Репозиторий предрассчитанной статистики групп.
+    
+    Репозитории студентов и групп обновляют счетчики затронутых групп
+    в своих транзакциях. Изменения в обход репозиториев (хранимые
+    процедуры, ручные правки) исправляются полным пересчетом.
+    """
+    
+    _REFRESH_QUERY = """
+        INSERT INTO group_stats (
+            groupid, students_count, active_students_count, 
+            budget_students_count, refreshed_at
+        )
+        SELECT 
+            g.id,
+            COUNT(st.id),
+            COUNT(st.id) FILTER (WHERE st.isactive = true),
+            COUNT(st.id) FILTER (WHERE st.isbudget = true),
+            CURRENT_TIMESTAMP
+        FROM groups g
+        LEFT JOIN students st ON st.groupid = g.id
+        {where}
+        GROUP BY g.id
+        ON CONFLICT (groupid) DO UPDATE
+        SET students_count = EXCLUDED.students_count,
+            active_students_count = EXCLUDED.active_students_count,
+            budget_students_count = EXCLUDED.budget_students_count,
+            refreshed_at = EXCLUDED.refreshed_at
+    """
+    
+    @property
+    def table_name(self) -> str:
+        return "group_stats"
+    
+    @property
+    def model_class(self):
+        return GroupStats
+    
+    async def get_by_group(self, group_id: int, conn: Optional[Connection] = None) -> Optional[GroupStats]:
+        """Получить статистику группы"""
+        query = "SELECT * FROM group_stats WHERE groupid = $1"
+        
+        async with self._get_connection(conn) as connection:
+            row = await connection.fetchrow(query, group_id)
+            return GroupStats(**dict(row)) if row else None
+    
+    async def refresh_groups(self, group_ids: Iterable[int], conn: Optional[Connection] = None) -> int:
+        """Пересчитать статистику указанных групп"""
+        ids: List[int] = sorted({id for id in group_ids if id is not None})
+        if not ids:
+            return 0
+        
+        query = self._REFRESH_QUERY.format(where="WHERE g.id = ANY($1::int[])")
+        
+        async with self._get_connection(conn) as connection:
+            result = await connection.execute(query, ids)
+            return int(result.split()[-1])
+    
+    async def refresh_for_students(self, student_ids: Iterable[int], conn: Optional[Connection] = None) -> int:
+        """Пересчитать статистику групп, в которых состоят указанные студенты"""
+        ids = list(student_ids)
+        if not ids:
+            return 0
+        
+        async with self._get_connection(conn) as connection:
+            rows = await connection.fetch(
+                "SELECT DISTINCT groupid FROM students WHERE id = ANY($1::int[])",
+                ids
+            )
+            return await self.refresh_groups([row['groupid'] for row in rows], connection)
+    
+    async def refresh_all(self, conn: Optional[Connection] = None) -> int:
+        """Полностью пересчитать статистику всех групп"""
+        query = self._REFRESH_QUERY.format(where="")
+        
+        async with self._get_connection(conn) as connection:
+            async with connection.transaction():
+                result = await connection.execute(query)
+                return int(result.split()[-1])
@@ -6,6 +6,8 @@ from datetime import date
 from asyncpg import Connection
 from .student_repository import StudentRepository
 from .contribution_repository import ContributionRepository
+from .stats_repository import StatsRepository
+from ..core.notifications import notify_changes
 
 
 class StoredProceduresMixin:
@@ -55,7 +57,15 @@ class StudentRepositoryWithProcedures(StudentRepository, StoredProceduresMixin):
         query = "SELECT transfer_student_to_group($1, $2, $3)"
         
         async with self._get_connection(conn) as connection:
+            old_group_id = await connection.fetchval(
+                "SELECT groupid FROM students WHERE id = $1", student_id
+            )
             result = await connection.fetchval(query, student_id, new_group_id, user_id)
+            
+            # Процедура переводит студента в обход репозитория
+            if result:
+                await StatsRepository(self.pool).refresh_groups([old_group_id, new_group_id], connection)
+                await notify_changes(connection, "students", [student_id])
             return result
     
     async def bulk_activate_students(
@@ -72,28 +82,11 @@ class StudentRepositoryWithProcedures(StudentRepository, StoredProceduresMixin):
         
         async with self._get_connection(conn) as connection:
             result = await connection.fetchrow(query, student_ids, user_id)
+            
+            # Процедура меняет статус студентов в обход репозитория
+            await StatsRepository(self.pool).refresh_for_students(student_ids, connection)
+            await notify_changes(connection, "students", student_ids)
             return dict(result)
-    
-    async def get_students_with_debt(
-        self,
-        subdivision_id: Optional[int] = None,
-        year: int = 2024,
-        conn: Optional[Connection] = None
-    ) -> List[Dict[str, Any]]:
-        """
-        Получить студентов с задолженностью через хранимую функцию.
-        Функция выполняет сложные вычисления на стороне БД.
-        """
-        if subdivision_id:
-            query = "SELECT * FROM get_students_with_debt($1, $2)"
-            params = [subdivision_id, year]
-        else:
-            query = "SELECT * FROM get_students_with_debt(NULL, $1)"
-            params = [year]
-        
-        async with self._get_connection(conn) as connection:
-            rows = await connection.fetch(query, *params)
-            return [dict(row) for row in rows]
 
 
 # Пример расширенного репозитория взносов с хранимыми процедурами  
@@ -124,6 +117,9 @@ class ContributionRepositoryWithProcedures(ContributionRepository, StoredProcedu
                 payment_date, 
                 user_id
             )
+            
+            # Процедура создает взносы в обход репозитория
+            await notify_changes(connection, "contributions")
             return dict(result)
     
     async def generate_payment_report(
@@ -142,24 +138,6 @@ class ContributionRepositoryWithProcedures(ContributionRepository, StoredProcedu
         async with self._get_connection(conn) as connection:
             rows = await connection.fetch(query, subdivision_id, year, semester)
             return [dict(row) for row in rows]
-    
-    async def calculate_debt_summary(
-        self,
-        as_of_date: Optional[date] = None,
-        conn: Optional[Connection] = None
-    ) -> Dict[str, Any]:
-        """
-        Рассчитать общую сводку по задолженностям.
-        Использует хранимую функцию для сложных вычислений.
-        """
-        if not as_of_date:
-            as_of_date = date.today()
-        
-        query = "SELECT * FROM calculate_debt_summary($1)"
-        
-        async with self._get_connection(conn) as connection:
-            result = await connection.fetchrow(query, as_of_date)
-            return dict(result)
 
 
 # Пример работы с системными хранимыми процедурами
@@ -1,13 +1,121 @@
 # backend/app/repositories/student_repository.py
 
-from typing import Optional, List, Dict, Any
-from asyncpg import Connection
+import json
+from decimal import Decimal
+from typing import Optional, List, Dict, Any, Tuple, AsyncIterator, Iterable, Type
+from asyncpg import Connection, Record
 from .base import BaseRepository
+from .stats_repository import StatsRepository
+from .contribution_repository import debtor_sql
+from ..core.notifications import notify_changes
 from ..models.student import Student, StudentCreate, StudentUpdate, StudentWithDetails
 from ..models.student_data import StudentData
 from ..models.additional_status import AdditionalStatus
 from ..models.hostel_student import HostelStudent
 from ..models.contribution import Contribution
+from ..models.common import CountStrategy
+from ..core.config import settings
+from ..utils.search import text_search_sql, text_search_params, text_search_order_sql, text_search_order_params
+from .query_registry import query_registry, Slot
+
+
+def _load_json(value: Any) -> Any:
+    """Разобрать JSON из подзапроса (суммы - в Decimal, без потери точности)"""
+    if isinstance(value, str):
+        return json.loads(value, parse_float=Decimal)
+    return value
+
+
+# Фильтры поиска студентов (алиасы: s - students, g - groups)
+STUDENT_FILTERS = (
+    Slot('group_id', "s.groupid = {0}"),
+    Slot('subdivision_id', "g.subdivisionid = {0}"),
+    Slot('is_active', "s.isactive = {0}"),
+    Slot('is_budget', "s.isbudget = {0}"),
+    Slot('year', "s.year = {0}"),
+    Slot('search', text_search_sql("s.fullname", "{0}", "{1}"), text_search_params),
+    # Полусоединения: на студента проверяется наличие хотя бы одной строки
+    Slot('has_hostel', "EXISTS (SELECT 1 FROM hostelstudents hs WHERE hs.studentid = s.id)", lambda value: ()),
+    Slot('no_hostel', "NOT EXISTS (SELECT 1 FROM hostelstudents hs WHERE hs.studentid = s.id)", lambda value: ()),
+    # Задолженность за год (значение фильтра) - то же условие, что в отчете о должниках
+    Slot('has_debt', debtor_sql("{0}")),
+    Slot('no_debt', "NOT " + debtor_sql("{0}")),
+)
+
+_STUDENT_SEARCH_SOURCE = """
+    SELECT 
+        s.*,
+        g.name as group_name,
+        sub.name as subdivision_name,
+        sd.phone, sd.email, sd.birthday
+    FROM students s
+    JOIN groups g ON g.id = s.groupid
+    JOIN subdivisions sub ON sub.id = g.subdivisionid
+    LEFT JOIN studentdata sd ON sd.id = s.dataid
+    WHERE 1=1{where}
+"""
+
+STUDENTS_SEARCH = query_registry.template(
+    "students.search",
+    _STUDENT_SEARCH_SOURCE + " ORDER BY s.fullname, s.id LIMIT {limit} OFFSET {offset}",
+    STUDENT_FILTERS
+)
+
+# При поиске по ФИО сначала идут наиболее релевантные совпадения
+STUDENTS_SEARCH_RANKED = query_registry.template(
+    "students.search_ranked",
+    _STUDENT_SEARCH_SOURCE
+    + " ORDER BY " + text_search_order_sql("s.fullname", "{rank_prefix}", "{rank_term}")
+    + ", s.fullname, s.id LIMIT {limit} OFFSET {offset}",
+    STUDENT_FILTERS
+)
+
+STUDENTS_SEARCH_AFTER = query_registry.template(
+    "students.search_after",
+    _STUDENT_SEARCH_SOURCE
+    + " AND (s.fullname, s.id) > ({after_name}, {after_id}) ORDER BY s.fullname, s.id LIMIT {limit}",
+    STUDENT_FILTERS
+)
+
+STUDENTS_COUNT = query_registry.template(
+    "students.count",
+    """
+    FROM students s
+    JOIN groups g ON g.id = s.groupid
+    WHERE 1=1{where}
+    """,
+    STUDENT_FILTERS
+)
+
+STUDENTS_EXPORT = query_registry.template(
+    "students.export",
+    """
+    SELECT 
+        s.id,
+        s.fullname,
+        g.name as group_name,
+        sub.name as subdivision_name,
+        s.year,
+        s.isactive,
+        s.isbudget,
+        sd.phone,
+        sd.email,
+        sd.birthday,
+        (
+            SELECT string_agg(a.name, ', ' ORDER BY a.id)
+            FROM studentadditionalstatuses sas
+            JOIN additionalstatuses a ON a.id = sas.statusid
+            WHERE sas.studentid = s.id
+        ) as additional_statuses
+    FROM students s
+    JOIN groups g ON g.id = s.groupid
+    JOIN subdivisions sub ON sub.id = g.subdivisionid
+    LEFT JOIN studentdata sd ON sd.id = s.dataid
+    WHERE 1=1{where}
+    ORDER BY s.fullname, s.id
+    """,
+    STUDENT_FILTERS
+)
 
 
 class StudentRepository(BaseRepository[Student]):
@@ -79,6 +187,10 @@ class StudentRepository(BaseRepository[Student]):
                         data.hostel_data.get('comment', '')
                     )
                 
+                # Обновляем статистику группы и сообщаем об изменении
+                await StatsRepository(self.pool).refresh_groups([student_row['groupid']], connection)
+                await notify_changes(connection, "students", [student_row['id']])
+                
                 # Возвращаем полные данные студента
                 return await self.get_with_details(student_row['id'], connection)
     
@@ -142,6 +254,10 @@ class StudentRepository(BaseRepository[Student]):
                         hostel_data.get('comment', '')
                     )
                 
+                # Обновляем статистику группы и сообщаем об изменении
+                await StatsRepository(self.pool).refresh_groups([student_row['groupid']], connection)
+                await notify_changes(connection, "students", [student_row['id']])
+                
                 # Возвращаем полные данные студента
                 return await self.get_with_details(student_row['id'], connection)
     
@@ -224,6 +340,13 @@ class StudentRepository(BaseRepository[Student]):
                         status_data = [(id, status_id) for status_id in data.additional_status_ids]
                         await connection.executemany(status_query, status_data)
                 
+                # Обновляем статистику старой и новой группы и сообщаем об изменении
+                if update_data:
+                    await StatsRepository(self.pool).refresh_groups(
+                        [current.groupid, update_data.get('groupid')], connection
+                    )
+                    await notify_changes(connection, "students", [id])
+                
                 return await self.get_with_details(id, connection)
     
     async def update_with_hostel(self, id: int, data: dict, conn: Optional[Connection] = None) -> Optional[Student]:
@@ -340,8 +463,201 @@ class StudentRepository(BaseRepository[Student]):
                             hostel_data.get('comment', '')
                         )
                 
+                # Обновляем статистику старой и новой группы и сообщаем об изменении
+                if update_data:
+                    await StatsRepository(self.pool).refresh_groups(
+                        [current.groupid, update_data.get('group_id')], connection
+                    )
+                    await notify_changes(connection, "students", [id])
+                
                 return await self.get_with_details(id, connection)
     
+    async def delete(self, id: int, conn: Optional[Connection] = None) -> bool:
+        """Удалить студента"""
+        async with self._get_connection(conn) as connection:
+            async with connection.transaction():
+                group_id = await connection.fetchval(
+                    "DELETE FROM students WHERE id = $1 RETURNING groupid", id
+                )
+                if group_id is None:
+                    return False
+                
+                await StatsRepository(self.pool).refresh_groups([group_id], connection)
+                await notify_changes(connection, "students", [id])
+                return True
+    
+    async def delete_many(self, ids: List[int], conn: Optional[Connection] = None) -> int:
+        """Удалить несколько студентов"""
+        async with self._get_connection(conn) as connection:
+            async with connection.transaction():
+                rows = await connection.fetch(
+                    "DELETE FROM students WHERE id = ANY($1) RETURNING id, groupid", ids
+                )
+                await StatsRepository(self.pool).refresh_groups(
+                    [row['groupid'] for row in rows], connection
+                )
+                await notify_changes(connection, "students", [row['id'] for row in rows])
+                return len(rows)
+    
+    async def get_subdivision_ids(
+        self, 
+        student_ids: List[int], 
+        conn: Optional[Connection] = None
+    ) -> Dict[int, int]:
+        """Получить подразделения студентов (ID студента -> ID подразделения)"""
+        if not student_ids:
+            return {}
+        
+        query = """
+            SELECT s.id, g.subdivisionid
+            FROM students s
+            JOIN groups g ON g.id = s.groupid
+            WHERE s.id = ANY($1::int[])
+        """
+        
+        async with self._get_connection(conn) as connection:
+            rows = await connection.fetch(query, list(student_ids))
+            return {row['id']: row['subdivisionid'] for row in rows}
+    
+    # Столбцы промежуточной таблицы импорта, заполняемые через COPY
+    _IMPORT_COLUMNS = (
+        'rownum', 'groupid', 'fullname', 'isactive', 'isbudget', 'year',
+        'has_data', 'phone', 'email', 'birthday', 'status_ids'
+    )
+    
+    async def import_many(
+        self,
+        batches: Iterable[List[Tuple[int, StudentCreate]]],
+        subdivision_id: Optional[int] = None,
+        conn: Optional[Connection] = None
+    ) -> Tuple[int, Dict[int, List[str]]]:
+        """
+        Массово добавить студентов.
+        
+        Пачки (номер строки, студент) загружаются через COPY во временную
+        таблицу, затем строки с несуществующими группами или статусами
+        (а также группами чужого подразделения, если задан subdivision_id)
+        отбрасываются, а остальные переносятся в studentdata, students и
+        studentadditionalstatuses несколькими INSERT ... SELECT в одной
+        транзакции. Возвращает количество добавленных студентов и ошибки
+        по номерам строк.
+        """
+        async with self._get_connection(conn) as connection:
+            async with connection.transaction():
+                await connection.execute("""
+                    CREATE TEMP TABLE student_import (
+                        rownum INT PRIMARY KEY,
+                        groupid INT NOT NULL,
+                        fullname VARCHAR(255) NOT NULL,
+                        isactive BOOLEAN NOT NULL,
+                        isbudget BOOLEAN NOT NULL,
+                        year INT NOT NULL,
+                        has_data BOOLEAN NOT NULL,
+                        phone VARCHAR(20),
+                        email VARCHAR(255),
+                        birthday DATE,
+                        status_ids INT[] NOT NULL,
+                        dataid INT,
+                        studentid INT
+                    ) ON COMMIT DROP
+                """)
+                
+                # Загружаем пачки по мере их валидации
+                for batch in batches:
+                    records = [
+                        (
+                            rownum, data.groupid, data.fullname, data.isactive, data.isbudget, data.year,
+                            data.student_data is not None,
+                            data.student_data.phone if data.student_data else None,
+                            data.student_data.email if data.student_data else None,
+                            data.student_data.birthday if data.student_data else None,
+                            data.additional_status_ids
+                        )
+                        for rownum, data in batch
+                    ]
+                    await connection.copy_records_to_table(
+                        'student_import', records=records, columns=self._IMPORT_COLUMNS
+                    )
+                
+                # Проверяем ссылки на группы и статусы
+                invalid_rows = await connection.fetch("""
+                    SELECT * FROM (
+                        SELECT 
+                            i.rownum,
+                            g.id IS NULL as group_missing,
+                            g.id IS NOT NULL AND $1::int IS NOT NULL 
+                                AND g.subdivisionid <> $1 as group_forbidden,
+                            ARRAY(
+                                SELECT DISTINCT u.statusid 
+                                FROM unnest(i.status_ids) AS u(statusid)
+                                WHERE NOT EXISTS (
+                                    SELECT 1 FROM additionalstatuses a WHERE a.id = u.statusid
+                                )
+                            ) as unknown_statuses
+                        FROM student_import i
+                        LEFT JOIN groups g ON g.id = i.groupid
+                    ) checked
+                    WHERE group_missing OR group_forbidden OR cardinality(unknown_statuses) > 0
+                    ORDER BY rownum
+                """, subdivision_id)
+                
+                errors: Dict[int, List[str]] = {}
+                for row in invalid_rows:
+                    row_errors = errors.setdefault(row['rownum'], [])
+                    if row['group_missing']:
+                        row_errors.append("Группа не найдена")
+                    if row['group_forbidden']:
+                        row_errors.append("Недостаточно прав для добавления студентов в эту группу")
+                    for status_id in sorted(row['unknown_statuses']):
+                        row_errors.append(f"Статус с ID {status_id} не найден")
+                
+                if errors:
+                    await connection.execute(
+                        "DELETE FROM student_import WHERE rownum = ANY($1::int[])", list(errors)
+                    )
+                
+                # Заранее выделяем ID, чтобы связать строки без построчных INSERT ... RETURNING
+                await connection.execute("""
+                    UPDATE student_import SET 
+                        studentid = nextval(pg_get_serial_sequence('students', 'id')),
+                        dataid = CASE 
+                            WHEN has_data THEN nextval(pg_get_serial_sequence('studentdata', 'id')) 
+                        END
+                """)
+                
+                await connection.execute("""
+                    INSERT INTO studentdata (id, phone, email, birthday)
+                    SELECT dataid, phone, email, birthday 
+                    FROM student_import 
+                    WHERE dataid IS NOT NULL
+                """)
+                
+                result = await connection.execute("""
+                    INSERT INTO students (id, groupid, fullname, isactive, isbudget, dataid, year)
+                    SELECT studentid, groupid, fullname, isactive, isbudget, dataid, year
+                    FROM student_import
+                    ORDER BY rownum
+                """)
+                imported = int(result.split()[-1])
+                
+                await connection.execute("""
+                    INSERT INTO studentadditionalstatuses (studentid, statusid)
+                    SELECT DISTINCT i.studentid, u.statusid
+                    FROM student_import i
+                    CROSS JOIN LATERAL unnest(i.status_ids) AS u(statusid)
+                """)
+                
+                # Обновляем статистику затронутых групп
+                group_rows = await connection.fetch("SELECT DISTINCT groupid FROM student_import")
+                await StatsRepository(self.pool).refresh_groups(
+                    [row['groupid'] for row in group_rows], connection
+                )
+                
+                student_ids = await connection.fetch("SELECT studentid FROM student_import")
+                await notify_changes(connection, "students", [row['studentid'] for row in student_ids])
+                
+                return imported, errors
+    
     async def get_with_details(self, id: int, conn: Optional[Connection] = None) -> Optional[Student]:
         """Получить студента с полными данными"""
         query = """
@@ -362,197 +678,203 @@ class StudentRepository(BaseRepository[Student]):
             if not row:
                 return None
             
-            # Формируем данные студента
-            student_data = dict(row)
-            
-            # Добавляем студенческие данные
-            if student_data['dataid']:
-                student_data['student_data'] = StudentData(
-                    id=student_data['dataid'],
-                    phone=student_data.pop('phone'),
-                    email=student_data.pop('email'),
-                    birthday=student_data.pop('birthday'),
-                    created_at=student_data['created_at'],
-                    updated_at=student_data['updated_at']
-                )
-            else:
-                student_data.pop('phone', None)
-                student_data.pop('email', None)
-                student_data.pop('birthday', None)
-                student_data['student_data'] = None
-            
-            # Получаем дополнительные статусы
-            statuses = await self._get_student_statuses(id, connection)
-            student_data['additional_statuses'] = statuses
-            
-            return Student(**student_data)
+            statuses = await self._get_statuses_for_students([id], connection)
+            return self._build_student(row, statuses.get(id, []))
+    
+    # Студент со всеми связанными данными одной строкой: статусы, проживание
+    # и взносы собираются в JSON подзапросами
+    _FULL_DETAILS_QUERY = """
+        SELECT 
+            s.*,
+            g.name as group_name,
+            g.subdivisionid as subdivision_id,
+            sub.name as subdivision_name,
+            sd.phone, sd.email, sd.birthday,
+            COALESCE(
+                (
+                    SELECT json_agg(a ORDER BY a.id)
+                    FROM studentadditionalstatuses sas
+                    JOIN additionalstatuses a ON a.id = sas.statusid
+                    WHERE sas.studentid = s.id
+                ),
+                '[]'::json
+            ) as additional_statuses,
+            (
+                SELECT row_to_json(h)
+                FROM hostelstudents h
+                WHERE h.studentid = s.id
+                ORDER BY h.id DESC
+                LIMIT 1
+            ) as hostel_info,
+            COALESCE(
+                (
+                    SELECT json_agg(c ORDER BY c.year DESC, c.semester DESC)
+                    FROM contributions c
+                    WHERE c.studentid = s.id
+                ),
+                '[]'::json
+            ) as contributions
+        FROM students s
+        JOIN groups g ON g.id = s.groupid
+        JOIN subdivisions sub ON sub.id = g.subdivisionid
+        LEFT JOIN studentdata sd ON sd.id = s.dataid
+        WHERE s.id = $1
+    """
     
     async def get_with_full_details(self, id: int, conn: Optional[Connection] = None) -> Optional[StudentWithDetails]:
-        """Получить студента с полными деталями включая общежитие и взносы"""
-        student = await self.get_with_details(id, conn)
-        if not student:
-            return None
-        
+        """Получить студента с полными деталями включая общежитие и взносы (одним запросом)"""
         async with self._get_connection(conn) as connection:
-            # Получаем информацию об общежитии
-            hostel_query = "SELECT * FROM hostelstudents WHERE studentid = $1"
-            hostel_row = await connection.fetchrow(hostel_query, id)
-            
-            # Получаем взносы
-            contributions_query = """
-                SELECT * FROM contributions 
-                WHERE studentid = $1 
-                ORDER BY year DESC, semester DESC
-            """
-            contribution_rows = await connection.fetch(contributions_query, id)
-            
-            return StudentWithDetails(
-                **student.model_dump(),
-                hostel_info=HostelStudent(**dict(hostel_row)) if hostel_row else None,
-                contributions=[Contribution(**dict(row)) for row in contribution_rows]
-            )
+            row = await connection.fetchrow(self._FULL_DETAILS_QUERY, id)
+            if not row:
+                return None
+        
+        student_data = dict(row)
+        statuses = [AdditionalStatus(**status) for status in _load_json(student_data.pop('additional_statuses'))]
+        hostel_info = _load_json(student_data['hostel_info'])
+        student_data['hostel_info'] = HostelStudent(**hostel_info) if hostel_info else None
+        student_data['contributions'] = [
+            Contribution(**contribution) for contribution in _load_json(student_data['contributions'])
+        ]
+        return self._build_student(student_data, statuses, StudentWithDetails)
     
     async def search(
         self, 
         filters: Dict[str, Any], 
         limit: int = 100, 
         offset: int = 0,
+        after: Optional[Tuple[str, int]] = None,
+        order_by_name: bool = False,
         conn: Optional[Connection] = None
     ) -> List[Student]:
-        """Поиск студентов по фильтрам"""
-        query = """
-            SELECT 
-                s.*,
-                g.name as group_name,
-                sub.name as subdivision_name,
-                sd.phone, sd.email, sd.birthday
-            FROM students s
-            JOIN groups g ON g.id = s.groupid
-            JOIN subdivisions sub ON sub.id = g.subdivisionid
-            LEFT JOIN studentdata sd ON sd.id = s.dataid
-            WHERE 1=1
         """
+        Поиск студентов по фильтрам.
         
-        params = []
-        param_count = 1
-        
-        # Добавляем фильтры
-        if 'group_id' in filters:
-            query += f" AND s.groupid = ${param_count}"
-            params.append(filters['group_id'])
-            param_count += 1
-        
-        if 'subdivision_id' in filters:
-            query += f" AND g.subdivisionid = ${param_count}"
-            params.append(filters['subdivision_id'])
-            param_count += 1
-        
-        if 'is_active' in filters:
-            query += f" AND s.isactive = ${param_count}"
-            params.append(filters['is_active'])
-            param_count += 1
-        
-        if 'is_budget' in filters:
-            query += f" AND s.isbudget = ${param_count}"
-            params.append(filters['is_budget'])
-            param_count += 1
+        Если передан after (fullname, id), используется keyset-пагинация:
+        возвращаются записи строго после указанной позиции, offset игнорируется.
+        При постраничном поиске по ФИО результаты упорядочены по релевантности,
+        при keyset-пагинации - всегда по ФИО. order_by_name=True сортирует по
+        (fullname, id) и без after: так запрашивается первая страница
+        keyset-пагинации, иначе ее порядок не совпал бы с порядком следующих.
+        """
+        async with self._get_connection(conn, readonly=True) as connection:
+            if after is not None:
+                query, params = STUDENTS_SEARCH_AFTER.prepare(
+                    connection, filters, after_name=after[0], after_id=after[1], limit=limit
+                )
+            elif filters.get('search') is not None and not order_by_name:
+                rank_prefix, rank_term = text_search_order_params(filters['search'])
+                query, params = STUDENTS_SEARCH_RANKED.prepare(
+                    connection, filters, rank_prefix=rank_prefix, rank_term=rank_term,
+                    limit=limit, offset=offset
+                )
+            else:
+                query, params = STUDENTS_SEARCH.prepare(connection, filters, limit=limit, offset=offset)
+            
+            rows = await connection.fetch(query, *params)
+            return await self._build_students(rows, connection)
+    
+    async def iter_export_rows(
+        self,
+        filters: Dict[str, Any],
+        fetch_size: int = settings.EXPORT_FETCH_SIZE,
+        conn: Optional[Connection] = None
+    ) -> AsyncIterator[Record]:
+        """
+        Построчно выдать студентов для выгрузки.
         
-        if 'year' in filters:
-            query += f" AND s.year = ${param_count}"
-            params.append(filters['year'])
-            param_count += 1
+        Использует серверный курсор: в памяти одновременно находится не больше
+        fetch_size строк. Строки не превращаются в модели, дополнительные
+        статусы собираются в одну строку на стороне БД.
+        """
+        async with self._get_connection(conn, readonly=True) as connection:
+            query, params = STUDENTS_EXPORT.prepare(connection, filters)
+            
+            # Серверный курсор работает только внутри транзакции
+            async with connection.transaction(readonly=True):
+                async for row in connection.cursor(query, *params, prefetch=fetch_size):
+                    yield row
+    
+    async def _build_students(self, rows: List[Record], conn: Connection) -> List[Student]:
+        """Собрать список студентов, загрузив статусы одним запросом"""
+        if not rows:
+            return []
         
-        if 'search' in filters:
-            query += f" AND s.fullname ILIKE ${param_count}"
-            params.append(f"%{filters['search']}%")
-            param_count += 1
+        statuses = await self._get_statuses_for_students([row['id'] for row in rows], conn)
+        return [self._build_student(row, statuses.get(row['id'], [])) for row in rows]
+    
+    @staticmethod
+    def _build_student(
+        row: Record,
+        statuses: List[AdditionalStatus],
+        model_class: Type[Student] = Student
+    ) -> Student:
+        """Собрать модель студента из строки запроса"""
+        student_data = dict(row)
         
-        # Добавляем пагинацию
-        query += f" ORDER BY s.fullname LIMIT ${param_count} OFFSET ${param_count + 1}"
-        params.extend([limit, offset])
+        # Обрабатываем данные студента
+        if student_data['dataid']:
+            student_data['student_data'] = StudentData(
+                id=student_data['dataid'],
+                phone=student_data.pop('phone'),
+                email=student_data.pop('email'),
+                birthday=student_data.pop('birthday'),
+                created_at=student_data['created_at'],
+                updated_at=student_data['updated_at']
+            )
+        else:
+            student_data.pop('phone', None)
+            student_data.pop('email', None)
+            student_data.pop('birthday', None)
+            student_data['student_data'] = None
         
-        async with self._get_connection(conn) as connection:
-            rows = await connection.fetch(query, *params)
-            students = []
-            
-            for row in rows:
-                student_data = dict(row)
-                
-                # Обрабатываем данные студента
-                if student_data['dataid']:
-                    student_data['student_data'] = StudentData(
-                        id=student_data['dataid'],
-                        phone=student_data.pop('phone'),
-                        email=student_data.pop('email'),
-                        birthday=student_data.pop('birthday'),
-                        created_at=student_data['created_at'],
-                        updated_at=student_data['updated_at']
-                    )
-                else:
-                    student_data.pop('phone', None)
-                    student_data.pop('email', None)
-                    student_data.pop('birthday', None)
-                    student_data['student_data'] = None
-                
-                # Получаем статусы
-                statuses = await self._get_student_statuses(row['id'], connection)
-                student_data['additional_statuses'] = statuses
-                
-                students.append(Student(**student_data))
-            
-            return students
+        student_data['additional_statuses'] = statuses
+        return model_class(**student_data)
     
     async def _get_student_statuses(self, student_id: int, conn: Connection) -> List[AdditionalStatus]:
         """Получить дополнительные статусы студента"""
+        statuses = await self._get_statuses_for_students([student_id], conn)
+        return statuses.get(student_id, [])
+    
+    async def _get_statuses_for_students(
+        self, 
+        student_ids: List[int], 
+        conn: Connection
+    ) -> Dict[int, List[AdditionalStatus]]:
+        """Получить дополнительные статусы для набора студентов одним запросом"""
+        if not student_ids:
+            return {}
+        
         query = """
-            SELECT a.* FROM additionalstatuses a
+            SELECT sas.studentid, a.* FROM additionalstatuses a
             JOIN studentadditionalstatuses sas ON sas.statusid = a.id
-            WHERE sas.studentid = $1
+            WHERE sas.studentid = ANY($1::int[])
+            ORDER BY sas.studentid, a.id
         """
-        rows = await conn.fetch(query, student_id)
-        return [AdditionalStatus(**dict(row)) for row in rows]
+        rows = await conn.fetch(query, list(student_ids))
+        
+        statuses: Dict[int, List[AdditionalStatus]] = {}
+        for row in rows:
+            status_data = dict(row)
+            student_id = status_data.pop('studentid')
+            statuses.setdefault(student_id, []).append(AdditionalStatus(**status_data))
+        return statuses
 
     async def count(self, filters: Optional[Dict[str, Any]] = None, conn: Optional[Connection] = None) -> int:
         """Подсчитать количество студентов с учетом фильтров"""
-        query = """
-            SELECT COUNT(*) FROM students s
-            JOIN groups g ON g.id = s.groupid
-            WHERE 1=1
-        """
-        
-        params = []
-        param_count = 1
-        
-        if filters:
-            if 'group_id' in filters:
-                query += f" AND s.groupid = ${param_count}"
-                params.append(filters['group_id'])
-                param_count += 1
-            
-            if 'subdivision_id' in filters:
-                query += f" AND g.subdivisionid = ${param_count}"
-                params.append(filters['subdivision_id'])
-                param_count += 1
-            
-            if 'is_active' in filters:
-                query += f" AND s.isactive = ${param_count}"
-                params.append(filters['is_active'])
-                param_count += 1
-            
-            if 'is_budget' in filters:
-                query += f" AND s.isbudget = ${param_count}"
-                params.append(filters['is_budget'])
-                param_count += 1
-            
-            if 'year' in filters:
-                query += f" AND s.year = ${param_count}"
-                params.append(filters['year'])
-                param_count += 1
-            
-            if 'search' in filters:
-                query += f" AND s.fullname ILIKE ${param_count}"
-                params.append(f"%{filters['search']}%")
-                param_count += 1
+        total, _ = await self.count_with_strategy(filters, CountStrategy.EXACT, conn)
+        return total
+    
+    async def count_with_strategy(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        strategy: CountStrategy = CountStrategy.EXACT,
+        conn: Optional[Connection] = None
+    ) -> Tuple[int, CountStrategy]:
+        """Подсчитать количество студентов выбранным способом"""
+        filters = filters or {}
+        source, params = STUDENTS_COUNT.build(filters)
         
-        async with self._get_connection(conn) as connection:
-            return await connection.fetchval(query, *params)
\ No newline at end of file
+        return await self._count_by_strategy(
+            source, params, strategy, conn, STUDENTS_COUNT.name,
+            filtered=STUDENTS_COUNT.is_filtered(filters)
+        )
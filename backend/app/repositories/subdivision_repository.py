@@ -1,7 +1,10 @@
 from typing import Optional, List, Dict, Any
 from asyncpg import Connection
 from .base import BaseRepository
+from ..core.cache import user_cache
+from ..core.notifications import notify_changes
 from ..models.subdivision import Subdivision, SubdivisionCreate, SubdivisionUpdate, SubdivisionWithStats
+from ..utils.search import text_search_condition, text_search_order
 
 
 class SubdivisionRepository(BaseRepository[Subdivision]):
@@ -25,6 +28,7 @@ class SubdivisionRepository(BaseRepository[Subdivision]):
         
         async with self._get_connection(conn) as connection:
             row = await connection.fetchrow(query, data.name)
+            await notify_changes(connection, "subdivisions", [row['id']])
             return Subdivision(**dict(row))
     
     async def update(self, id: int, data: SubdivisionUpdate, conn: Optional[Connection] = None) -> Optional[Subdivision]:
@@ -43,7 +47,23 @@ class SubdivisionRepository(BaseRepository[Subdivision]):
         
         async with self._get_connection(conn) as connection:
             row = await connection.fetchrow(query, id, *update_data.values())
-            return Subdivision(**dict(row)) if row else None
+            # Название подразделения входит в кешированных пользователей
+            user_cache.clear()
+            if not row:
+                return None
+            await notify_changes(connection, "subdivisions", [id])
+            return Subdivision(**dict(row))
+    
+    async def delete(self, id: int, conn: Optional[Connection] = None) -> bool:
+        """Удалить подразделение"""
+        async with self._get_connection(conn) as connection:
+            result = await super().delete(id, connection)
+            user_cache.clear()
+            if result:
+                await notify_changes(connection, "subdivisions", [id])
+                # Вместе с подразделением удалены его группы и студенты
+                await notify_changes(connection, "groups")
+            return result
     
     async def get_by_name(self, name: str, conn: Optional[Connection] = None) -> Optional[Subdivision]:
         """Получить подразделение по имени"""
@@ -79,29 +99,74 @@ class SubdivisionRepository(BaseRepository[Subdivision]):
             row = await connection.fetchrow(query, id)
             return SubdivisionWithStats(**dict(row)) if row else None
     
+    async def search(
+        self, 
+        search: str, 
+        limit: int = 100, 
+        offset: int = 0,
+        conn: Optional[Connection] = None
+    ) -> List[Subdivision]:
+        """Поиск подразделений по названию (по релевантности)"""
+        params: List[Any] = []
+        condition = text_search_condition("name", search, params)
+        order_by = text_search_order("name", search, params)
+        
+        query = f"""
+            SELECT * FROM subdivisions
+            WHERE {condition}
+            ORDER BY {order_by}, name
+            LIMIT ${len(params) + 1} OFFSET ${len(params) + 2}
+        """
+        
+        async with self._get_connection(conn, readonly=True) as connection:
+            rows = await connection.fetch(query, *params, limit, offset)
+            return [Subdivision(**dict(row)) for row in rows]
+    
+    async def count(self, filters: Optional[Dict[str, Any]] = None, conn: Optional[Connection] = None) -> int:
+        """Подсчитать количество подразделений (с учетом поиска по названию)"""
+        if not filters or 'search' not in filters:
+            return await super().count(filters, conn)
+        
+        params: List[Any] = []
+        query = f"SELECT COUNT(*) FROM subdivisions WHERE {text_search_condition('name', filters['search'], params)}"
+        
+        async with self._get_connection(conn, readonly=True) as connection:
+            return await connection.fetchval(query, *params)
+    
     async def get_all_with_stats(self, conn: Optional[Connection] = None) -> List[SubdivisionWithStats]:
-        """Получить все подразделения со статистикой"""
+        """Получить все подразделения со статистикой (из предрассчитанной таблицы group_stats)"""
         query = """
             SELECT 
                 s.*,
-                COUNT(DISTINCT g.id) as groups_count,
-                COUNT(DISTINCT st.id) as students_count,
-                COUNT(DISTINCT st.id) FILTER (WHERE st.isactive = true) as active_students_count,
-                COUNT(DISTINCT u.id) as users_count,
+                COALESCE(gs.groups_count, 0) as groups_count,
+                COALESCE(gs.students_count, 0) as students_count,
+                COALESCE(gs.active_students_count, 0) as active_students_count,
+                COALESCE(uc.users_count, 0) as users_count,
                 CASE 
-                    WHEN COUNT(DISTINCT st.id) > 0 
-                    THEN ROUND((COUNT(DISTINCT st.id) FILTER (WHERE st.isactive = true) * 100.0) / COUNT(DISTINCT st.id), 1)
+                    WHEN COALESCE(gs.students_count, 0) > 0 
+                    THEN ROUND((gs.active_students_count * 100.0) / gs.students_count, 1)
                     ELSE 0 
                 END as union_percentage
             FROM subdivisions s
-            LEFT JOIN groups g ON g.subdivisionid = s.id
-            LEFT JOIN students st ON st.groupid = g.id
-            LEFT JOIN users u ON u.subdivisionid = s.id
-            GROUP BY s.id
+            LEFT JOIN (
+                SELECT 
+                    g.subdivisionid,
+                    COUNT(*) as groups_count,
+                    COALESCE(SUM(st.students_count), 0) as students_count,
+                    COALESCE(SUM(st.active_students_count), 0) as active_students_count
+                FROM groups g
+                LEFT JOIN group_stats st ON st.groupid = g.id
+                GROUP BY g.subdivisionid
+            ) gs ON gs.subdivisionid = s.id
+            LEFT JOIN (
+                SELECT subdivisionid, COUNT(*) as users_count
+                FROM users
+                GROUP BY subdivisionid
+            ) uc ON uc.subdivisionid = s.id
             ORDER BY s.name
         """
         
-        async with self._get_connection(conn) as connection:
+        async with self._get_connection(conn, readonly=True) as connection:
             rows = await connection.fetch(query)
             return [SubdivisionWithStats(**dict(row)) for row in rows]
     
@@ -134,6 +199,6 @@ class SubdivisionRepository(BaseRepository[Subdivision]):
             LIMIT $1 OFFSET $2
         """
         
-        async with self._get_connection(conn) as connection:
+        async with self._get_connection(conn, readonly=True) as connection:
             rows = await connection.fetch(query, limit, offset)
             return [Subdivision(**dict(row)) for row in rows]
\ No newline at end of file
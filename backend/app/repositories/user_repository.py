@@ -1,11 +1,29 @@
 # backend/app/repositories/user_repository.py
 
-from typing import Optional, List
-from asyncpg import Connection
+import json
+from typing import Optional, List, Dict, Any, Type
+from asyncpg import Connection, Record
 from .base import BaseRepository
+from .query_registry import query_registry, Slot
 from ..models.user import User, UserCreate, UserUpdate, UserInDB
 from ..models.role import Role
-from ..core.security import get_password_hash
+from ..core.security import get_password_hash_async
+from ..core.cache import user_cache
+from ..core.notifications import notify_changes
+from ..utils.search import escape_like, normalize_term
+
+
+# Фильтры списка пользователей (алиас u - users)
+USER_FILTERS = (
+    Slot('subdivision_id', "u.subdivisionid = {0}"),
+    Slot('search', "u.login ILIKE {0}", lambda term: (f"%{escape_like(normalize_term(term))}%",)),
+)
+
+USERS_COUNT = query_registry.template(
+    "users.count",
+    "FROM users u WHERE 1=1{where}",
+    USER_FILTERS
+)
 
 
 class UserRepository(BaseRepository[User]):
@@ -19,9 +37,33 @@ class UserRepository(BaseRepository[User]):
     def model_class(self):
         return User
     
+    # Пользователь вместе с подразделением и агрегированными ролями
+    _USER_WITH_ROLES_QUERY = """
+        SELECT 
+            u.*,
+            s.name as subdivision_name,
+            COALESCE(
+                (
+                    SELECT json_agg(r ORDER BY r.id)
+                    FROM userroles ur
+                    JOIN roles r ON r.id = ur.roleid
+                    WHERE ur.userid = u.id
+                ),
+                '[]'::json
+            ) as roles
+        FROM users u
+        LEFT JOIN subdivisions s ON s.id = u.subdivisionid
+    """
+    
+    USERS_SEARCH = query_registry.template(
+        "users.search",
+        _USER_WITH_ROLES_QUERY + " WHERE 1=1{where} ORDER BY u.login, u.id LIMIT {limit} OFFSET {offset}",
+        USER_FILTERS
+    )
+    
     async def create(self, data: UserCreate, conn: Optional[Connection] = None) -> User:
         """Создать пользователя"""
-        password_hash = get_password_hash(data.password)
+        password_hash = await get_password_hash_async(data.password)
         
         async with self._get_connection(conn) as connection:
             # Создаем пользователя
@@ -57,7 +99,7 @@ class UserRepository(BaseRepository[User]):
             # Обновляем данные пользователя
             if update_data:
                 if 'password' in update_data:
-                    update_data['passwordhash'] = get_password_hash(update_data.pop('password'))
+                    update_data['passwordhash'] = await get_password_hash_async(update_data.pop('password'))
                 
                 set_parts = []
                 values = [id]
@@ -87,91 +129,77 @@ class UserRepository(BaseRepository[User]):
                     role_data = [(id, role_id) for role_id in data.role_ids]
                     await connection.executemany(role_query, role_data)
             
+            user_cache.invalidate(id)
+            # Остальные процессы сбрасывают пользователя из кеша по уведомлению
+            await notify_changes(connection, "users", [id])
             return await self.get_with_roles(id, connection)
     
     async def get_by_login(self, login: str, conn: Optional[Connection] = None) -> Optional[UserInDB]:
         """Получить пользователя по логину с хешем пароля"""
-        query = """
-            SELECT u.*, s.name as subdivision_name
-            FROM users u
-            LEFT JOIN subdivisions s ON s.id = u.subdivisionid
-            WHERE u.login = $1
-        """
+        query = self._USER_WITH_ROLES_QUERY + " WHERE u.login = $1"
         
         async with self._get_connection(conn) as connection:
             row = await connection.fetchrow(query, login)
-            if not row:
-                return None
-            
-            # Получаем роли
-            roles = await self._get_user_roles(row['id'], connection)
-            
-            user_data = dict(row)
-            user_data['roles'] = roles
-            
-            return UserInDB(**user_data)
+            return self._build_user(row, UserInDB) if row else None
     
     async def get_with_roles(self, id: int, conn: Optional[Connection] = None) -> Optional[User]:
         """Получить пользователя с ролями"""
-        query = """
-            SELECT u.*, s.name as subdivision_name
-            FROM users u
-            LEFT JOIN subdivisions s ON s.id = u.subdivisionid
-            WHERE u.id = $1
-        """
+        query = self._USER_WITH_ROLES_QUERY + " WHERE u.id = $1"
         
         async with self._get_connection(conn) as connection:
             row = await connection.fetchrow(query, id)
-            if not row:
-                return None
-            
-            # Получаем роли
-            roles = await self._get_user_roles(id, connection)
-            
-            user_data = dict(row)
-            user_data['roles'] = roles
-            # Убираем пароль из результата
-            user_data.pop('passwordhash', None)
-            
-            return User(**user_data)
+            return self._build_user(row) if row else None
     
-    async def get_all_with_roles(self, subdivision_id: Optional[int] = None, conn: Optional[Connection] = None) -> List[User]:
-        """Получить всех пользователей с ролями"""
-        base_query = """
-            SELECT u.*, s.name as subdivision_name
-            FROM users u
-            LEFT JOIN subdivisions s ON s.id = u.subdivisionid
+    async def search(
+        self,
+        filters: Dict[str, Any],
+        limit: int = 100,
+        offset: int = 0,
+        conn: Optional[Connection] = None
+    ) -> List[User]:
         """
+        Страница пользователей с ролями.
         
+        Фильтры: subdivision_id, search (подстрока логина без учета регистра).
+        """
+        async with self._get_connection(conn, readonly=True) as connection:
+            query, params = self.USERS_SEARCH.prepare(connection, filters, limit=limit, offset=offset)
+            rows = await connection.fetch(query, *params)
+            return [self._build_user(row) for row in rows]
+    
+    async def count(self, filters: Optional[Dict[str, Any]] = None, conn: Optional[Connection] = None) -> int:
+        """Подсчитать количество пользователей с учетом фильтров (subdivision_id, search)"""
+        source, params = USERS_COUNT.build(filters or {})
+        total, _ = await self._count_by_strategy(source, params, conn=conn, query_name=USERS_COUNT.name)
+        return total
+    
+    async def get_all_with_roles(self, subdivision_id: Optional[int] = None, conn: Optional[Connection] = None) -> List[User]:
+        """Получить всех пользователей с ролями"""
         if subdivision_id:
-            query = base_query + " WHERE u.subdivisionid = $1 ORDER BY u.login"
+            query = self._USER_WITH_ROLES_QUERY + " WHERE u.subdivisionid = $1 ORDER BY u.login"
             params = [subdivision_id]
         else:
-            query = base_query + " ORDER BY u.login"
+            query = self._USER_WITH_ROLES_QUERY + " ORDER BY u.login"
             params = []
         
         async with self._get_connection(conn) as connection:
             rows = await connection.fetch(query, *params)
-            users = []
-            
-            for row in rows:
-                roles = await self._get_user_roles(row['id'], connection)
-                user_data = dict(row)
-                user_data['roles'] = roles
-                user_data.pop('passwordhash', None)
-                users.append(User(**user_data))
-            
-            return users
+            return [self._build_user(row) for row in rows]
     
-    async def _get_user_roles(self, user_id: int, conn: Connection) -> List[Role]:
-        """Получить роли пользователя"""
-        query = """
-            SELECT r.* FROM roles r
-            JOIN userroles ur ON ur.roleid = r.id
-            WHERE ur.userid = $1
-        """
-        rows = await conn.fetch(query, user_id)
-        return [Role(**dict(row)) for row in rows]
+    @staticmethod
+    def _build_user(row: Record, model_class: Type[User] = User) -> User:
+        """Собрать модель пользователя из строки с агрегированными ролями"""
+        user_data = dict(row)
+        roles = user_data.pop('roles') or '[]'
+        if isinstance(roles, str):
+            roles = json.loads(roles)
+        user_data['roles'] = [Role(**role) for role in roles]
+        
+        # Хеш пароля отдаем только в модели для аутентификации
+        if model_class is not UserInDB:
+            user_data.pop('passwordhash', None)
+        
+        return model_class(**user_data)
     
     async def add_role(self, user_id: int, role_id: int, conn: Optional[Connection] = None) -> bool:
         """Добавить роль пользователю"""
@@ -183,6 +211,8 @@ class UserRepository(BaseRepository[User]):
         
         async with self._get_connection(conn) as connection:
             await connection.execute(query, user_id, role_id)
+            user_cache.invalidate(user_id)
+            await notify_changes(connection, "users", [user_id])
             return True
     
     async def remove_role(self, user_id: int, role_id: int, conn: Optional[Connection] = None) -> bool:
@@ -191,4 +221,25 @@ class UserRepository(BaseRepository[User]):
         
         async with self._get_connection(conn) as connection:
             result = await connection.execute(query, user_id, role_id)
-            return result != "DELETE 0"
\ No newline at end of file
+            user_cache.invalidate(user_id)
+            await notify_changes(connection, "users", [user_id])
+            return result != "DELETE 0"
+    
+    async def delete(self, id: int, conn: Optional[Connection] = None) -> bool:
+        """Удалить пользователя"""
+        async with self._get_connection(conn) as connection:
+            result = await super().delete(id, connection)
+            user_cache.invalidate(id)
+            if result:
+                await notify_changes(connection, "users", [id])
+            return result
+    
+    async def delete_many(self, ids: List[int], conn: Optional[Connection] = None) -> int:
+        """Удалить несколько пользователей"""
+        async with self._get_connection(conn) as connection:
+            result = await super().delete_many(ids, connection)
+            for id in ids:
+                user_cache.invalidate(id)
+            if result:
+                await notify_changes(connection, "users", ids)
+            return result
\ No newline at end of file
@@ -1,5 +1,6 @@
 # backend/app/services/audit_service.py
 
+import ipaddress
 from typing import Optional, Dict, Any
 from fastapi import Request
 from loguru import logger
@@ -7,6 +8,17 @@ from loguru import logger
 from ..models.audit_log import AuditLogCreate
 from ..repositories.audit_log_repository import AuditLogRepository
 from ..core.database import db
+from .audit_writer import audit_writer
+
+
+def normalize_ip(value: Optional[str]) -> Optional[str]:
+    """Привести IP адрес к каноническому виду (None, если это не IP адрес)"""
+    if not value:
+        return None
+    try:
+        return str(ipaddress.ip_address(value.strip()))
+    except ValueError:
+        return None
 
 
 class AuditService:
@@ -24,20 +36,19 @@ class AuditService:
     ):
         """Записать действие в лог"""
         try:
-            pool = await db.get_pool()
-            repo = AuditLogRepository(pool)
-            
             # Получаем информацию о запросе
             ip_address = None
             user_agent = None
             
             if request:
                 # Получаем IP адрес и конвертируем в строку
+                # X-Forwarded-For задает клиент: некорректное значение не должно
+                # попасть в столбец INET
                 forwarded_for = request.headers.get("X-Forwarded-For")
                 if forwarded_for:
-                    ip_address = str(forwarded_for.split(",")[0].strip())
+                    ip_address = normalize_ip(forwarded_for.split(",")[0])
                 else:
-                    ip_address = str(request.client.host) if request.client else None
+                    ip_address = normalize_ip(request.client.host) if request.client else None
                 
                 # Получаем User Agent
                 user_agent = request.headers.get("User-Agent")
@@ -58,7 +69,13 @@ class AuditService:
                 user_agent=user_agent
             )
             
-            await repo.create_log(log_data)
+            # Пишем через фоновую очередь, чтобы не ждать БД в обработчике запроса
+            if audit_writer.is_running:
+                await audit_writer.enqueue(log_data)
+            else:
+                pool = await db.get_pool()
+                repo = AuditLogRepository(pool)
+                await repo.create_log(log_data)
             
         except Exception as e:
             # Логируем ошибку, но не прерываем основную операцию
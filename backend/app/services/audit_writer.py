@@ -0,0 +1,160 @@
+# backend/app/services/audit_writer.py
+
+import asyncio
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from loguru import logger
+
+from ..models.audit_log import AuditLogCreate
+from ..repositories.audit_log_repository import AuditLogRepository
+from ..core.config import settings
+from ..core.database import db
+
+# Маркер остановки фоновой задачи
+_STOP = object()
+
+
+class AuditLogWriter:
+    """
+    Фоновая запись логов аудита пачками.
+
+    Записи складываются в ограниченную очередь и сбрасываются в БД
+    через COPY, когда набирается batch_size записей или проходит
+    flush_interval секунд. Переполненная очередь блокирует добавление
+    (backpressure), при остановке очередь сбрасывается полностью.
+    """
+
+    def __init__(
+        self,
+        max_queue_size: int = settings.AUDIT_QUEUE_MAX_SIZE,
+        batch_size: int = settings.AUDIT_BATCH_SIZE,
+        flush_interval: float = settings.AUDIT_FLUSH_INTERVAL
+    ):
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self.written = 0
+        self.failed = 0
+        self.batches = 0
+
+    @property
+    def is_running(self) -> bool:
+        """Запущена ли фоновая запись"""
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        """Запустить фоновую задачу записи"""
+        if self.is_running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._task = asyncio.create_task(self._run())
+        logger.info("Audit log writer started")
+
+    async def stop(self):
+        """Остановить запись, предварительно сбросив очередь в БД"""
+        if not self.is_running:
+            return
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+        logger.info("Audit log writer stopped")
+
+    async def enqueue(self, item: AuditLogCreate):
+        """
+        Поставить запись в очередь (ждет, если очередь заполнена).
+
+        Время действия фиксируется здесь: запись попадет в БД позже.
+        """
+        if item.created_at is None:
+            item = item.model_copy(update={"created_at": datetime.now(timezone.utc)})
+        await self._queue.put(item)
+
+    async def _run(self):
+        """Основной цикл: собрать пачку и записать ее"""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            item = await self._queue.get()
+            if item is _STOP:
+                return
+
+            batch = [item]
+            stopping = False
+            deadline = loop.time() + self.flush_interval
+
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            await self._flush(batch)
+
+            if stopping:
+                await self._drain()
+                return
+
+    async def _drain(self):
+        """Записать все, что осталось в очереди"""
+        batch: List[AuditLogCreate] = []
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is _STOP:
+                continue
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                await self._flush(batch)
+                batch = []
+        await self._flush(batch)
+
+    async def _flush(self, batch: List[AuditLogCreate]):
+        """
+        Записать пачку логов.
+
+        COPY отклоняет пачку целиком, поэтому при ошибке записи
+        повторяются по одной: теряются только ошибочные.
+        """
+        if not batch:
+            return
+        try:
+            pool = await db.get_pool()
+            repo = AuditLogRepository(pool)
+            self.written += await repo.create_many(batch)
+            self.batches += 1
+            return
+        except Exception as e:
+            # Ошибка записи журнала не должна останавливать фоновую задачу
+            if len(batch) == 1:
+                self.failed += 1
+                logger.error(f"Failed to write audit log record: {e}")
+                return
+            logger.warning(f"Failed to write {len(batch)} audit log records, retrying one by one: {e}")
+
+        for item in batch:
+            await self._flush([item])
+
+    def stats(self) -> Dict[str, Any]:
+        """Статистика фоновой записи"""
+        return {
+            "running": self.is_running,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "max_queue_size": self.max_queue_size,
+            "batch_size": self.batch_size,
+            "flush_interval": self.flush_interval,
+            "written": self.written,
+            "failed": self.failed,
+            "batches": self.batches
+        }
+
+
+# Глобальный экземпляр фоновой записи логов
+audit_writer = AuditLogWriter()
@@ -0,0 +1,80 @@
+# backend/app/services/debt_engine.py
+
+from typing import Any, Dict, Hashable, Optional
+
+from ..core.cache import TTLCache, table_versions
+from ..core.config import settings
+from ..core.database import replica_reads
+from ..core.notifications import data_change_listener
+from ..models.contribution import DebtReport
+from ..repositories.contribution_repository import ContributionRepository
+
+# Таблицы, от которых зависит расчет задолженностей
+DEBT_TABLES = ("contributions", "students", "groups", "subdivisions")
+
+
+class DebtEngine:
+    """
+    Расчет задолженностей с кешированием по (подразделение, год, семестр).
+
+    В ключ кеша входят версии таблиц расчета, поэтому любая запись во
+    взносы, студентов или группы (в этом процессе сразу, в остальных - по
+    уведомлению data_changes) делает старые записи недоступными, а LRU
+    вытесняет их. Пока подписка на уведомления не активна, изменения из
+    других процессов не видны, и отчет не кешируется (и может читаться с
+    реплики). Кешируемые отчеты всегда строятся по основному серверу.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self._cache: TTLCache[DebtReport] = TTLCache(max_size=max_size, ttl=ttl)
+        self.computations = 0
+
+    def _key(self, subdivision_id: Optional[int], year: int, semester: Optional[int]) -> Hashable:
+        return table_versions.etag(DEBT_TABLES, (subdivision_id, year, semester))
+
+    async def get_report(
+        self,
+        repo: ContributionRepository,
+        year: int,
+        semester: Optional[int] = None,
+        subdivision_id: Optional[int] = None
+    ) -> DebtReport:
+        """Задолженности за год (по всем подразделениям, если subdivision_id не задан)"""
+        key = self._key(subdivision_id, year, semester)
+
+        report = self._cache.get(key)
+        if report is not None:
+            return report
+
+        # Отчет по подразделению - часть уже посчитанного общего отчета
+        if subdivision_id is not None:
+            report = self._cache.get(self._key(None, year, semester))
+            if report is not None:
+                return DebtReport(
+                    year=year,
+                    semester=semester,
+                    students=[item for item in report.students if item.subdivision_id == subdivision_id],
+                    subdivisions=[item for item in report.subdivisions if item.subdivision_id == subdivision_id]
+                )
+
+        self.computations += 1
+        if not data_change_listener.is_listening:
+            return await repo.get_debts(year, semester, subdivision_id)
+
+        # Отчет кешируется под текущими версиями таблиц, поэтому строится по
+        # основному серверу: отстающая реплика дала бы старые данные под новым ключом
+        with replica_reads(False):
+            report = await repo.get_debts(year, semester, subdivision_id)
+        self._cache.set(key, report)
+        return report
+
+    def stats(self) -> Dict[str, Any]:
+        """Статистика кеша отчетов"""
+        return {**self._cache.stats(), "computations": self.computations}
+
+
+# Глобальный экземпляр расчета задолженностей
+debt_engine = DebtEngine(
+    max_size=settings.DEBT_CACHE_MAX_SIZE,
+    ttl=settings.DEBT_CACHE_TTL
+)
@@ -0,0 +1,167 @@
+# backend/app/services/student_import.py
+
+import csv
+import io
+import json
+import re
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+from pydantic import ValidationError as PydanticValidationError
+
+from ..models.student import StudentCreate, StudentImportResult, ImportRowError
+from ..repositories.student_repository import StudentRepository
+from ..core.config import settings
+from ..core.exceptions import ValidationError
+
+# Поддерживаемые форматы файла импорта
+IMPORT_FORMATS = ("csv", "jsonl")
+
+# Поля CSV, относящиеся к дополнительным данным студента
+_STUDENT_DATA_FIELDS = ("phone", "email", "birthday")
+
+# Значения логических полей, принятые в русскоязычных таблицах
+_BOOL_ALIASES = {"да": "true", "нет": "false"}
+
+
+def detect_format(filename: Optional[str]) -> str:
+    """Определить формат файла по расширению"""
+    if filename and filename.lower().endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    return "csv"
+
+
+def _csv_row_to_payload(row: Dict[str, Optional[str]]) -> Dict[str, Any]:
+    """Преобразовать строку CSV в структуру StudentCreate"""
+    payload: Dict[str, Any] = {}
+    student_data: Dict[str, Any] = {}
+
+    for key, value in row.items():
+        if key is None or value is None:
+            continue
+        key = key.strip()
+        value = value.strip()
+        if not value:
+            continue
+
+        if key in _STUDENT_DATA_FIELDS:
+            student_data[key] = value
+        elif key == "additional_status_ids":
+            payload[key] = [item for item in re.split(r"[\s,|]+", value) if item]
+        else:
+            payload[key] = _BOOL_ALIASES.get(value.lower(), value)
+
+    if student_data:
+        payload["student_data"] = student_data
+    return payload
+
+
+def iter_import_rows(file: BinaryIO, fmt: str) -> Iterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+    """
+    Построчно прочитать файл импорта.
+
+    Выдает (номер строки, данные, ошибка разбора). Строки нумеруются
+    с 1 без учета заголовка CSV, пустые строки пропускаются.
+    """
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+
+    if fmt == "jsonl":
+        rownum = 0
+        for line in text:
+            if not line.strip():
+                continue
+            rownum += 1
+            try:
+                payload = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield rownum, None, f"Некорректный JSON: {e.msg}"
+                continue
+            if not isinstance(payload, dict):
+                yield rownum, None, "Строка должна содержать JSON-объект"
+                continue
+            yield rownum, payload, None
+        return
+
+    # Разделитель определяем по заголовку: Excel сохраняет CSV с ';'
+    header = text.readline()
+    delimiter = ";" if header.count(";") > header.count(",") else ","
+    fieldnames = [name.strip() for name in next(csv.reader([header], delimiter=delimiter), [])]
+    if not fieldnames:
+        return
+
+    reader = csv.DictReader(text, fieldnames=fieldnames, delimiter=delimiter)
+    rownum = 0
+    for row in reader:
+        if not any(value and value.strip() for value in row.values() if isinstance(value, str)):
+            continue
+        rownum += 1
+        yield rownum, _csv_row_to_payload(row), None
+
+
+def _format_validation_errors(error: PydanticValidationError) -> List[str]:
+    """Сформировать читаемые сообщения из ошибок pydantic"""
+    messages = []
+    for item in error.errors():
+        location = ".".join(str(part) for part in item["loc"])
+        messages.append(f"{location}: {item['msg']}" if location else item["msg"])
+    return messages
+
+
+class StudentImportService:
+    """
+    Массовый импорт студентов из CSV или JSON Lines.
+
+    Строки валидируются моделью StudentCreate пачками по batch_size и
+    сразу передаются репозиторию, который загружает их через COPY.
+    Невалидные строки не прерывают импорт, а попадают в отчет.
+    """
+
+    def __init__(self, repo: StudentRepository, batch_size: int = settings.IMPORT_BATCH_SIZE):
+        self.repo = repo
+        self.batch_size = batch_size
+
+    async def import_file(
+        self,
+        file: BinaryIO,
+        fmt: str,
+        subdivision_id: Optional[int] = None
+    ) -> StudentImportResult:
+        """Импортировать студентов из файла"""
+        if fmt not in IMPORT_FORMATS:
+            raise ValidationError(f"Неподдерживаемый формат импорта: {fmt}")
+
+        errors: Dict[int, List[str]] = {}
+        total_rows = 0
+
+        def batches() -> Iterator[List[Tuple[int, StudentCreate]]]:
+            nonlocal total_rows
+            batch: List[Tuple[int, StudentCreate]] = []
+
+            for rownum, payload, parse_error in iter_import_rows(file, fmt):
+                total_rows = rownum
+                if parse_error:
+                    errors[rownum] = [parse_error]
+                    continue
+                try:
+                    batch.append((rownum, StudentCreate.model_validate(payload)))
+                except PydanticValidationError as e:
+                    errors[rownum] = _format_validation_errors(e)
+                    continue
+
+                if len(batch) >= self.batch_size:
+                    yield batch
+                    batch = []
+
+            if batch:
+                yield batch
+
+        try:
+            imported_count, db_errors = await self.repo.import_many(batches(), subdivision_id)
+        except UnicodeDecodeError:
+            raise ValidationError("Файл импорта должен быть в кодировке UTF-8")
+        errors.update(db_errors)
+
+        return StudentImportResult(
+            total_rows=total_rows,
+            imported_count=imported_count,
+            error_count=len(errors),
+            errors=[ImportRowError(row=row, errors=messages) for row, messages in sorted(errors.items())]
+        )
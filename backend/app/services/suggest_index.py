@@ -0,0 +1,283 @@
+# backend/app/services/suggest_index.py
+
+import asyncio
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from loguru import logger
+
+from ..core.database import db
+from ..core.notifications import data_change_listener
+
+
+def normalize_name(name: str) -> str:
+    """Привести название к виду для сравнения префиксов"""
+    return " ".join(name.lower().replace("ё", "е").split())
+
+
+class PrefixIndex:
+    """
+    Префиксный индекс названий на отсортированном массиве.
+
+    Для каждой записи хранятся ключи, начинающиеся с каждого слова
+    названия ("иванов иван", "иван"), поэтому подсказка находит запись
+    по началу любого слова. Поиск - двоичный поиск плюс проход по
+    соседним ключам, изменение одной записи - вставка в массив.
+    """
+
+    def __init__(self):
+        self._keys: List[Tuple[str, int]] = []
+        self._items: Dict[int, Tuple[str, Optional[int]]] = {}
+        self.loaded = False
+
+    @staticmethod
+    def _keys_for(name: str) -> List[str]:
+        words = normalize_name(name).split()
+        return [" ".join(words[i:]) for i in range(len(words))]
+
+    def load(self, items: Iterable[Tuple[int, str, Optional[int]]]):
+        """Заполнить индекс целиком (id, название, ID подразделения)"""
+        self._items = {id: (name, subdivision_id) for id, name, subdivision_id in items}
+        self._keys = sorted(
+            (key, id) for id, (name, _) in self._items.items() for key in self._keys_for(name)
+        )
+        self.loaded = True
+
+    def get(self, id: int) -> Optional[Tuple[str, Optional[int]]]:
+        """Получить (название, ID подразделения) записи"""
+        return self._items.get(id)
+
+    def upsert(self, id: int, name: str, subdivision_id: Optional[int]):
+        """Добавить или обновить запись"""
+        self.remove(id)
+        self._items[id] = (name, subdivision_id)
+        for key in self._keys_for(name):
+            insort(self._keys, (key, id))
+
+    def remove(self, id: int):
+        """Удалить запись"""
+        item = self._items.pop(id, None)
+        if item is None:
+            return
+        for key in self._keys_for(item[0]):
+            position = bisect_left(self._keys, (key, id))
+            if position < len(self._keys) and self._keys[position] == (key, id):
+                del self._keys[position]
+
+    def search(self, prefix: str, subdivision_id: Optional[int] = None, limit: int = 10) -> List[Tuple[int, str]]:
+        """Найти записи, у которых какое-либо слово начинается с prefix"""
+        prefix = normalize_name(prefix)
+        if not prefix:
+            return []
+
+        result: List[Tuple[int, str]] = []
+        seen: Set[int] = set()
+        position = bisect_left(self._keys, (prefix,))
+
+        while position < len(self._keys) and len(result) < limit:
+            key, id = self._keys[position]
+            if not key.startswith(prefix):
+                break
+            position += 1
+
+            if id in seen:
+                continue
+            seen.add(id)
+
+            name, item_subdivision_id = self._items[id]
+            if subdivision_id is not None and item_subdivision_id != subdivision_id:
+                continue
+            result.append((id, name))
+
+        return result
+
+    def clear(self):
+        """Сбросить индекс (будет перезагружен при следующем обращении)"""
+        self._keys = []
+        self._items = {}
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class SuggestIndex:
+    """
+    Индексы подсказок по ФИО студентов и названиям групп.
+
+    Индексы загружаются из БД при первом обращении, затем обновляются
+    по уведомлениям PostgreSQL (канал data_changes), которые репозитории
+    отправляют в своих транзакциях. Поэтому изменения, сделанные другим
+    процессом приложения, тоже попадают в индекс. Если подписка на
+    уведомления потеряна, индексы сбрасываются и загружаются заново.
+    """
+
+    _STUDENTS_QUERY = """
+        SELECT s.id, s.fullname as name, g.subdivisionid
+        FROM students s
+        JOIN groups g ON g.id = s.groupid
+    """
+
+    _GROUPS_QUERY = """
+        SELECT g.id, g.name, g.subdivisionid
+        FROM groups g
+    """
+
+    def __init__(self):
+        self.students = PrefixIndex()
+        self.groups = PrefixIndex()
+        self._lock = asyncio.Lock()
+        self._tasks: Set[asyncio.Task] = set()
+        self.notifications = 0
+        self.reloads = 0
+    
+    @property
+    def is_listening(self) -> bool:
+        """Подписан ли индекс на уведомления об изменениях"""
+        return data_change_listener.is_listening
+    
+    async def start(self):
+        """Подписаться на уведомления об изменениях (сами индексы загружаются лениво)"""
+        data_change_listener.subscribe(self._on_change, self._on_reset)
+        await data_change_listener.start()
+    
+    async def stop(self):
+        """Отписаться от уведомлений"""
+        data_change_listener.unsubscribe(self._on_change)
+        for task in list(self._tasks):
+            task.cancel()
+        self.students.clear()
+        self.groups.clear()
+    
+    async def suggest(
+        self,
+        query: str,
+        subdivision_id: Optional[int] = None,
+        limit: int = 10,
+        students: bool = True,
+        groups: bool = True
+    ) -> Dict[str, List[Tuple[int, str]]]:
+        """Подсказки по началу слов ФИО студентов и названий групп"""
+        result: Dict[str, List[Tuple[int, str]]] = {"students": [], "groups": []}
+        if students:
+            await self._ensure_loaded(self.students, self._STUDENTS_QUERY)
+            result["students"] = self.students.search(query, subdivision_id, limit)
+        if groups:
+            await self._ensure_loaded(self.groups, self._GROUPS_QUERY)
+            result["groups"] = self.groups.search(query, subdivision_id, limit)
+        return result
+
+    async def _ensure_loaded(self, index: PrefixIndex, query: str):
+        """Загрузить индекс, если он еще не загружен"""
+        if index.loaded:
+            return
+        async with self._lock:
+            if index.loaded:
+                return
+            if not self.is_listening:
+                # Без подписки индекс устареет незаметно, поэтому сначала подписываемся
+                await self.start()
+            pool = await db.get_pool()
+            async with pool.acquire() as connection:
+                rows = await connection.fetch(query)
+            index.load((row['id'], row['name'], row['subdivisionid']) for row in rows)
+            self.reloads += 1
+            logger.info(f"Suggest index loaded {len(index)} entries")
+
+    def _on_change(self, entity: Optional[str], ids: Optional[List[int]]):
+        """Обработчик уведомления об изменении данных"""
+        if entity not in ("students", "groups"):
+            return
+        
+        self.notifications += 1
+        task = asyncio.get_running_loop().create_task(self._apply(entity, ids))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    def _on_reset(self):
+        """Подписка потеряна: без уведомлений индексам доверять нельзя"""
+        logger.warning("Suggest index lost data change notifications, indexes will be reloaded")
+        self.students.clear()
+        self.groups.clear()
+    
+    async def _apply(self, entity: Optional[str], ids: Optional[List[int]]):
+        """Применить изменение к загруженным индексам"""
+        async with self._lock:
+            try:
+                if entity == "students":
+                    await self._refresh(self.students, self._STUDENTS_QUERY, "s.id", ids)
+                elif entity == "groups":
+                    await self._refresh_groups(ids)
+            except Exception as e:
+                # При любой ошибке надежнее перечитать индексы целиком
+                logger.error(f"Failed to apply data change to suggest index: {e}")
+                self.students.clear()
+                self.groups.clear()
+
+    async def _refresh(
+        self,
+        index: PrefixIndex,
+        query: str,
+        id_column: str,
+        ids: Optional[List[int]]
+    ) -> List[Any]:
+        """Перечитать из БД указанные записи индекса"""
+        if not index.loaded:
+            return []
+        if ids is None:
+            index.clear()
+            return []
+
+        pool = await db.get_pool()
+        async with pool.acquire() as connection:
+            rows = await connection.fetch(f"{query} WHERE {id_column} = ANY($1::int[])", ids)
+
+        found = {row['id'] for row in rows}
+        for id in ids:
+            if id not in found:
+                index.remove(id)
+        for row in rows:
+            index.upsert(row['id'], row['name'], row['subdivisionid'])
+        return rows
+
+    async def _refresh_groups(self, ids: Optional[List[int]]):
+        """
+        Перечитать группы и студентов этих групп.
+
+        Подразделение студента берется из группы, поэтому студенты
+        обновляются независимо от того, загружен ли индекс групп.
+        """
+        if ids is None:
+            self.groups.clear()
+            self.students.clear()
+            return
+
+        await self._refresh(self.groups, self._GROUPS_QUERY, "g.id", ids)
+        if not self.students.loaded:
+            return
+
+        pool = await db.get_pool()
+        async with pool.acquire() as connection:
+            existing = await connection.fetch("SELECT id FROM groups WHERE id = ANY($1::int[])", ids)
+            if len(existing) < len(set(ids)):
+                # Группа удалена вместе со студентами, их ID неизвестны
+                self.students.clear()
+                return
+            rows = await connection.fetch(
+                f"{self._STUDENTS_QUERY} WHERE s.groupid = ANY($1::int[])", ids
+            )
+        for row in rows:
+            self.students.upsert(row['id'], row['name'], row['subdivisionid'])
+
+    def stats(self) -> Dict[str, Any]:
+        """Статистика индексов подсказок"""
+        return {
+            "listening": self.is_listening,
+            "students": len(self.students) if self.students.loaded else None,
+            "groups": len(self.groups) if self.groups.loaded else None,
+            "notifications": self.notifications,
+            "reloads": self.reloads
+        }
+
+
+# Глобальный экземпляр индекса подсказок
+suggest_index = SuggestIndex()
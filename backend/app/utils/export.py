@@ -0,0 +1,53 @@
+# backend/app/utils/export.py
+
+import csv
+import io
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Mapping, Sequence, Tuple
+
+# BOM, чтобы Excel корректно определил кодировку UTF-8
+CSV_BOM = "\ufeff"
+
+
+def format_csv_value(value: Any) -> Any:
+    """Привести значение ячейки к виду, удобному для чтения в Excel"""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "Да" if value else "Нет"
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+async def stream_csv(
+    rows: AsyncIterator[Mapping[str, Any]],
+    columns: Sequence[Tuple[str, str]],
+    chunk_rows: int = 500,
+    delimiter: str = ";"
+) -> AsyncIterator[bytes]:
+    """
+    Потоково сформировать CSV из асинхронного источника строк.
+
+    columns - пары (ключ в строке, заголовок столбца). Данные отдаются
+    кусками по chunk_rows строк, поэтому расход памяти не зависит от
+    объема выгрузки. Разделитель ';' - формат, который Excel в русской
+    локали открывает без мастера импорта.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=delimiter)
+
+    buffer.write(CSV_BOM)
+    writer.writerow([header for _, header in columns])
+
+    pending = 0
+    async for row in rows:
+        writer.writerow([format_csv_value(row[key]) for key, _ in columns])
+        pending += 1
+        if pending >= chunk_rows:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate(0)
+            pending = 0
+
+    yield buffer.getvalue().encode("utf-8")
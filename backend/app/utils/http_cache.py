@@ -0,0 +1,62 @@
+# backend/app/utils/http_cache.py
+
+from typing import Hashable, Optional, Sequence
+from fastapi import Request, Response
+
+from ..core.cache import table_versions
+from ..core.database import read_from_primary
+from ..core.notifications import data_change_listener
+
+# Ответы зависят от пользователя, поэтому кешируются только в браузере
+# и перепроверяются при каждом обращении
+CACHE_CONTROL = "private, no-cache"
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Совпадает ли ETag с заголовком If-None-Match (слабое сравнение)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    
+    def opaque(tag: str) -> str:
+        tag = tag.strip()
+        return tag[2:] if tag.startswith("W/") else tag
+    
+    return any(opaque(tag) == opaque(etag) for tag in if_none_match.split(","))
+
+
+async def check_not_modified(
+    request: Request,
+    response: Response,
+    tables: Sequence[str],
+    scope: Hashable = None
+) -> Optional[Response]:
+    """
+    Условный GET по версиям таблиц.
+    
+    Если у клиента актуальная версия ответа, возвращает 304 Not Modified
+    (обработчик отдает его, не обращаясь к БД). Иначе проставляет ETag и
+    Cache-Control в response и возвращает None. Версии таблиц актуальны
+    только при активной подписке на изменения, без нее ETag не выдается.
+    
+    Ответ с ETag читается с основного сервера: реплика может еще не
+    содержать изменений, уже учтенных в версиях таблиц.
+    """
+    if not await data_change_listener.ensure_started():
+        return None
+    
+    etag = table_versions.etag(tables, scope)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    
+    read_from_primary()
+    response.headers.update(headers)
+    return None
+
+
+def discard_etag(response: Response):
+    """Убрать ETag из ответа (например, если вместо данных отдается заглушка)"""
+    if "etag" in response.headers:
+        del response.headers["etag"]
@@ -0,0 +1,75 @@
+# backend/app/utils/pagination.py
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Sequence, Tuple, TypeVar
+
+from ..core.exceptions import ValidationError
+from ..models.common import CursorPaginatedResponse
+
+T = TypeVar('T')
+
+# Диапазон SERIAL / INT в PostgreSQL
+INT4_MIN = -2**31
+INT4_MAX = 2**31 - 1
+
+
+def encode_cursor(sort_key: Any, id: int) -> str:
+    """Закодировать позицию (ключ сортировки, id) в непрозрачный курсор"""
+    if isinstance(sort_key, datetime):
+        sort_key = sort_key.isoformat()
+    payload = json.dumps([sort_key, id], ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_key_type: type = str) -> Tuple[Any, int]:
+    """
+    Раскодировать курсор в пару (ключ сортировки, id).
+
+    Курсор приходит от клиента, поэтому типы проверяются до передачи в
+    запрос: ключ сортировки - sort_key_type, id - целое в диапазоне int4.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_key, id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(id, int) or isinstance(id, bool) or not INT4_MIN <= id <= INT4_MAX:
+            raise ValueError("id must be int4")
+        if not isinstance(sort_key, sort_key_type) or isinstance(sort_key, bool):
+            raise ValueError("unexpected sort key type")
+        return sort_key, id
+    except (binascii.Error, UnicodeError, ValueError, TypeError):
+        raise ValidationError("Недействительный курсор пагинации")
+
+
+def decode_datetime_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Раскодировать курсор, ключ сортировки которого - дата и время"""
+    sort_key, id = decode_cursor(cursor)
+    try:
+        return datetime.fromisoformat(sort_key), id
+    except (TypeError, ValueError):
+        raise ValidationError("Недействительный курсор пагинации")
+
+
+def build_cursor_page(
+    items: Sequence[T],
+    size: int,
+    key: Callable[[T], Tuple[Any, int]]
+) -> CursorPaginatedResponse[T]:
+    """
+    Сформировать страницу курсорной пагинации.
+
+    Репозиторий запрашивается с limit = size + 1: лишняя запись
+    означает, что за текущей страницей есть следующая.
+    """
+    page: List[T] = list(items[:size])
+    has_more = len(items) > size
+    next_cursor: Optional[str] = encode_cursor(*key(page[-1])) if has_more and page else None
+
+    return CursorPaginatedResponse(
+        items=page,
+        size=size,
+        next_cursor=next_cursor,
+        has_more=has_more
+    )
@@ -0,0 +1,60 @@
+# backend/app/utils/search.py
+
+from typing import Any, List, Tuple
+
+
+def escape_like(term: str) -> str:
+    """Экранировать спецсимволы шаблона LIKE"""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def normalize_term(term: str) -> str:
+    """Привести поисковую строку к единому виду (лишние пробелы убираются)"""
+    return " ".join(term.split())
+
+
+def text_search_sql(column: str, pattern_ref: str, term_ref: str) -> str:
+    """
+    Условие нечеткого поиска по текстовому столбцу.
+
+    Совпадением считается подстрока (ILIKE) или похожее слово с опечаткой
+    (оператор pg_trgm <%, порог - pg_trgm.word_similarity_threshold).
+    Оба варианта используют GIN-индекс gin_trgm_ops по столбцу.
+    pattern_ref и term_ref - ссылки на параметры из text_search_params.
+    """
+    return f"({column} ILIKE {pattern_ref} OR {term_ref} <% {column})"
+
+
+def text_search_params(term: str) -> Tuple[str, str]:
+    """Параметры условия нечеткого поиска: шаблон подстроки и сама строка"""
+    term = normalize_term(term)
+    return f"%{escape_like(term)}%", term
+
+
+def text_search_order_sql(column: str, prefix_ref: str, term_ref: str) -> str:
+    """
+    Начало ORDER BY для сортировки результатов поиска по релевантности.
+
+    Совпадения с начала строки идут первыми, дальше - по сходству
+    word_similarity, поэтому точные и префиксные совпадения опережают
+    найденные по опечатке.
+    """
+    return f"({column} ILIKE {prefix_ref})::int DESC, word_similarity({term_ref}, {column}) DESC"
+
+
+def text_search_order_params(term: str) -> Tuple[str, str]:
+    """Параметры сортировки по релевантности: шаблон префикса и сама строка"""
+    term = normalize_term(term)
+    return f"{escape_like(term)}%", term
+
+
+def text_search_condition(column: str, term: str, params: List[Any]) -> str:
+    """Условие нечеткого поиска; параметры добавляются в params"""
+    params.extend(text_search_params(term))
+    return text_search_sql(column, f"${len(params) - 1}", f"${len(params)}")
+
+
+def text_search_order(column: str, term: str, params: List[Any]) -> str:
+    """Сортировка по релевантности; параметры добавляются в params"""
+    params.extend(text_search_order_params(term))
+    return text_search_order_sql(column, f"${len(params) - 1}", f"${len(params)}")
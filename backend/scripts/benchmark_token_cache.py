@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк кеша раскодированных JWT на эндпоинте /auth/me.
+
+Сравнивает пропускную способность с кешем токенов и без него.
+БД не требуется: пользователь заранее помещается в кеш пользователей.
+
+Запуск: python scripts/benchmark_token_cache.py [--requests 5000]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Добавляем путь к приложению
+backend_dir = Path(__file__).parent.parent
+sys.path.append(str(backend_dir))
+
+import httpx
+from loguru import logger
+
+from app.main import app
+from app.api.deps import get_db_pool
+from app.core.cache import user_cache, token_cache
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.models.role import Role
+from app.models.user import User
+
+
+async def run_requests(client: httpx.AsyncClient, token: str, count: int) -> float:
+    """Выполнить count запросов и вернуть число запросов в секунду"""
+    headers = {"Authorization": f"Bearer {token}"}
+    started = time.perf_counter()
+    for _ in range(count):
+        response = await client.get(f"{settings.API_V1_STR}/auth/me", headers=headers)
+        response.raise_for_status()
+    return count / (time.perf_counter() - started)
+
+
+async def main(count: int):
+    """Запуск бенчмарка"""
+    now = datetime.now()
+    user = User(
+        id=1,
+        login="benchmark",
+        subdivisionid=None,
+        created_at=now,
+        roles=[Role(id=1, name="CHAIRMAN", created_at=now)]
+    )
+    token = create_access_token({
+        "user_id": user.id,
+        "login": user.login,
+        "roles": ["CHAIRMAN"],
+        "subdivision_id": None
+    })
+    
+    # Репозитории не должны подключаться к БД: пользователь берется из кеша
+    app.dependency_overrides[get_db_pool] = lambda: None
+    user_cache.ttl = 3600
+    user_cache.set(user.id, user)
+    
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        # Прогрев
+        await run_requests(client, token, min(count, 100))
+        
+        token_cache.clear()
+        max_size = token_cache.max_size
+        token_cache.max_size = 0
+        without_cache = await run_requests(client, token, count)
+        
+        token_cache.max_size = max_size
+        with_cache = await run_requests(client, token, count)
+    
+    logger.info(f"Requests per run: {count}")
+    logger.info(f"Without token cache: {without_cache:.0f} req/s")
+    logger.info(f"With token cache:    {with_cache:.0f} req/s")
+    logger.info(f"Speedup: x{with_cache / without_cache:.2f}")
+    logger.info(f"Token cache stats: {token_cache.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000, help="Количество запросов на прогон")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
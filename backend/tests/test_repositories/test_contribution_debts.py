@@ -0,0 +1,109 @@
+# backend/tests/test_repositories/test_contribution_debts.py
+
+import os
+import uuid
+from datetime import date
+
+import pytest
+
+asyncpg = pytest.importorskip("asyncpg")
+pytest_asyncio = pytest.importorskip("pytest_asyncio")
+
+from app.repositories.contribution_repository import ContributionRepository
+
+# Тесты выполняются на отдельной схеме в базе из TEST_DATABASE_URL
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+pytestmark = [
+    pytest.mark.asyncio,
+    pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL не задан")
+]
+
+SCHEMA_SQL = """
+CREATE TABLE subdivisions (id SERIAL PRIMARY KEY, name VARCHAR(255) NOT NULL);
+CREATE TABLE groups (
+    id SERIAL PRIMARY KEY,
+    subdivisionid INT NOT NULL REFERENCES subdivisions(id),
+    name VARCHAR(255) NOT NULL
+);
+CREATE TABLE students (
+    id SERIAL PRIMARY KEY,
+    groupid INT NOT NULL REFERENCES groups(id),
+    fullname VARCHAR(255) NOT NULL,
+    isactive BOOLEAN NOT NULL DEFAULT false,
+    isbudget BOOLEAN NOT NULL DEFAULT true,
+    year INT NOT NULL
+);
+CREATE TABLE contributions (
+    id SERIAL PRIMARY KEY,
+    studentid INT NOT NULL REFERENCES students(id),
+    semester INT NOT NULL CHECK (semester IN (1, 2)),
+    amount DECIMAL(10,2) NOT NULL,
+    paymentdate DATE,
+    year INT NOT NULL,
+    CONSTRAINT uk_contributions_student_year UNIQUE (studentid, year)
+);
+"""
+
+
+@pytest_asyncio.fixture
+async def connection():
+    conn = await asyncpg.connect(TEST_DATABASE_URL)
+    schema = f"test_debts_{uuid.uuid4().hex[:8]}"
+    await conn.execute(f"CREATE SCHEMA {schema}")
+    await conn.execute(f"SET search_path TO {schema}")
+    try:
+        await conn.execute(SCHEMA_SQL)
+        yield conn
+    finally:
+        await conn.execute(f"DROP SCHEMA {schema} CASCADE")
+        await conn.close()
+
+
+async def _add_student(conn, group_id: int, fullname: str, year: int = 2024) -> int:
+    return await conn.fetchval(
+        "INSERT INTO students (groupid, fullname, isactive, year) VALUES ($1, $2, true, $3) RETURNING id",
+        group_id, fullname, year
+    )
+
+
+async def test_paid_contribution_clears_debt_for_year(connection):
+    subdivision_id = await connection.fetchval("INSERT INTO subdivisions (name) VALUES ('ФИТ') RETURNING id")
+    group_id = await connection.fetchval(
+        "INSERT INTO groups (subdivisionid, name) VALUES ($1, 'ИВТ-21') RETURNING id", subdivision_id
+    )
+    paid_id = await _add_student(connection, group_id, "Иванов Иван")
+    debtor_id = await _add_student(connection, group_id, "Петров Петр")
+
+    # Один оплаченный взнос за год (за первый семестр)
+    await connection.execute(
+        "INSERT INTO contributions (studentid, semester, amount, paymentdate, year) VALUES ($1, 1, 500, $2, 2025)",
+        paid_id, date(2025, 3, 1)
+    )
+
+    repo = ContributionRepository(None)
+    report = await repo.get_debts(2025, conn=connection)
+
+    assert [item.student_id for item in report.students] == [debtor_id]
+    assert len(report.subdivisions) == 1
+    assert report.subdivisions[0].total_students == 2
+    assert report.subdivisions[0].debtors_count == 1
+
+
+async def test_semester_filter_checks_only_that_semester(connection):
+    subdivision_id = await connection.fetchval("INSERT INTO subdivisions (name) VALUES ('ФИТ') RETURNING id")
+    group_id = await connection.fetchval(
+        "INSERT INTO groups (subdivisionid, name) VALUES ($1, 'ИВТ-21') RETURNING id", subdivision_id
+    )
+    student_id = await _add_student(connection, group_id, "Иванов Иван")
+    await connection.execute(
+        "INSERT INTO contributions (studentid, semester, amount, paymentdate, year) VALUES ($1, 1, 500, $2, 2025)",
+        student_id, date(2025, 3, 1)
+    )
+
+    repo = ContributionRepository(None)
+    first = await repo.get_debts(2025, semester=1, conn=connection)
+    second = await repo.get_debts(2025, semester=2, conn=connection)
+
+    assert first.students == []
+    assert [item.student_id for item in second.students] == [student_id]
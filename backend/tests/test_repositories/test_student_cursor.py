@@ -0,0 +1,81 @@
+# backend/tests/test_repositories/test_student_cursor.py
+
+import os
+import uuid
+from pathlib import Path
+
+import pytest
+
+asyncpg = pytest.importorskip("asyncpg")
+pytest_asyncio = pytest.importorskip("pytest_asyncio")
+
+from app.repositories.student_repository import StudentRepository
+from app.utils.pagination import build_cursor_page, decode_cursor
+
+# Тесты выполняются на отдельной схеме в базе из TEST_DATABASE_URL
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[3] / "migrations"
+
+pytestmark = [
+    pytest.mark.asyncio,
+    pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL не задан")
+]
+
+
+@pytest_asyncio.fixture
+async def connection():
+    conn = await asyncpg.connect(TEST_DATABASE_URL)
+    schema = f"test_cursor_{uuid.uuid4().hex[:8]}"
+    await conn.execute(f"CREATE SCHEMA {schema}")
+    await conn.execute(f"SET search_path TO {schema}, public")
+    try:
+        for name in ("01-init.sql", "06-trigram-search.sql"):
+            await conn.execute((MIGRATIONS_DIR / name).read_text(encoding="utf-8"))
+        yield conn
+    finally:
+        await conn.execute(f"DROP SCHEMA {schema} CASCADE")
+        await conn.close()
+
+
+async def test_searched_cursor_pages_follow_name_order(connection):
+    subdivision_id = await connection.fetchval("INSERT INTO subdivisions (name) VALUES ('ФИТ') RETURNING id")
+    group_id = await connection.fetchval(
+        "INSERT INTO groups (subdivisionid, name, year) VALUES ($1, 'ИВТ-21', 2024) RETURNING id",
+        subdivision_id
+    )
+    # Совпадения с начала строки по релевантности идут раньше остальных,
+    # поэтому порядок по релевантности отличается от порядка по ФИО
+    names = [
+        "Абрамов Иван", "Иванов Петр", "Борисов Иван", "Иванишин Андрей",
+        "Васильев Иван", "Иваненко Олег", "Григорьев Иван"
+    ]
+    for name in names:
+        await connection.execute(
+            "INSERT INTO students (groupid, fullname, isactive, isbudget) VALUES ($1, $2, true, true)",
+            group_id, name
+        )
+
+    repo = StudentRepository(None)
+    filters = {'search': 'Иван'}
+    size = 2
+
+    seen = []
+    after = None
+    for _ in range(len(names)):
+        items = await repo.search(
+            filters,
+            limit=size + 1,
+            after=decode_cursor(after) if after else None,
+            order_by_name=True,
+            conn=connection
+        )
+        page = build_cursor_page(items, size, key=lambda s: (s.fullname, s.id))
+        seen.extend(student.fullname for student in page.items)
+        if not page.has_more:
+            break
+        after = page.next_cursor
+
+    # Каждый студент ровно один раз и в порядке (ФИО, id), как в БД
+    expected = await connection.fetch("SELECT fullname FROM students ORDER BY fullname, id")
+    assert seen == [row['fullname'] for row in expected]
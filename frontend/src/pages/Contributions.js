@@ -29,7 +29,7 @@ import {
 import EditIcon from '@mui/icons-material/Edit';
 import DeleteIcon from '@mui/icons-material/Delete';
 import AddIcon from '@mui/icons-material/Add';
-import api from '../services/api';
+import api, { searchAPI } from '../services/api';
 
 const Contributions = () => {
   const [contributions, setContributions] = useState([]);
@@ -69,9 +69,8 @@ const Contributions = () => {
       return;
     }
     try {
-      const response = await api.get('/students/list', { params: { search: searchText } });
-      const data = response.data;
-      setStudents(Array.isArray(data) ? data : (data.items || []));
+      const response = await searchAPI.suggest(searchText, { type: 'students' });
+      setStudents(response.data.students.map(({ id, name }) => ({ id, fullname: name })));
     } catch (err) {
       console.error('Failed to search students:', err);
       setStudents([]);
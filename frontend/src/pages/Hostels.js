@@ -28,7 +28,7 @@ import {
 import EditIcon from '@mui/icons-material/Edit';
 import DeleteIcon from '@mui/icons-material/Delete';
 import AddIcon from '@mui/icons-material/Add';
-import api from '../services/api';  // Import the configured API instance
+import api, { searchAPI } from '../services/api';  // Import the configured API instance
 
 const Hostels = () => {
   const [hostelStudents, setHostelStudents] = useState([]);
@@ -68,9 +68,8 @@ const Hostels = () => {
       return;
     }
     try {
-      const response = await api.get('/students/list', { params: { search: searchText } });
-      const data = response.data;
-      setStudents(Array.isArray(data) ? data : (data.items || []));
+      const response = await searchAPI.suggest(searchText, { type: 'students' });
+      setStudents(response.data.students.map(({ id, name }) => ({ id, fullname: name })));
     } catch (err) {
       console.error('Failed to search students:', err);
       setStudents([]);
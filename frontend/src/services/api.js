@@ -168,6 +168,12 @@ export const auditLogsAPI = {
     api.get('/audit-logs/tables'),
 };
 
+// Search API
+export const searchAPI = {
+  suggest: (q, params) =>
+    api.get('/search/suggest', { params: { q, ...params } }),
+};
+
 
 // Для обратной совместимости
 export const divisionsAPI = subdivisionsAPI;
@@ -0,0 +1,8 @@
+-- Индексы для курсорной (keyset) пагинации
+
+-- Студенты: сортировка по ФИО с id в качестве уточняющего ключа
+CREATE INDEX IF NOT EXISTS idx_students_fullname_id ON students(fullname, id);
+CREATE INDEX IF NOT EXISTS idx_students_group_fullname_id ON students(groupid, fullname, id);
+
+-- Журнал аудита: от новых записей к старым
+CREATE INDEX IF NOT EXISTS idx_audit_logs_created_at_id ON audit_logs(created_at DESC, id DESC);
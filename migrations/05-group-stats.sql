@@ -0,0 +1,29 @@
+-- Предрассчитанная статистика по группам
+
+-- Счетчики студентов по группам. Обновляются приложением при изменении
+-- студентов и групп, полный пересчет - через POST /api/v1/stats/refresh
+CREATE TABLE IF NOT EXISTS group_stats (
+  groupid INT PRIMARY KEY,
+  students_count INT NOT NULL DEFAULT 0,
+  active_students_count INT NOT NULL DEFAULT 0,
+  budget_students_count INT NOT NULL DEFAULT 0,
+  refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  CONSTRAINT fk_group_stats_group FOREIGN KEY (groupid) REFERENCES groups(id) ON DELETE CASCADE
+);
+
+-- Начальное заполнение
+INSERT INTO group_stats (groupid, students_count, active_students_count, budget_students_count)
+SELECT
+  g.id,
+  COUNT(st.id),
+  COUNT(st.id) FILTER (WHERE st.isactive = true),
+  COUNT(st.id) FILTER (WHERE st.isbudget = true)
+FROM groups g
+LEFT JOIN students st ON st.groupid = g.id
+GROUP BY g.id
+ON CONFLICT (groupid) DO NOTHING;
+
+-- Подсчет пользователей по подразделениям
+CREATE INDEX IF NOT EXISTS idx_users_subdivision ON users(subdivisionid);
+
+COMMENT ON TABLE group_stats IS 'Предрассчитанная статистика студентов по группам';
@@ -0,0 +1,8 @@
+-- Нечеткий поиск по названиям и ФИО
+
+-- Триграммы: индексный поиск подстроки (ILIKE '%...%') и слов с опечатками (<%)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_students_fullname_trgm ON students USING gin (fullname gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_groups_name_trgm ON groups USING gin (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_subdivisions_name_trgm ON subdivisions USING gin (name gin_trgm_ops);
@@ -0,0 +1,8 @@
+-- Индексы для поиска взносов
+
+-- Фильтры по году и семестру (и студенту внутри них); заменяет индекс только по году
+CREATE INDEX IF NOT EXISTS idx_contributions_year_semester_student ON contributions(year, semester, studentid);
+DROP INDEX IF EXISTS idx_contributions_year;
+
+-- Оплаченные взносы: фильтр paid и подсчет оплат в сводке
+CREATE INDEX IF NOT EXISTS idx_contributions_paid ON contributions(year, semester, studentid) WHERE paymentdate IS NOT NULL;
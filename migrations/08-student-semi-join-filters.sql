@@ -0,0 +1,6 @@
+-- Индексы для фильтров студентов по общежитию и задолженности
+
+-- Задолженность - нет оплаченного взноса за год (семестр): проверка NOT EXISTS
+-- по студенту и году читает только маленький частичный индекс оплаченных взносов.
+-- Проживание проверяется по уникальному индексу hostelstudents(studentid).
+CREATE INDEX IF NOT EXISTS idx_contributions_paid_student ON contributions(studentid, year, semester) WHERE paymentdate IS NOT NULL;